@@ -15,7 +15,8 @@ CREATE TABLE IF NOT EXISTS warnings (
     user_id TEXT NOT NULL,
     warnings JSONB NOT NULL,
     created_at TIMESTAMP WITH TIME ZONE DEFAULT NOW(),
-    updated_at TIMESTAMP WITH TIME ZONE DEFAULT NOW()
+    updated_at TIMESTAMP WITH TIME ZONE DEFAULT NOW(),
+    UNIQUE(guild_id, user_id)
 );
 
 -- Suggestions table
@@ -73,7 +74,7 @@ CREATE TABLE IF NOT EXISTS prebans (
 
 -- Indexes for better query performance
 CREATE INDEX IF NOT EXISTS idx_prebans_guild_user ON prebans(guild_id, user_id);
-CREATE INDEX IF NOT EXISTS idx_warnings_guild_user ON warnings(guild_id, user_id);
+CREATE UNIQUE INDEX IF NOT EXISTS idx_warnings_guild_user_unique ON warnings(guild_id, user_id);
 CREATE INDEX IF NOT EXISTS idx_whisper_usage_count ON whisper_usage(usage_count);
 CREATE INDEX IF NOT EXISTS idx_whisper_last_used ON whisper_usage(last_used);
 CREATE INDEX IF NOT EXISTS idx_8ball_usage_count ON response_8ball_usage(usage_count);
@@ -318,3 +319,118 @@ CREATE TABLE IF NOT EXISTS response_escape_usage (
 CREATE INDEX IF NOT EXISTS idx_greeting_usage_count ON response_greeting_usage(usage_count);
 CREATE INDEX IF NOT EXISTS idx_kebab_usage_count ON response_kebab_usage(usage_count);
 CREATE INDEX IF NOT EXISTS idx_opinion_usage_count ON response_opinion_usage(usage_count);
+
+-- =============================================================================
+-- ATOMIC USAGE INCREMENTS
+-- Applies a batch of usage deltas in a single statement. Concurrent callers add
+-- to usage_count instead of overwriting it, so no increments are lost.
+--   p_rows: [{"id": "...", "text": "...", "delta": 1, "last_used": "..."}, ...]
+-- Returns the stored usage_count for every id in the batch.
+-- =============================================================================
+CREATE OR REPLACE FUNCTION increment_response_usage(
+    p_table TEXT,
+    p_id_column TEXT,
+    p_text_column TEXT,
+    p_rows JSONB
+)
+RETURNS TABLE(id TEXT, usage_count INTEGER)
+LANGUAGE plpgsql
+AS $$
+BEGIN
+    -- Only the usage tables may be targeted through this function
+    IF p_table <> 'whisper_usage' AND p_table NOT LIKE 'response\_%\_usage' THEN
+        RAISE EXCEPTION 'increment_response_usage: table % is not a usage table', p_table;
+    END IF;
+
+    RETURN QUERY EXECUTE format(
+        'INSERT INTO %1$I AS t (%2$I, %3$I, usage_count, last_used, updated_at)
+         SELECT r.id, r.text, r.delta, r.last_used, NOW()
+         FROM jsonb_to_recordset($1) AS r(id TEXT, text TEXT, delta INTEGER, last_used TIMESTAMP WITH TIME ZONE)
+         ON CONFLICT (%2$I) DO UPDATE SET
+             usage_count = t.usage_count + EXCLUDED.usage_count,
+             %3$I = EXCLUDED.%3$I,
+             last_used = GREATEST(t.last_used, EXCLUDED.last_used),
+             updated_at = NOW()
+         RETURNING t.%2$I::TEXT, t.usage_count',
+        p_table, p_id_column, p_text_column
+    ) USING p_rows;
+END;
+$$;
+
+-- =============================================================================
+-- UNIFIED RESPONSE USAGE TABLE (USAGE_STORAGE=unified)
+-- One table for every response pool, keyed by (pool, response_id). New intent
+-- pools need no DDL, and all pools load in a single query at startup.
+-- Copy existing per-pool tables across with the !migrateusage command.
+-- =============================================================================
+CREATE TABLE IF NOT EXISTS response_usage (
+    pool TEXT NOT NULL,
+    response_id TEXT NOT NULL,
+    response_text TEXT NOT NULL,
+    usage_count INTEGER NOT NULL DEFAULT 0,
+    last_used TIMESTAMP WITH TIME ZONE,
+    created_at TIMESTAMP WITH TIME ZONE DEFAULT NOW(),
+    updated_at TIMESTAMP WITH TIME ZONE DEFAULT NOW(),
+    PRIMARY KEY (pool, response_id)
+);
+
+CREATE INDEX IF NOT EXISTS idx_response_usage_count ON response_usage(pool, usage_count);
+
+-- Unified-table counterpart of increment_response_usage
+CREATE OR REPLACE FUNCTION increment_unified_response_usage(
+    p_pool TEXT,
+    p_rows JSONB
+)
+RETURNS TABLE(id TEXT, usage_count INTEGER)
+LANGUAGE sql
+AS $$
+    INSERT INTO response_usage AS t (pool, response_id, response_text, usage_count, last_used, updated_at)
+    SELECT p_pool, r.id, r.text, r.delta, r.last_used, NOW()
+    FROM jsonb_to_recordset(p_rows) AS r(id TEXT, text TEXT, delta INTEGER, last_used TIMESTAMP WITH TIME ZONE)
+    ON CONFLICT (pool, response_id) DO UPDATE SET
+        usage_count = t.usage_count + EXCLUDED.usage_count,
+        response_text = EXCLUDED.response_text,
+        last_used = GREATEST(t.last_used, EXCLUDED.last_used),
+        updated_at = NOW()
+    RETURNING t.response_id, t.usage_count;
+$$;
+
+-- =============================================================================
+-- NORMALIZED SUGGESTIONS TABLE (SUGGESTIONS_STORAGE=normalized)
+-- One column per wish field instead of the suggestions table's JSONB blob, so
+-- per-guild leaderboards and granted-wish history are indexed queries.
+-- Timestamps are UTC without a time zone, as the bot writes them.
+-- Copy the existing suggestions table across with the !migratewishstorage command.
+-- =============================================================================
+CREATE TABLE IF NOT EXISTS wishes (
+    message_id TEXT PRIMARY KEY,
+    guild_id BIGINT NOT NULL,
+    channel_id BIGINT,
+    type TEXT NOT NULL,
+    status TEXT NOT NULL DEFAULT 'active',
+    votes INTEGER NOT NULL DEFAULT 0,
+    author_id BIGINT,
+    description TEXT NOT NULL DEFAULT '',
+    created_at TIMESTAMP,
+    granted_at TIMESTAMP,
+    granted_by BIGINT,
+    granted_notes TEXT,
+    updated_at TIMESTAMP WITH TIME ZONE DEFAULT NOW()
+);
+
+-- WHERE guild_id = ? AND type = ? AND status = 'active' ORDER BY votes DESC LIMIT n
+CREATE INDEX IF NOT EXISTS idx_wishes_leaderboard ON wishes(guild_id, type, status, votes DESC);
+-- WHERE guild_id = ? AND status = 'granted' ORDER BY granted_at DESC LIMIT n
+CREATE INDEX IF NOT EXISTS idx_wishes_granted ON wishes(guild_id, status, granted_at DESC);
+
+-- =============================================================================
+-- SCHEDULED TASK STATE
+-- One row per scheduled task, e.g. 'weekly_summary' holds the next run time
+-- and the last summary message posted in each guild, so restarts neither
+-- re-wait for the schedule nor post a duplicate.
+-- =============================================================================
+CREATE TABLE IF NOT EXISTS task_state (
+    name TEXT PRIMARY KEY,
+    data JSONB NOT NULL,
+    updated_at TIMESTAMP WITH TIME ZONE DEFAULT NOW()
+);
@@ -5,16 +5,26 @@ import asyncio
 from config import BOT_PREFIX, INTENTS
 from tasks.status import StatusTasks
 from tasks.whispers import WhisperTasks
+from tasks.usage_flush import UsageFlushTasks
+from database import adb
+from events.message_events import USAGE_POOL_NAMES
+from warmup import warm_up
 from utils import zalgo_embed
+from utils.request_scheduler import request_scheduler
 
 class DreambotClient(commands.Bot):
     """Custom bot class with integrated functionality"""
 
     def __init__(self):
-        super().__init__(command_prefix=BOT_PREFIX, intents=INTENTS)
+        super().__init__(
+            command_prefix=BOT_PREFIX,
+            intents=INTENTS,
+            http_trace=request_scheduler.trace_config()  # Feeds rate-limit headers to the scheduler
+        )
         self.remove_command('help')  # Remove default help command
         self.status_tasks = None
         self.whisper_tasks = None
+        self.usage_flush_tasks = None
 
     async def setup_hook(self):
         """This is called when the bot is starting up"""
@@ -36,9 +46,21 @@ class DreambotClient(commands.Bot):
             except Exception as e:
                 print(f"❌ Failed to load {cog}: {e}")
 
+        # Preload all persistent state; events aren't dispatched until this returns
+        await warm_up(adb, USAGE_POOL_NAMES)
+
         # Start background tasks
         self.status_tasks = StatusTasks(self)
         self.whisper_tasks = WhisperTasks(self)
+        self.usage_flush_tasks = UsageFlushTasks(self)
+
+    async def close(self):
+        """Flush buffered usage counters and compact JSON journals before disconnecting"""
+        if self.usage_flush_tasks:
+            self.usage_flush_tasks.cog_unload()
+        await adb.flush_usage()
+        await adb.compact_json_storage()
+        await super().close()
 
     async def on_ready(self):
         """Called when the bot is ready"""
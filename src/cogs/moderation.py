@@ -3,7 +3,7 @@ from discord.ext import commands
 import asyncio
 from datetime import datetime, timedelta
 from utils import has_mod_role, log_moderation
-from database import load_warnings, save_warnings, load_prebans, save_prebans
+from database import adb
 from config import AUTO_TIMEOUT_WARNINGS, AUTO_TIMEOUT_DURATION_HOURS, PURGE_MAX_MESSAGES
 
 class Moderation(commands.Cog):
@@ -146,24 +146,26 @@ class Moderation(commands.Cog):
             await ctx.send(embed=embed)
             return
 
-        warnings = load_warnings()
         guild_id = str(ctx.guild.id)
         user_id = str(member.id)
 
-        if guild_id not in warnings:
-            warnings[guild_id] = {}
+        async with adb.lock('warnings'):
+            warnings = await adb.load_warnings()
 
-        if user_id not in warnings[guild_id]:
-            warnings[guild_id][user_id] = []
+            if guild_id not in warnings:
+                warnings[guild_id] = {}
 
-        warning_data = {
-            'reason': reason or 'No reason provided',
-            'moderator': ctx.author.id,
-            'timestamp': datetime.now().isoformat()
-        }
+            if user_id not in warnings[guild_id]:
+                warnings[guild_id][user_id] = []
 
-        warnings[guild_id][user_id].append(warning_data)
-        save_warnings(warnings)
+            warning_data = {
+                'reason': reason or 'No reason provided',
+                'moderator': ctx.author.id,
+                'timestamp': datetime.now().isoformat()
+            }
+
+            warnings[guild_id][user_id].append(warning_data)
+            await adb.save_warnings(warnings)
 
         warning_count = len(warnings[guild_id][user_id])
 
@@ -187,7 +189,7 @@ class Moderation(commands.Cog):
     @has_mod_role()
     async def warnings(self, ctx, member: discord.Member):
         """Check warnings for a member"""
-        warnings = load_warnings()
+        warnings = await adb.load_warnings()
         guild_id = str(ctx.guild.id)
         user_id = str(member.id)
 
@@ -223,13 +225,17 @@ class Moderation(commands.Cog):
     @has_mod_role()
     async def clearwarnings(self, ctx, member: discord.Member):
         """Clear all warnings for a member"""
-        warnings = load_warnings()
         guild_id = str(ctx.guild.id)
         user_id = str(member.id)
 
-        if guild_id in warnings and user_id in warnings[guild_id]:
-            del warnings[guild_id][user_id]
-            save_warnings(warnings)
+        async with adb.lock('warnings'):
+            warnings = await adb.load_warnings()
+            cleared = guild_id in warnings and user_id in warnings[guild_id]
+            if cleared:
+                del warnings[guild_id][user_id]
+                await adb.save_warnings(warnings)
+
+        if cleared:
             embed = discord.Embed(
                 description=f"*The marks upon {member.name} have been erased. Their pattern is clean.*",
                 color=discord.Color.green()
@@ -268,14 +274,25 @@ class Moderation(commands.Cog):
     @has_mod_role()
     async def preban(self, ctx, user_id: int, *, reason=None):
         """Pre-emptively ban a user ID - they will be banned upon joining"""
-        prebans = load_prebans()
         guild_id = str(ctx.guild.id)
         user_id_str = str(user_id)
 
-        if guild_id not in prebans:
-            prebans[guild_id] = {}
+        async with adb.lock('prebans'):
+            prebans = await adb.load_prebans()
+
+            if guild_id not in prebans:
+                prebans[guild_id] = {}
+
+            already_prebanned = user_id_str in prebans[guild_id]
+            if not already_prebanned:
+                prebans[guild_id][user_id_str] = {
+                    'added_by': ctx.author.id,
+                    'added_at': datetime.now().isoformat(),
+                    'reason': reason or 'No reason provided'
+                }
+                await adb.save_prebans(prebans)
 
-        if user_id_str in prebans[guild_id]:
+        if already_prebanned:
             embed = discord.Embed(
                 description=f"*This pattern is already marked for erasure, o bearer mine...*\nUser ID: `{user_id}`",
                 color=discord.Color.orange()
@@ -283,13 +300,6 @@ class Moderation(commands.Cog):
             await ctx.send(embed=embed)
             return
 
-        prebans[guild_id][user_id_str] = {
-            'added_by': ctx.author.id,
-            'added_at': datetime.now().isoformat(),
-            'reason': reason or 'No reason provided'
-        }
-        save_prebans(prebans)
-
         embed = discord.Embed(
             description=f"*The pattern has been marked. Should this soul dare to enter, they shall be erased instantly...*\nUser ID: `{user_id}`",
             color=discord.Color.dark_purple()
@@ -303,11 +313,17 @@ class Moderation(commands.Cog):
     @has_mod_role()
     async def unpreban(self, ctx, user_id: int):
         """Remove a user ID from the preban list"""
-        prebans = load_prebans()
         guild_id = str(ctx.guild.id)
         user_id_str = str(user_id)
 
-        if guild_id not in prebans or user_id_str not in prebans[guild_id]:
+        async with adb.lock('prebans'):
+            prebans = await adb.load_prebans()
+            found = guild_id in prebans and user_id_str in prebans[guild_id]
+            if found:
+                del prebans[guild_id][user_id_str]
+                await adb.save_prebans(prebans)
+
+        if not found:
             embed = discord.Embed(
                 description=f"*This pattern bears no mark of erasure...*\nUser ID: `{user_id}`",
                 color=discord.Color.red()
@@ -315,9 +331,6 @@ class Moderation(commands.Cog):
             await ctx.send(embed=embed)
             return
 
-        del prebans[guild_id][user_id_str]
-        save_prebans(prebans)
-
         embed = discord.Embed(
             description=f"*The mark has been lifted. This soul may walk these paths freely...*\nUser ID: `{user_id}`",
             color=discord.Color.green()
@@ -329,7 +342,7 @@ class Moderation(commands.Cog):
     @has_mod_role()
     async def prebans(self, ctx):
         """List all prebanned user IDs"""
-        prebans = load_prebans()
+        prebans = await adb.load_prebans()
         guild_id = str(ctx.guild.id)
 
         if guild_id not in prebans or not prebans[guild_id]:
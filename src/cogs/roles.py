@@ -2,7 +2,10 @@ import discord
 from discord.ext import commands
 import asyncio
 import logging
-from database import load_reaction_roles, save_reaction_roles
+from database import adb
+from utils.reaction_roles import REACTION_ROLE_MAPS, reaction_role_index
+from utils.request_scheduler import request_scheduler
+from utils.role_picker import RolePickerView
 from config import (
     COLOR_ROLES, EXOTIC_COLORS, SPECIAL_ROLES, PRONOUN_ROLES,
     MOD_ROLES, DREAMER_ROLE, SUPPORTER_ROLE
@@ -10,10 +13,7 @@ from config import (
 
 logger = logging.getLogger(__name__)
 
-# Rate limit handling for bulk operations
-REACTION_DELAY = 0.3  # 300ms between adding reactions (Discord limit is ~1/sec per channel)
-ROLE_CREATE_DELAY = 0.5  # 500ms between creating roles
-ROLE_MODIFY_DELAY = 0.25  # 250ms between role add/remove operations
+MENU_SEPARATOR = "⸻⸻⸻⸻⸻⸻⸻⸻⸻⸻⸻⸻⸻⸻⸻⸻⸻⸻⸻⸻"
 
 class Roles(commands.Cog):
     """Role management and reaction roles"""
@@ -21,11 +21,27 @@ class Roles(commands.Cog):
     def __init__(self, bot):
         self.bot = bot
 
+    async def cog_load(self):
+        """Re-attach previously posted role pickers; their custom ids are fixed"""
+        self.bot.add_view(RolePickerView())
+
     @commands.command()
     @commands.has_permissions(administrator=True)
-    async def setup_roles(self, ctx):
-        """Create a role selection channel with all reaction messages"""
-        print(f"Setup command initiated by {ctx.author} in {ctx.guild.name}")
+    async def setup_roles(self, ctx, mode: str = 'reconcile'):
+        """
+        Create or update the role selection channel and its reaction messages.
+
+        By default only what's missing or outdated is created, edited or
+        reacted; `!setup_roles rebuild` deletes the channel and starts over.
+        """
+        if mode not in ('reconcile', 'rebuild'):
+            await ctx.send(embed=discord.Embed(
+                description="❌ Mode must be `reconcile` (default) or `rebuild`.",
+                color=discord.Color.red()
+            ))
+            return
+
+        print(f"Setup command initiated by {ctx.author} in {ctx.guild.name} ({mode})")
 
         setup_embed = discord.Embed(
             description="🔧 **Starting setup process...**",
@@ -47,13 +63,12 @@ class Roles(commands.Cog):
                         color = discord.Color.dark_purple()
                     else:
                         color = discord.Color.dark_gold()
-                    mod_role = await ctx.guild.create_role(
+                    mod_role = await request_scheduler.run(('roles', ctx.guild.id), lambda: ctx.guild.create_role(
                         name=mod_role_name,
                         color=color,
                         permissions=discord.Permissions(administrator=True)
-                    )
+                    ))
                     missing_roles.append(mod_role_name)
-                    await asyncio.sleep(ROLE_CREATE_DELAY)
                 except discord.Forbidden:
                     error_embed = discord.Embed(
                         description=f"❌ Missing permissions to create role '{mod_role_name}'!",
@@ -66,12 +81,11 @@ class Roles(commands.Cog):
         dreamer_role = discord.utils.get(ctx.guild.roles, name=DREAMER_ROLE)
         if not dreamer_role:
             try:
-                dreamer_role = await ctx.guild.create_role(
+                dreamer_role = await request_scheduler.run(('roles', ctx.guild.id), lambda: ctx.guild.create_role(
                     name=DREAMER_ROLE,
                     color=discord.Color.purple()
-                )
+                ))
                 missing_roles.append(DREAMER_ROLE)
-                await asyncio.sleep(ROLE_CREATE_DELAY)
             except discord.Forbidden:
                 error_embed = discord.Embed(
                     description=f"❌ Missing permissions to create roles!",
@@ -87,9 +101,8 @@ class Roles(commands.Cog):
             if not role:
                 try:
                     color = discord.Color.random()
-                    role = await ctx.guild.create_role(name=role_name, color=color)
+                    role = await request_scheduler.run(('roles', ctx.guild.id), lambda: ctx.guild.create_role(name=role_name, color=color))
                     created_colors.append(role_name)
-                    await asyncio.sleep(ROLE_CREATE_DELAY)
                 except discord.Forbidden:
                     error_embed = discord.Embed(
                         description=f"❌ Missing permissions to create role '{role_name}'!",
@@ -104,9 +117,8 @@ class Roles(commands.Cog):
             if not role:
                 try:
                     color = discord.Color.random()
-                    role = await ctx.guild.create_role(name=role_name, color=color)
+                    role = await request_scheduler.run(('roles', ctx.guild.id), lambda: ctx.guild.create_role(name=role_name, color=color))
                     created_special.append(role_name)
-                    await asyncio.sleep(ROLE_CREATE_DELAY)
                 except discord.Forbidden:
                     error_embed = discord.Embed(
                         description=f"❌ Missing permissions to create role '{role_name}'!",
@@ -122,9 +134,8 @@ class Roles(commands.Cog):
             if not role:
                 try:
                     color = discord.Color.random()
-                    role = await ctx.guild.create_role(name=role_name, color=color)
+                    role = await request_scheduler.run(('roles', ctx.guild.id), lambda: ctx.guild.create_role(name=role_name, color=color))
                     created_pronouns.append(role_name)
-                    await asyncio.sleep(ROLE_CREATE_DELAY)
                 except discord.Forbidden:
                     error_embed = discord.Embed(
                         description=f"❌ Missing permissions to create role '{role_name}'!",
@@ -137,12 +148,11 @@ class Roles(commands.Cog):
         supporter_role = discord.utils.get(ctx.guild.roles, name=SUPPORTER_ROLE)
         if not supporter_role:
             try:
-                supporter_role = await ctx.guild.create_role(
+                supporter_role = await request_scheduler.run(('roles', ctx.guild.id), lambda: ctx.guild.create_role(
                     name=SUPPORTER_ROLE,
                     color=discord.Color.magenta()
-                )
+                ))
                 missing_roles.append(SUPPORTER_ROLE)
-                await asyncio.sleep(ROLE_CREATE_DELAY)
             except discord.Forbidden:
                 error_embed = discord.Embed(
                     description="❌ Missing permissions to create roles!",
@@ -190,64 +200,88 @@ class Roles(commands.Cog):
 
         # Check if role-selection channel exists
         role_channel = discord.utils.get(ctx.guild.text_channels, name='role-selection')
-        if role_channel:
+        if role_channel and mode == 'rebuild':
             await ctx.send(embed=discord.Embed(
                 description="Role selection channel already exists! Deleting old one...",
                 color=discord.Color.orange()
             ))
             await role_channel.delete()
             await asyncio.sleep(1)
+            role_channel = None
+
+        if not role_channel:
+            # Create new role selection channel
+            overwrites = {
+                ctx.guild.default_role: discord.PermissionOverwrite(
+                    read_messages=True,
+                    send_messages=False,
+                    add_reactions=True
+                ),
+                ctx.guild.me: discord.PermissionOverwrite(
+                    read_messages=True,
+                    send_messages=True,
+                    add_reactions=True,
+                    manage_messages=True
+                )
+            }
+
+            # Add permission for Dreamer role if it exists
+            dreamer_role = discord.utils.get(ctx.guild.roles, name=DREAMER_ROLE)
+            if dreamer_role:
+                overwrites[dreamer_role] = discord.PermissionOverwrite(
+                    read_messages=True,
+                    send_messages=False,
+                    add_reactions=True
+                )
 
-        # Create new role selection channel
-        overwrites = {
-            ctx.guild.default_role: discord.PermissionOverwrite(
-                read_messages=True,
-                send_messages=False,
-                add_reactions=True
-            ),
-            ctx.guild.me: discord.PermissionOverwrite(
-                read_messages=True,
-                send_messages=True,
-                add_reactions=True,
-                manage_messages=True
-            )
-        }
-
-        # Add permission for Dreamer role if it exists
-        dreamer_role = discord.utils.get(ctx.guild.roles, name=DREAMER_ROLE)
-        if dreamer_role:
-            overwrites[dreamer_role] = discord.PermissionOverwrite(
-                read_messages=True,
-                send_messages=False,
-                add_reactions=True
-            )
+            try:
+                if category:
+                    role_channel = await category.create_text_channel(
+                        'role-selection',
+                        overwrites=overwrites,
+                        topic="React to get roles! | Verification, Colors & Special Roles"
+                    )
+                else:
+                    role_channel = await ctx.guild.create_text_channel(
+                        'role-selection',
+                        overwrites=overwrites,
+                        topic="React to get roles! | Verification, Colors & Special Roles"
+                    )
+            except discord.Forbidden:
+                error_embed = discord.Embed(
+                    description="❌ Missing permissions to create channels!",
+                    color=discord.Color.red()
+                )
+                await ctx.send(embed=error_embed)
+                return
 
+        # Setup reaction messages, reusing this guild's existing menus. The
+        # load is strict: saving over a failed (empty) read would delete
+        # every other guild's menus
         try:
-            if category:
-                role_channel = await category.create_text_channel(
-                    'role-selection',
-                    overwrites=overwrites,
-                    topic="React to get roles! | Verification, Colors & Special Roles"
-                )
-            else:
-                role_channel = await ctx.guild.create_text_channel(
-                    'role-selection',
-                    overwrites=overwrites,
-                    topic="React to get roles! | Verification, Colors & Special Roles"
-                )
-        except discord.Forbidden:
+            reaction_data = await adb.load_reaction_roles(strict=True)
+        except Exception as e:
+            print(f"Setup aborted for {ctx.guild.name}: reaction roles failed to load: {e}")
             error_embed = discord.Embed(
-                description="❌ Missing permissions to create channels!",
+                description="❌ Couldn't load the saved reaction-role menus, try again shortly!",
                 color=discord.Color.red()
             )
             await ctx.send(embed=error_embed)
             return
+        guild_menus = {
+            message_id: msg_data for message_id, msg_data in reaction_data.items()
+            if msg_data.get('guild_id') == ctx.guild.id
+        }
+        new_menus, changes = await self._setup_reaction_messages(role_channel, ctx.guild.id, guild_menus)
 
-        # Setup reaction messages
-        reaction_data = await self._setup_reaction_messages(role_channel, ctx.guild.id)
-        save_reaction_roles(reaction_data)
+        # Replace only this guild's partition; other guilds' menus are untouched
+        for message_id in guild_menus:
+            del reaction_data[message_id]
+        reaction_data.update(new_menus)
+        await adb.save_reaction_roles(reaction_data)
+        reaction_role_index.rebuild(reaction_data)
 
-        print(f"Setup completed successfully for {ctx.guild.name}")
+        print(f"Setup completed successfully for {ctx.guild.name}: {changes}")
 
         complete_embed = discord.Embed(
             title="✅ Setup Complete!",
@@ -259,161 +293,177 @@ class Roles(commands.Cog):
             value="• New members: React with ✅ to verify\n• Color roles: React with color emojis (one only)\n• Special roles: React for your talents (multiple allowed)",
             inline=False
         )
-        await ctx.send(embed=complete_embed)
-
-    async def _setup_reaction_messages(self, channel, guild_id):
-        """Setup all reaction role messages in the channel"""
-        reaction_data = {}
-
-        # 1. VERIFICATION MESSAGE
-        verify_embed = discord.Embed(
-            title="🌙 Server Verification",
-            description=(
-                "**Welcome, o seeker mine...**\n\n"
-                "Before you can access the server, you must acknowledge our covenant.\n"
-                "Read the rules in #welcome-and-rules first.\n\n"
-                "✅ **React below to receive the Dreamer role and enter our realm**"
+        complete_embed.add_field(
+            name="🔁 Changes",
+            value=(
+                f"{changes['messages_sent']} menus sent, {changes['messages_edited']} updated\n"
+                f"{changes['reactions_added']} reactions added, {changes['reactions_removed']} removed"
             ),
-            color=discord.Color.dark_purple()
-        )
-        verify_embed.set_footer(text="Your wishes shall be granted...")
-
-        verify_msg = await channel.send(embed=verify_embed)
-        await verify_msg.add_reaction('✅')
-        await asyncio.sleep(REACTION_DELAY)
-
-        reaction_data[str(verify_msg.id)] = {
-            'type': 'verify',
-            'channel_id': channel.id,
-            'guild_id': guild_id
-        }
-
-        # 2. SEPARATOR
-        await channel.send("⸻⸻⸻⸻⸻⸻⸻⸻⸻⸻⸻⸻⸻⸻⸻⸻⸻⸻⸻⸻")
-
-        # 3. COLOR ROLES MESSAGE
-        color_embed = discord.Embed(
-            title="🎨 Choose Your Essence",
-            description="Your color reflects your inner nature. Choose wisely, for you may hold only one.",
-            color=discord.Color.gold()
-        )
-
-        # Build color lists
-        color_list1 = []
-        for emoji, role_name in list(COLOR_ROLES.items())[:10]:
-            color_list1.append(f"{emoji} {role_name}")
-        color_embed.add_field(name="Primary Essence", value="\n".join(color_list1), inline=True)
-
-        color_list2 = []
-        for emoji, role_name in list(COLOR_ROLES.items())[10:]:
-            color_list2.append(f"{emoji} {role_name}")
-        color_embed.add_field(name="Rare Essence", value="\n".join(color_list2), inline=True)
-
-        color_msg = await channel.send(embed=color_embed)
-
-        for emoji in COLOR_ROLES.keys():
-            await color_msg.add_reaction(emoji)
-            await asyncio.sleep(REACTION_DELAY)
-
-        reaction_data[str(color_msg.id)] = {
-            'type': 'color',
-            'channel_id': channel.id,
-            'guild_id': guild_id
-        }
-
-        # 4. EXOTIC COLORS MESSAGE
-        await channel.send("⸻⸻⸻⸻⸻⸻⸻⸻⸻⸻⸻⸻⸻⸻⸻⸻⸻⸻⸻⸻")
-
-        exotic_embed = discord.Embed(
-            title="🌌 Exotic Essences",
-            description="Rare colors from forgotten dreams and distant stars...",
-            color=discord.Color.from_rgb(138, 43, 226)
-        )
-
-        exotic_list1 = []
-        for emoji, role_name in list(EXOTIC_COLORS.items())[:6]:
-            exotic_list1.append(f"{emoji} {role_name}")
-        exotic_embed.add_field(name="Ancient Colors", value="\n".join(exotic_list1), inline=True)
-
-        exotic_list2 = []
-        for emoji, role_name in list(EXOTIC_COLORS.items())[6:]:
-            exotic_list2.append(f"{emoji} {role_name}")
-        exotic_embed.add_field(name="Forbidden Hues", value="\n".join(exotic_list2), inline=True)
-
-        exotic_msg = await channel.send(embed=exotic_embed)
-
-        for emoji in EXOTIC_COLORS.keys():
-            await exotic_msg.add_reaction(emoji)
-            await asyncio.sleep(REACTION_DELAY)
-
-        reaction_data[str(exotic_msg.id)] = {
-            'type': 'exotic',
-            'channel_id': channel.id,
-            'guild_id': guild_id
-        }
-
-        # 5. SPECIAL ROLES MESSAGE
-        await channel.send("⸻⸻⸻⸻⸻⸻⸻⸻⸻⸻⸻⸻⸻⸻⸻⸻⸻⸻⸻⸻")
-
-        special_embed = discord.Embed(
-            title="✨ Special Roles",
-            description="Choose roles that define your craft. You may have multiple.",
-            color=discord.Color.from_rgb(138, 43, 226)
+            inline=False
         )
+        await ctx.send(embed=complete_embed)
 
-        special_list = []
-        for emoji, role_name in SPECIAL_ROLES.items():
-            special_list.append(f"{emoji} {role_name}")
-
-        special_embed.add_field(name="Available Roles", value="\n".join(special_list), inline=False)
-
-        special_msg = await channel.send(embed=special_embed)
+    def _menu_embed(self, menu_type):
+        """Build the embed for one reaction-role menu"""
+        if menu_type == 'verify':
+            embed = discord.Embed(
+                title="🌙 Server Verification",
+                description=(
+                    "**Welcome, o seeker mine...**\n\n"
+                    "Before you can access the server, you must acknowledge our covenant.\n"
+                    "Read the rules in #welcome-and-rules first.\n\n"
+                    "✅ **React below to receive the Dreamer role and enter our realm**"
+                ),
+                color=discord.Color.dark_purple()
+            )
+            embed.set_footer(text="Your wishes shall be granted...")
+            return embed
 
-        for emoji in SPECIAL_ROLES.keys():
-            await special_msg.add_reaction(emoji)
-            await asyncio.sleep(REACTION_DELAY)
+        if menu_type == 'color':
+            embed = discord.Embed(
+                title="🎨 Choose Your Essence",
+                description="Your color reflects your inner nature. Choose wisely, for you may hold only one.",
+                color=discord.Color.gold()
+            )
+            color_list1 = [f"{emoji} {role_name}" for emoji, role_name in list(COLOR_ROLES.items())[:10]]
+            embed.add_field(name="Primary Essence", value="\n".join(color_list1), inline=True)
+            color_list2 = [f"{emoji} {role_name}" for emoji, role_name in list(COLOR_ROLES.items())[10:]]
+            embed.add_field(name="Rare Essence", value="\n".join(color_list2), inline=True)
+            return embed
 
-        reaction_data[str(special_msg.id)] = {
-            'type': 'special',
-            'channel_id': channel.id,
-            'guild_id': guild_id
-        }
+        if menu_type == 'exotic':
+            embed = discord.Embed(
+                title="🌌 Exotic Essences",
+                description="Rare colors from forgotten dreams and distant stars...",
+                color=discord.Color.from_rgb(138, 43, 226)
+            )
+            exotic_list1 = [f"{emoji} {role_name}" for emoji, role_name in list(EXOTIC_COLORS.items())[:6]]
+            embed.add_field(name="Ancient Colors", value="\n".join(exotic_list1), inline=True)
+            exotic_list2 = [f"{emoji} {role_name}" for emoji, role_name in list(EXOTIC_COLORS.items())[6:]]
+            embed.add_field(name="Forbidden Hues", value="\n".join(exotic_list2), inline=True)
+            return embed
 
-        # 6. PRONOUN ROLES MESSAGE
-        await channel.send("⸻⸻⸻⸻⸻⸻⸻⸻⸻⸻⸻⸻⸻⸻⸻⸻⸻⸻⸻⸻")
+        if menu_type == 'special':
+            embed = discord.Embed(
+                title="✨ Special Roles",
+                description="Choose roles that define your craft. You may have multiple.",
+                color=discord.Color.from_rgb(138, 43, 226)
+            )
+            special_list = [f"{emoji} {role_name}" for emoji, role_name in SPECIAL_ROLES.items()]
+            embed.add_field(name="Available Roles", value="\n".join(special_list), inline=False)
+            return embed
 
-        pronoun_embed = discord.Embed(
+        # Pronouns - split into standard and neo pronouns
+        embed = discord.Embed(
             title="🏳️‍🌈 Pronouns",
             description="Share your pronouns with the community. You may select multiple.",
             color=discord.Color.from_rgb(255, 175, 243)
         )
-
-        # Build pronoun lists - split into standard and neo pronouns
-        standard_pronouns = []
-        for emoji, role_name in list(PRONOUN_ROLES.items())[:8]:  # First 8 are standard
-            standard_pronouns.append(f"{emoji} {role_name}")
-
-        neo_pronouns = []
-        for emoji, role_name in list(PRONOUN_ROLES.items())[8:]:  # Rest are neo pronouns
-            neo_pronouns.append(f"{emoji} {role_name}")
-
-        pronoun_embed.add_field(name="Common Pronouns", value="\n".join(standard_pronouns), inline=True)
+        standard_pronouns = [f"{emoji} {role_name}" for emoji, role_name in list(PRONOUN_ROLES.items())[:8]]  # First 8 are standard
+        neo_pronouns = [f"{emoji} {role_name}" for emoji, role_name in list(PRONOUN_ROLES.items())[8:]]  # Rest are neo pronouns
+        embed.add_field(name="Common Pronouns", value="\n".join(standard_pronouns), inline=True)
         if neo_pronouns:
-            pronoun_embed.add_field(name="Neo Pronouns", value="\n".join(neo_pronouns), inline=True)
-
-        pronoun_msg = await channel.send(embed=pronoun_embed)
-
-        for emoji in PRONOUN_ROLES.keys():
-            await pronoun_msg.add_reaction(emoji)
-            await asyncio.sleep(REACTION_DELAY)
+            embed.add_field(name="Neo Pronouns", value="\n".join(neo_pronouns), inline=True)
+        return embed
+
+    @staticmethod
+    def _embed_signature(embed):
+        """The parts of an embed we manage, for detecting outdated menus"""
+        return (
+            embed.title,
+            embed.description,
+            tuple((field.name, field.value, field.inline) for field in embed.fields),
+            embed.footer.text,
+        )
 
-        reaction_data[str(pronoun_msg.id)] = {
-            'type': 'pronouns',
-            'channel_id': channel.id,
-            'guild_id': guild_id
+    async def _setup_reaction_messages(self, channel, guild_id, existing=None):
+        """
+        Bring the channel's reaction-role menus in line with the config.
+
+        Menus recorded in ``existing`` (this guild's stored reaction roles) are
+        reused: outdated embeds are edited and only missing bot reactions are
+        added or stale ones removed. Menus that can't be found are sent anew.
+
+        Returns:
+            tuple: (reaction_data for this guild, change counts)
+        """
+        existing = existing or {}
+        stored_by_type = {
+            msg_data['type']: message_id for message_id, msg_data in existing.items()
+            if msg_data.get('channel_id') == channel.id
         }
+        changes = {'messages_sent': 0, 'messages_edited': 0, 'reactions_added': 0, 'reactions_removed': 0}
+        reaction_data = {}
 
-        return reaction_data
+        for menu_type, role_map in REACTION_ROLE_MAPS.items():
+            embed = self._menu_embed(menu_type)
+            message = None
+            if menu_type in stored_by_type:
+                try:
+                    message = await channel.fetch_message(int(stored_by_type[menu_type]))
+                except discord.NotFound:
+                    message = None
+
+            if message is None:
+                if changes['messages_sent'] or reaction_data:
+                    await channel.send(MENU_SEPARATOR)
+                message = await channel.send(embed=embed)
+                changes['messages_sent'] += 1
+                present = set()
+            else:
+                if not message.embeds or self._embed_signature(message.embeds[0]) != self._embed_signature(embed):
+                    await message.edit(embed=embed)
+                    changes['messages_edited'] += 1
+                present = {str(reaction.emoji) for reaction in message.reactions if reaction.me}
+
+            for emoji in role_map:
+                if emoji not in present:
+                    await request_scheduler.run(('reactions', channel.id), lambda: message.add_reaction(emoji))
+                    changes['reactions_added'] += 1
+            for emoji in present - set(role_map):
+                await request_scheduler.run(('reactions', channel.id), lambda: message.remove_reaction(emoji, channel.guild.me))
+                changes['reactions_removed'] += 1
+
+            reaction_data[str(message.id)] = {
+                'type': menu_type,
+                'channel_id': channel.id,
+                'guild_id': guild_id
+            }
+
+        return reaction_data, changes
+
+    @commands.command()
+    @commands.has_permissions(administrator=True)
+    async def setup_role_picker(self, ctx, channel: discord.TextChannel = None):
+        """
+        Post the select-menu role picker (colours, special roles, pronouns).
+
+        An alternative to the reaction menus of !setup_roles, which still
+        creates the roles and handles verification.
+        """
+        channel = channel or ctx.channel
+        embed = discord.Embed(
+            title="🎨 Choose Your Essence",
+            description=(
+                "Pick from the menus below. Your color may be one essence, common or exotic; "
+                "crafts and pronouns may be many. Clearing a menu removes those roles."
+            ),
+            color=discord.Color.gold()
+        )
+        embed.set_footer(text="Your wishes shall be granted...")
+        try:
+            await channel.send(embed=embed, view=RolePickerView())
+        except discord.Forbidden:
+            await ctx.send(embed=discord.Embed(
+                description=f"❌ Missing permissions to post in {channel.mention}!",
+                color=discord.Color.red()
+            ))
+            return
+        if channel != ctx.channel:
+            await ctx.send(embed=discord.Embed(
+                description=f"✅ Role picker posted in {channel.mention}",
+                color=discord.Color.green()
+            ))
 
     @commands.command()
     @commands.has_permissions(manage_roles=True)
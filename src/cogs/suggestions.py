@@ -1,18 +1,29 @@
 import discord
 from discord.ext import commands, tasks
 import asyncio
+import copy
 import logging
 from datetime import datetime, timedelta
 from typing import Optional, Dict, List
-import json
-from database import db
+from database import db, adb
 from config import DREAMER_ROLE, MOD_ROLES
 from utils import has_mod_role
+from utils.suggestion_index import WISH_TYPES, suggestion_index
+from utils.member_counts import human_member_counts
+from utils.write_debouncer import DebouncedWriter
+from utils.guild_jobs import run_per_guild
 
 logger = logging.getLogger(__name__)
 
-# Rate limit handling
-MESSAGE_FETCH_DELAY = 0.1  # 100ms between message fetches to avoid rate limits
+# Vote resync reads channel history in pages rather than fetching each wish
+SYNC_HISTORY_PAGE_SIZE = 100  # Discord's maximum messages per history request
+
+# Weekly summary state (next run time, last summary per guild) in the task_state store
+WEEKLY_SUMMARY_TASK = 'weekly_summary'
+# !weeklysummary warns when a guild's summary was posted more recently than this
+SUMMARY_DUPLICATE_WINDOW = timedelta(days=6)
+# Wait before retrying a failed load of the weekly summary state
+SUMMARY_STATE_RETRY_SECONDS = 60
 
 class Suggestions(commands.Cog):
     """Ahamkara suggestion system for wishes and desires"""
@@ -23,11 +34,40 @@ class Suggestions(commands.Cog):
         self.suggestions_channel_name = "suggestions"
         self.community_category_name = "💬 Community"
 
+        # Every wish, keyed by message id. Loaded once; vote counts are kept
+        # current from raw reaction events, so reads never hit the database.
+        self._suggestions = None
+        # Message ids (int) of every wish, checked before any other vote handling
+        self._tracked_wishes = set()
+        # Vote bursts on one wish collapse into a single write of its latest count
+        self._vote_writes = DebouncedWriter(self._write_wish)
+        # Full reconciliation runs on the first on_ready only; gateway
+        # reconnects fire on_ready again and only catch up on newer wishes
+        self._reconciled = False
+        # channel_id -> newest wish message id (int) reconciled in that channel
+        self._history_marks = {}
+        # Guilds are processed concurrently; their full-table saves must not
+        # overlap, and single-wish writes wait for them so a save of an older
+        # snapshot can't undo (or delete) a row written meanwhile
+        self._save_lock = asyncio.Lock()
+        # Persisted weekly summary schedule and per-guild last-summary pointers
+        self._summary_state = None
+
         # Start weekly summary task
         self.weekly_summary.start()
 
-    def cog_unload(self):
+    async def cog_load(self):
+        """Load wishes into memory before any reaction events arrive"""
+        try:
+            await self._get_suggestions()
+        except Exception as e:
+            # Retried on first use (at the latest by the on_ready sync)
+            logger.warning(f"[Suggestions] Wish load failed, will retry: {type(e).__name__}: {e}")
+
+    async def cog_unload(self):
         self.weekly_summary.cancel()
+        # Bot.close() unloads cogs, so buffered votes are written before shutdown
+        await self._vote_writes.flush()
 
     async def has_dreamer_role(self, member):
         """Check if member has Dreamer role or higher"""
@@ -112,7 +152,7 @@ class Suggestions(commands.Cog):
         await message.add_reaction('🌟')
 
         # Save to database
-        self._save_suggestion(str(message.id), 'video', ctx.author.id, description, ctx.guild.id, ctx.channel.id)
+        await self._save_suggestion(str(message.id), 'video', ctx.author.id, description, ctx.guild.id, ctx.channel.id)
 
     async def _handle_channel_wish(self, ctx, description):
         """Handle channel suggestion"""
@@ -143,7 +183,7 @@ class Suggestions(commands.Cog):
 
         # Save to database
         full_desc = f"{channel_name}: {channel_desc}"
-        self._save_suggestion(str(message.id), 'channel', ctx.author.id, full_desc, ctx.guild.id, ctx.channel.id)
+        await self._save_suggestion(str(message.id), 'channel', ctx.author.id, full_desc, ctx.guild.id, ctx.channel.id)
 
     async def _handle_other_wish(self, ctx, description):
         """Handle other suggestion"""
@@ -160,12 +200,11 @@ class Suggestions(commands.Cog):
         await message.add_reaction('🌟')
 
         # Save to database
-        self._save_suggestion(str(message.id), 'other', ctx.author.id, description, ctx.guild.id, ctx.channel.id)
+        await self._save_suggestion(str(message.id), 'other', ctx.author.id, description, ctx.guild.id, ctx.channel.id)
 
-    def _save_suggestion(self, message_id: str, suggestion_type: str, author_id: int, description: str, guild_id: int, channel_id: int):
+    async def _save_suggestion(self, message_id: str, suggestion_type: str, author_id: int, description: str, guild_id: int, channel_id: int):
         """Save suggestion to database"""
-        suggestions = self._load_suggestions()
-        suggestions[message_id] = {
+        await self._store_wish(message_id, {
             'type': suggestion_type,
             'author_id': author_id,
             'description': description,
@@ -174,86 +213,139 @@ class Suggestions(commands.Cog):
             'votes': 0,
             'status': 'active',
             'created_at': datetime.utcnow().isoformat()
-        }
-        self._save_suggestions_to_db(suggestions)
+        })
 
-    def _load_suggestions(self) -> Dict:
-        """Load suggestions from database"""
-        if not db.supabase:
-            try:
-                with open('suggestions.json', 'r') as f:
-                    return json.load(f)
-            except:
-                return {}
+    async def _get_suggestions(self) -> Dict:
+        """The in-memory wishes, loaded from the database on first use
 
-        try:
-            response = db.supabase.table('suggestions').select("*").execute()
-            return {item['message_id']: item['data'] for item in response.data}
-        except:
-            return {}
+        A failed load raises rather than caching an empty set as every wish,
+        and is retried on the next call.
+        """
+        if self._suggestions is None:
+            self._suggestions = await adb.run(self._load_suggestions)
+            self._reindex(self._suggestions)
+        return self._suggestions
+
+    def _reindex(self, suggestions):
+        """Rebuild the tracked wish ids and leaderboard index from the in-memory wishes"""
+        self._tracked_wishes = {int(message_id) for message_id in suggestions}
+        suggestion_index.rebuild(suggestions)
+
+    async def _store_wish(self, message_id: str, suggestion: Dict):
+        """Record a new or changed wish in memory and write its single row"""
+        suggestions = await self._get_suggestions()
+        suggestions[message_id] = suggestion
+        self._tracked_wishes.add(int(message_id))
+        suggestion_index.update(message_id, suggestion)
+        await self._vote_writes.cancel(message_id)
+        async with self._save_lock:
+            await adb.run(self._save_suggestion_to_db, message_id, suggestion)
+
+    def _drop_wish(self, suggestions: Dict, message_id: str):
+        """Remove a wish from memory (the caller persists the removal)"""
+        suggestions.pop(message_id, None)
+        self._tracked_wishes.discard(int(message_id))
+        suggestion_index.remove(message_id)
+
+    async def _forget_wish(self, message_id: str):
+        """Remove a wish from memory and delete its single row"""
+        self._drop_wish(await self._get_suggestions(), message_id)
+        await self._vote_writes.cancel(message_id)
+        async with self._save_lock:
+            await adb.run(self._delete_suggestion_from_db, message_id)
+
+    async def _write_wish(self, message_id: str, suggestion: Dict):
+        """Write a debounced vote update, unless the wish was removed meanwhile"""
+        if int(message_id) not in self._tracked_wishes:
+            return
+        async with self._save_lock:
+            await adb.run(self._save_suggestion_to_db, message_id, suggestion)
+
+    def _top_wishes(self, suggestions, guild_id, wish_type, limit):
+        """A guild's most-voted active wishes of a type, as (message_id, data) pairs"""
+        return [(msg_id, suggestions[msg_id]) for msg_id in suggestion_index.top(guild_id, wish_type, limit)]
+
+    def _load_suggestions(self) -> Dict:
+        """Load suggestions from database (raises if the read fails)"""
+        return db.load_suggestions(strict=True)
 
     def _save_suggestions_to_db(self, data: Dict):
         """Save suggestions to database"""
-        if not db.supabase:
-            with open('suggestions.json', 'w') as f:
-                json.dump(data, f)
-            return
+        db.save_suggestions(data)
 
-        try:
-            # Clear existing
-            db.supabase.table('suggestions').delete().neq('message_id', '0').execute()
-
-            # Insert new data
-            for message_id, suggestion_data in data.items():
-                db.supabase.table('suggestions').upsert({
-                    'message_id': message_id,
-                    'data': suggestion_data
-                }).execute()
-        except Exception as e:
-            print(f"Database error, falling back to JSON: {e}")
-            with open('suggestions.json', 'w') as f:
-                json.dump(data, f)
+    def _save_suggestion_to_db(self, message_id: str, data: Dict):
+        """Save one suggestion to database"""
+        db.save_suggestion(message_id, data)
 
-    async def sync_reaction_counts(self, guild):
+    def _delete_suggestion_from_db(self, message_id: str):
+        """Delete one suggestion from database"""
+        db.delete_suggestion(message_id)
+
+    async def sync_reaction_counts(self, guild, incremental=False):
         """Sync reaction counts from actual Discord messages to database
 
         This ensures vote counts remain accurate after bot restarts by treating
-        Discord messages as the single source of truth.
+        Discord messages as the single source of truth. Each channel holding
+        active wishes is read newest-first in history pages, so one request
+        covers up to SYNC_HISTORY_PAGE_SIZE wishes, and the scan stops once it
+        passes the channel's oldest active wish.
+
+        Args:
+            guild (discord.Guild): Guild to reconcile
+            incremental (bool): Only reconcile wishes newer than the last one
+                reconciled in each channel; channels with none are not read
         """
-        suggestions = self._load_suggestions()
+        suggestions = await self._get_suggestions()
         suggestions_channel = self.get_suggestions_channel(guild)
 
         if not suggestions_channel:
-            return {'synced': 0, 'deleted': 0, 'errors': 0, 'manifested': 0}
+            return {'synced': 0, 'deleted': 0, 'errors': 0, 'manifested': 0, 'requests': 0}
 
         synced = 0
         deleted = 0
         errors = 0
         manifested = 0
+        requests = 0
 
-        # Filter for this guild's active suggestions
-        guild_suggestions = {
-            msg_id: data for msg_id, data in suggestions.items()
-            if data['guild_id'] == guild.id
-            and data.get('status', 'active') == 'active'
-        }
-
-        for message_id, suggestion_data in guild_suggestions.items():
-            try:
-                # Small delay between fetches to respect rate limits
-                await asyncio.sleep(MESSAGE_FETCH_DELAY)
+        # Group this guild's active suggestions by the channel they were posted in
+        wishes_by_channel = {}
+        for msg_id, data in suggestions.items():
+            if data['guild_id'] == guild.id and data.get('status', 'active') == 'active':
+                channel_id = data.get('channel_id', suggestions_channel.id)
+                if incremental and int(msg_id) <= self._history_marks.get(channel_id, 0):
+                    continue
+                wishes_by_channel.setdefault(channel_id, []).append(msg_id)
 
-                # Get the channel where this message was posted
-                channel_id = suggestion_data.get('channel_id', suggestions_channel.id)
-                channel = guild.get_channel(channel_id)
+        for channel_id, message_ids in wishes_by_channel.items():
+            channel = guild.get_channel(channel_id)
+            if not channel:
+                errors += len(message_ids)
+                continue
 
-                if not channel:
-                    errors += 1
+            try:
+                messages, pages = await self._scan_wish_messages(channel, {int(msg_id) for msg_id in message_ids})
+            except discord.Forbidden:
+                # Bot doesn't have permission to read the channel
+                errors += len(message_ids)
+                continue
+            except Exception as e:
+                # Log other errors but continue with the next channel
+                print(f"Error syncing channel {channel_id}: {e}")
+                errors += len(message_ids)
+                continue
+            requests += pages
+            newest = max(int(msg_id) for msg_id in message_ids)
+            self._history_marks[channel_id] = max(self._history_marks.get(channel_id, 0), newest)
+
+            for message_id in message_ids:
+                message = messages.get(int(message_id))
+                if message is None:
+                    # Message was deleted - remove from database
+                    self._drop_wish(suggestions, message_id)
+                    await self._vote_writes.cancel(message_id)
+                    deleted += 1
                     continue
 
-                # Fetch the actual message
-                message = await channel.fetch_message(int(message_id))
-
                 # Count actual reactions (subtract 1 for bot's reaction)
                 actual_votes = 0
                 for reaction in message.reactions:
@@ -262,94 +354,163 @@ class Suggestions(commands.Cog):
                         break
 
                 # Compare with DB count
-                db_votes = suggestion_data.get('votes', 0)
-
-                if actual_votes != db_votes:
+                suggestion_data = suggestions[message_id]
+                if actual_votes != suggestion_data.get('votes', 0):
                     # Update database
-                    suggestions[message_id]['votes'] = actual_votes
+                    suggestion_data['votes'] = actual_votes
+                    suggestion_index.update(message_id, suggestion_data)
                     synced += 1
 
                     # Check if channel suggestion meets threshold
                     if suggestion_data['type'] == 'channel':
-                        member_count = len([m for m in guild.members if not m.bot])
+                        member_count = human_member_counts.count(guild)
                         threshold_votes = int(member_count * self.vote_threshold)
 
                         if actual_votes >= threshold_votes:
                             # Auto-manifest the channel
-                            await self._create_suggested_channel(message, suggestions[message_id])
+                            await self._create_suggested_channel(message, suggestion_data)
                             manifested += 1
 
-            except discord.NotFound:
-                # Message was deleted - remove from database
-                del suggestions[message_id]
-                deleted += 1
-            except discord.Forbidden:
-                # Bot doesn't have permission to access message
-                errors += 1
-            except Exception as e:
-                # Log other errors but continue
-                print(f"Error syncing message {message_id}: {e}")
-                errors += 1
-
         # Save updated suggestions
         if synced > 0 or deleted > 0:
-            self._save_suggestions_to_db(suggestions)
+            async with self._save_lock:
+                # A snapshot: the live dict keeps changing while the thread pool saves
+                await adb.run(self._save_suggestions_to_db, copy.deepcopy(suggestions))
 
         return {
             'synced': synced,
             'deleted': deleted,
             'errors': errors,
-            'manifested': manifested
+            'manifested': manifested,
+            'requests': requests
         }
 
+    async def _scan_wish_messages(self, channel, message_ids):
+        """Find wish messages by paging back through a channel's history
+
+        Args:
+            channel (discord.TextChannel): Channel the wishes were posted in
+            message_ids (set): Wish message ids (int) to look for
+
+        Returns:
+            tuple: ({message_id: message} for the wishes found, history requests made).
+            Wishes missing from the result no longer exist.
+        """
+        remaining = set(message_ids)
+        oldest = min(remaining)
+        found = {}
+        requests = 0
+        before = None
+
+        while remaining:
+            page = [message async for message in channel.history(limit=SYNC_HISTORY_PAGE_SIZE, before=before)]
+            requests += 1
+            for message in page:
+                if message.id in remaining:
+                    found[message.id] = message
+                    remaining.discard(message.id)
+
+            # Stop at the end of the channel or once past the oldest wish
+            if len(page) < SYNC_HISTORY_PAGE_SIZE or page[-1].id <= oldest:
+                break
+            before = page[-1]
+
+        return found, requests
+
     @commands.Cog.listener()
     async def on_ready(self):
-        """Sync reaction counts on bot startup"""
+        """Reconcile vote counts with Discord after (re)connecting
+
+        Votes are tracked from reaction events while connected; this catches
+        up on any cast while the bot was offline. The first ready of the
+        process reconciles every active wish. discord.py fires on_ready again
+        after gateway reconnects; those only reconcile wishes newer than the
+        last one processed per channel, so a flaky connection doesn't trigger
+        full history rescans while Discord is already rate-limiting us.
+        """
         await self.bot.wait_until_ready()
 
-        # Sync all guilds
-        for guild in self.bot.guilds:
-            try:
-                stats = await self.sync_reaction_counts(guild)
-                print(f"[Suggestions] Synced guild {guild.name}: {stats['synced']} updated, {stats['deleted']} deleted, {stats['manifested']} manifested")
-            except Exception as e:
-                print(f"[Suggestions] Error syncing guild {guild.name}: {e}")
+        incremental = self._reconciled
+        self._reconciled = True
+        label = "Caught up" if incremental else "Synced"
+
+        async def sync_guild(guild):
+            stats = await self.sync_reaction_counts(guild, incremental=incremental)
+            print(f"[Suggestions] {label} guild {guild.name}: {stats['synced']} updated, {stats['deleted']} deleted, {stats['manifested']} manifested ({stats['requests']} requests)")
+            return stats
+
+        # Sync all guilds, a few at a time (failures are logged per guild)
+        await run_per_guild('suggestions_sync', self.bot.guilds, sync_guild)
+
+    def _is_own_or_bot_reaction(self, payload):
+        """Whether a raw reaction was made by this bot or another bot"""
+        if payload.user_id == self.bot.user.id:
+            return True
+        member = payload.member
+        if member is None and payload.guild_id:
+            guild = self.bot.get_guild(payload.guild_id)
+            member = guild.get_member(payload.user_id) if guild else None
+        return bool(member and member.bot)
+
+    async def _update_votes(self, message_id, update):
+        """Update a wish's in-memory vote count and queue a debounced write of its row
+
+        Returns:
+            dict: The wish, or None if the message isn't a wish
+        """
+        suggestions = await self._get_suggestions()
+        suggestion = suggestions.get(str(message_id))
+        if suggestion is None:
+            return None
+        suggestion['votes'] = max(0, update(suggestion.get('votes', 0)))
+        suggestion_index.update(message_id, suggestion)
+        self._vote_writes.schedule(str(message_id), suggestion)
+        return suggestion
 
     @commands.Cog.listener()
-    async def on_reaction_add(self, reaction, user):
-        """Handle voting on suggestions"""
-        if user.bot or str(reaction.emoji) != '🌟':
+    async def on_raw_reaction_add(self, payload):
+        """Count a vote on a wish, cached message or not"""
+        if payload.message_id not in self._tracked_wishes or str(payload.emoji) != '🌟':
+            return
+        if self._is_own_or_bot_reaction(payload):
             return
 
-        suggestions = self._load_suggestions()
-        message_id = str(reaction.message.id)
-
-        if message_id in suggestions:
-            suggestions[message_id]['votes'] = reaction.count - 1  # Subtract bot's reaction
-            self._save_suggestions_to_db(suggestions)
+        suggestion = await self._update_votes(payload.message_id, lambda votes: votes + 1)
+        if suggestion is None:
+            return
 
-            # Check if channel suggestion meets threshold
-            suggestion = suggestions[message_id]
-            if suggestion['type'] == 'channel':
-                await self._check_channel_threshold(reaction.message, suggestion)
+        # Check if channel suggestion meets threshold
+        if suggestion['type'] == 'channel' and suggestion.get('status', 'active') == 'active':
+            channel = self.bot.get_channel(payload.channel_id)
+            if channel:
+                await self._check_channel_threshold(channel.get_partial_message(payload.message_id), suggestion)
 
     @commands.Cog.listener()
-    async def on_reaction_remove(self, reaction, user):
-        """Handle vote removal on suggestions"""
-        if user.bot or str(reaction.emoji) != '🌟':
+    async def on_raw_reaction_remove(self, payload):
+        """Withdraw a vote on a wish"""
+        if payload.message_id not in self._tracked_wishes or str(payload.emoji) != '🌟':
             return
+        if self._is_own_or_bot_reaction(payload):
+            return
+
+        await self._update_votes(payload.message_id, lambda votes: votes - 1)
 
-        suggestions = self._load_suggestions()
-        message_id = str(reaction.message.id)
+    @commands.Cog.listener()
+    async def on_raw_reaction_clear(self, payload):
+        """All reactions on a wish were removed"""
+        if payload.message_id in self._tracked_wishes:
+            await self._update_votes(payload.message_id, lambda votes: 0)
 
-        if message_id in suggestions:
-            suggestions[message_id]['votes'] = max(0, reaction.count - 1)  # Subtract bot's reaction
-            self._save_suggestions_to_db(suggestions)
+    @commands.Cog.listener()
+    async def on_raw_reaction_clear_emoji(self, payload):
+        """The 🌟 reactions on a wish were removed"""
+        if payload.message_id in self._tracked_wishes and str(payload.emoji) == '🌟':
+            await self._update_votes(payload.message_id, lambda votes: 0)
 
     async def _check_channel_threshold(self, message, suggestion):
         """Check if channel suggestion meets voting threshold"""
         guild = message.guild
-        member_count = len([m for m in guild.members if not m.bot])
+        member_count = human_member_counts.count(guild)
         threshold_votes = int(member_count * self.vote_threshold)
 
         if suggestion['votes'] >= threshold_votes:
@@ -389,9 +550,7 @@ class Suggestions(commands.Cog):
             await message.reply(embed=embed)
 
             # Remove suggestion from database
-            suggestions = self._load_suggestions()
-            del suggestions[str(message.id)]
-            self._save_suggestions_to_db(suggestions)
+            await self._forget_wish(str(message.id))
 
         except Exception as e:
             embed = discord.Embed(
@@ -403,23 +562,11 @@ class Suggestions(commands.Cog):
     @commands.command(name='topvideos')
     async def top_videos(self, ctx, limit: int = 10):
         """*List the most desired video visions...*"""
-        # Sync reaction counts before generating list
-        await self.sync_reaction_counts(ctx.guild)
-
-        suggestions = self._load_suggestions()
+        suggestions = await self._get_suggestions()
         suggestions_channel = self.get_suggestions_channel(ctx.guild)
 
-        # Filter for active video suggestions only
-        video_suggestions = [
-            (msg_id, data) for msg_id, data in suggestions.items()
-            if data['type'] == 'video'
-            and data['guild_id'] == ctx.guild.id
-            and data.get('status', 'active') == 'active'
-        ]
-
-        # Sort by votes
-        video_suggestions.sort(key=lambda x: x[1]['votes'], reverse=True)
-        video_suggestions = video_suggestions[:limit]
+        # Most-voted active video suggestions, from the leaderboard index
+        video_suggestions = self._top_wishes(suggestions, ctx.guild.id, 'video', limit)
 
         if not video_suggestions:
             embed = discord.Embed(
@@ -453,23 +600,11 @@ class Suggestions(commands.Cog):
     @commands.command(name='topother')
     async def top_other(self, ctx, limit: int = 10):
         """*List the most desired other wishes...*"""
-        # Sync reaction counts before generating list
-        await self.sync_reaction_counts(ctx.guild)
-
-        suggestions = self._load_suggestions()
+        suggestions = await self._get_suggestions()
         suggestions_channel = self.get_suggestions_channel(ctx.guild)
 
-        # Filter for active other suggestions only
-        other_suggestions = [
-            (msg_id, data) for msg_id, data in suggestions.items()
-            if data['type'] == 'other'
-            and data['guild_id'] == ctx.guild.id
-            and data.get('status', 'active') == 'active'
-        ]
-
-        # Sort by votes
-        other_suggestions.sort(key=lambda x: x[1]['votes'], reverse=True)
-        other_suggestions = other_suggestions[:limit]
+        # Most-voted active other suggestions, from the leaderboard index
+        other_suggestions = self._top_wishes(suggestions, ctx.guild.id, 'other', limit)
 
         if not other_suggestions:
             embed = discord.Embed(
@@ -503,23 +638,11 @@ class Suggestions(commands.Cog):
     @commands.command(name='topchannels')
     async def top_channels(self, ctx, limit: int = 10):
         """*List the most desired channel wishes...*"""
-        # Sync reaction counts before generating list
-        await self.sync_reaction_counts(ctx.guild)
-
-        suggestions = self._load_suggestions()
+        suggestions = await self._get_suggestions()
         suggestions_channel = self.get_suggestions_channel(ctx.guild)
 
-        # Filter for active channel suggestions only
-        channel_suggestions = [
-            (msg_id, data) for msg_id, data in suggestions.items()
-            if data['type'] == 'channel'
-            and data['guild_id'] == ctx.guild.id
-            and data.get('status', 'active') == 'active'
-        ]
-
-        # Sort by votes
-        channel_suggestions.sort(key=lambda x: x[1]['votes'], reverse=True)
-        channel_suggestions = channel_suggestions[:limit]
+        # Most-voted active channel suggestions, from the leaderboard index
+        channel_suggestions = self._top_wishes(suggestions, ctx.guild.id, 'channel', limit)
 
         if not channel_suggestions:
             embed = discord.Embed(
@@ -557,9 +680,6 @@ class Suggestions(commands.Cog):
 
         For testing purposes. Includes duplicate detection.
         """
-        # Sync reaction counts before generating summary
-        await self.sync_reaction_counts(ctx.guild)
-
         suggestions_channel = self.get_suggestions_channel(ctx.guild)
         if not suggestions_channel:
             embed = discord.Embed(
@@ -569,56 +689,40 @@ class Suggestions(commands.Cog):
             await ctx.send(embed=embed)
             return
 
-        # Check for duplicate in last 5 messages
+        # Check whether this week's summary was already posted
         try:
-            recent_messages = []
-            async for message in suggestions_channel.history(limit=5):
-                recent_messages.append(message)
-
-            # Check if any recent message is a weekly summary from the bot
-            found_duplicate = False
-            for msg in recent_messages:
-                if msg.author == self.bot.user and msg.embeds:
-                    for embed in msg.embeds:
-                        if embed.title and "Weekly Wish Summary" in embed.title:
-                            found_duplicate = True
-                            break
-                if found_duplicate:
-                    break
-
-            if found_duplicate:
-                warning_embed = discord.Embed(
-                    title="⚠️ Duplicate Detected",
-                    description="*A weekly summary already exists within the last 5 messages. This prevents spam.*\n\nDo you still want to post another summary?",
-                    color=discord.Color.orange()
-                )
-                warning_msg = await ctx.send(embed=warning_embed)
-
-                # Wait for user confirmation (simplified - just inform)
-                confirm_embed = discord.Embed(
-                    description="*Posting summary anyway for testing purposes...*",
-                    color=discord.Color.blue()
-                )
-                await ctx.send(embed=confirm_embed)
-        except:
-            pass  # Continue even if duplicate check fails
+            last_summary = await self._recent_summary(ctx.guild)
+        except Exception as e:
+            logger.warning(f"[Suggestions] Weekly summary state load failed: {type(e).__name__}: {e}")
+            embed = discord.Embed(
+                description="*The record of past summaries is clouded... try again shortly.*",
+                color=discord.Color.red()
+            )
+            await ctx.send(embed=embed)
+            return
+        if last_summary:
+            summary_link = f"https://discord.com/channels/{ctx.guild.id}/{last_summary['channel_id']}/{last_summary['message_id']}"
+            warning_embed = discord.Embed(
+                title="⚠️ Duplicate Detected",
+                description=f"*A [weekly summary]({summary_link}) was already posted this week. This prevents spam.*\n\nDo you still want to post another summary?",
+                color=discord.Color.orange()
+            )
+            await ctx.send(embed=warning_embed)
+
+            # Wait for user confirmation (simplified - just inform)
+            confirm_embed = discord.Embed(
+                description="*Posting summary anyway for testing purposes...*",
+                color=discord.Color.blue()
+            )
+            await ctx.send(embed=confirm_embed)
 
         # Generate and post summary
-        suggestions = self._load_suggestions()
-        guild_suggestions = {
-            msg_id: data for msg_id, data in suggestions.items()
-            if data['guild_id'] == ctx.guild.id
-            and data.get('status', 'active') == 'active'
-        }
+        suggestions = await self._get_suggestions()
 
         # Get top video, channel, and other suggestions (active only)
-        video_suggestions = [(msg_id, data) for msg_id, data in guild_suggestions.items() if data['type'] == 'video']
-        channel_suggestions = [(msg_id, data) for msg_id, data in guild_suggestions.items() if data['type'] == 'channel']
-        other_suggestions = [(msg_id, data) for msg_id, data in guild_suggestions.items() if data['type'] == 'other']
-
-        video_suggestions.sort(key=lambda x: x[1]['votes'], reverse=True)
-        channel_suggestions.sort(key=lambda x: x[1]['votes'], reverse=True)
-        other_suggestions.sort(key=lambda x: x[1]['votes'], reverse=True)
+        video_suggestions = self._top_wishes(suggestions, ctx.guild.id, 'video', 5)
+        channel_suggestions = self._top_wishes(suggestions, ctx.guild.id, 'channel', 5)
+        other_suggestions = self._top_wishes(suggestions, ctx.guild.id, 'other', 5)
 
         embed = discord.Embed(
             title="📅 Weekly Wish Summary",
@@ -658,7 +762,8 @@ class Suggestions(commands.Cog):
             embed.add_field(name="✨ Top Other Wishes", value=other_text, inline=False)
 
         if video_suggestions or channel_suggestions or other_suggestions:
-            await suggestions_channel.send(embed=embed)
+            summary_message = await suggestions_channel.send(embed=embed)
+            await self._record_summary(ctx.guild, summary_message)
             success_embed = discord.Embed(
                 description="*Weekly summary posted successfully.*",
                 color=discord.Color.green()
@@ -698,7 +803,7 @@ class Suggestions(commands.Cog):
         This command backfills channel_id and status for suggestions created before updates.
         Only needed once after upgrading the bot.
         """
-        suggestions = self._load_suggestions()
+        suggestions = await self._get_suggestions()
         suggestions_channel = self.get_suggestions_channel(ctx.guild)
 
         if not suggestions_channel:
@@ -749,7 +854,9 @@ class Suggestions(commands.Cog):
 
         # Save updated suggestions
         if migrated_channel > 0 or migrated_status > 0 or defaulted > 0:
-            self._save_suggestions_to_db(suggestions)
+            self._reindex(suggestions)
+            async with self._save_lock:
+                await adb.run(self._save_suggestions_to_db, copy.deepcopy(suggestions))
 
         # Report results
         result_embed = discord.Embed(
@@ -775,6 +882,27 @@ class Suggestions(commands.Cog):
 
         await status_msg.edit(embed=result_embed)
 
+    @commands.command(name='migratewishstorage')
+    @has_mod_role()
+    async def migrate_wish_storage(self, ctx):
+        """*Copy wishes into the normalized wishes table...*
+
+        Run once before switching SUGGESTIONS_STORAGE to 'normalized'. Safe to re-run.
+        """
+        copied = await adb.migrate_suggestions_to_normalized()
+        if copied is None:
+            embed = discord.Embed(
+                description="*The pattern could not be rewoven - Supabase is not configured or the copy failed.*",
+                color=discord.Color.red()
+            )
+        else:
+            embed = discord.Embed(
+                title="✅ Wish Storage Migrated",
+                description=f"*Copied **{copied}** wishes into `wishes`.*",
+                color=discord.Color.green()
+            )
+        await ctx.send(embed=embed)
+
     @commands.command(name='manifestwish')
     @has_mod_role()
     async def manifest_wish(self, ctx, message_id: str, *, notes: str = None):
@@ -787,7 +915,7 @@ class Suggestions(commands.Cog):
         if 'discord.com/channels/' in message_id:
             message_id = message_id.split('/')[-1]
 
-        suggestions = self._load_suggestions()
+        suggestions = await self._get_suggestions()
 
         if message_id not in suggestions:
             embed = discord.Embed(
@@ -823,8 +951,7 @@ class Suggestions(commands.Cog):
         suggestion['granted_by'] = ctx.author.id
         suggestion['granted_notes'] = notes if notes else 'No notes provided'
 
-        suggestions[message_id] = suggestion
-        self._save_suggestions_to_db(suggestions)
+        await self._store_wish(message_id, suggestion)
 
         # Try to add ✅ reaction to original message
         try:
@@ -859,30 +986,20 @@ class Suggestions(commands.Cog):
         Usage: !manifestations [type] [limit]
         Type can be: video, channel, other, or all (default: all)
         """
-        suggestions = self._load_suggestions()
+        suggestions = await self._get_suggestions()
         suggestions_channel = self.get_suggestions_channel(ctx.guild)
 
-        # Filter for granted wishes
-        granted_wishes = [
-            (msg_id, data) for msg_id, data in suggestions.items()
-            if data.get('status') == 'granted'
-            and data['guild_id'] == ctx.guild.id
-        ]
-
-        # Filter by type if specified
-        if wish_type and wish_type.lower() in ['video', 'channel', 'other']:
+        # Granted wishes, newest first, filtered by type if specified
+        type_filter = wish_type.lower() if wish_type and wish_type.lower() in WISH_TYPES else None
+        if adb.database.suggestions_queryable:
+            # Normalized storage serves granted history from its granted_at index
+            granted_wishes = await adb.query_suggestions(ctx.guild.id, type_filter, 'granted', limit)
+        else:
             granted_wishes = [
-                (msg_id, data) for msg_id, data in granted_wishes
-                if data['type'] == wish_type.lower()
+                (msg_id, suggestions[msg_id])
+                for msg_id in suggestion_index.granted(ctx.guild.id, type_filter, limit)
             ]
 
-        # Sort by granted_at (newest first)
-        granted_wishes.sort(
-            key=lambda x: x[1].get('granted_at', ''),
-            reverse=True
-        )
-        granted_wishes = granted_wishes[:limit]
-
         if not granted_wishes:
             type_str = f" {wish_type}" if wish_type else ""
             embed = discord.Embed(
@@ -959,7 +1076,7 @@ class Suggestions(commands.Cog):
         if 'discord.com/channels/' in message_id:
             message_id = message_id.split('/')[-1]
 
-        suggestions = self._load_suggestions()
+        suggestions = await self._get_suggestions()
 
         if message_id not in suggestions:
             embed = discord.Embed(
@@ -974,8 +1091,7 @@ class Suggestions(commands.Cog):
         wish_type = suggestion['type']
 
         # Remove from database
-        del suggestions[message_id]
-        self._save_suggestions_to_db(suggestions)
+        await self._forget_wish(message_id)
 
         # Try to delete the message if we're in the suggestions channel
         try:
@@ -993,116 +1109,155 @@ class Suggestions(commands.Cog):
         )
         await ctx.send(embed=embed)
 
-    @tasks.loop(hours=168)  # Run weekly (168 hours)
+    @staticmethod
+    def _next_summary_time(now):
+        """The first Monday midnight (UTC) after now"""
+        days_ahead = 0 - now.weekday()  # Monday is 0
+        if days_ahead <= 0:  # Target day already happened this week
+            days_ahead += 7
+
+        next_monday = now + timedelta(days=days_ahead)
+        return next_monday.replace(hour=0, minute=0, second=0, microsecond=0)
+
+    async def _get_summary_state(self):
+        """
+        The persisted weekly summary state, loaded from the database on first use
+
+        A failed load raises and is retried on the next call; treating it as
+        "never saved" would overwrite the stored pointers and schedule.
+        """
+        if self._summary_state is None:
+            state = await adb.load_task_state(WEEKLY_SUMMARY_TASK, strict=True) or {}
+            state.setdefault('last_posts', {})
+            self._summary_state = state
+        return self._summary_state
+
+    async def _save_summary_state(self):
+        # Saved from a snapshot; other guilds' jobs may update the state meanwhile
+        state = copy.deepcopy(await self._get_summary_state())
+        async with self._save_lock:
+            await adb.save_task_state(WEEKLY_SUMMARY_TASK, state)
+
+    async def _recent_summary(self, guild):
+        """The guild's last summary pointer if it was posted within SUMMARY_DUPLICATE_WINDOW, else None"""
+        state = await self._get_summary_state()
+        last_summary = state['last_posts'].get(str(guild.id))
+        if last_summary is None:
+            return None
+        if datetime.utcnow() - datetime.fromisoformat(last_summary['posted_at']) >= SUMMARY_DUPLICATE_WINDOW:
+            return None
+        return last_summary
+
+    async def _record_summary(self, guild, message, slot=None):
+        """Remember the summary just posted in a guild, for duplicate detection
+
+        slot is the scheduled run time the post served, or None for a manual
+        post, which must not stand in for the next scheduled summary.
+        """
+        state = await self._get_summary_state()
+        state['last_posts'][str(guild.id)] = {
+            'message_id': message.id,
+            'channel_id': message.channel.id,
+            'posted_at': datetime.utcnow().isoformat(),
+            'slot': slot
+        }
+        await self._save_summary_state()
+
+    @tasks.loop()  # Each run sleeps until the persisted next-run time
     async def weekly_summary(self):
-        """Send weekly summary of top suggestions"""
-        await self.bot.wait_until_ready()
+        """Send weekly summary of top suggestions
 
-        for guild in self.bot.guilds:
-            # Sync reaction counts before generating summary
-            await self.sync_reaction_counts(guild)
+        The next run time is persisted, so a restart resumes the schedule
+        instead of waiting for the following Monday, and a run missed while
+        the bot was down happens as soon as it is back.
+        """
+        try:
+            state = await self._get_summary_state()
+        except Exception as e:
+            logger.warning(f"[Suggestions] Weekly summary state load failed, retrying in {SUMMARY_STATE_RETRY_SECONDS}s: {type(e).__name__}: {e}")
+            await asyncio.sleep(SUMMARY_STATE_RETRY_SECONDS)
+            return
+        if not state.get('next_run_at'):
+            state['next_run_at'] = self._next_summary_time(datetime.utcnow()).isoformat()
+            await self._save_summary_state()
 
-            suggestions_channel = self.get_suggestions_channel(guild)
-            if not suggestions_channel:
-                continue
+        wait_seconds = (datetime.fromisoformat(state['next_run_at']) - datetime.utcnow()).total_seconds()
+        if wait_seconds > 0:
+            await asyncio.sleep(wait_seconds)
 
-            # Check for duplicate in last 5 messages
-            try:
-                recent_messages = []
-                async for message in suggestions_channel.history(limit=5):
-                    recent_messages.append(message)
-
-                # Check if any recent message is a weekly summary from the bot
-                found_duplicate = False
-                for msg in recent_messages:
-                    if msg.author == self.bot.user and msg.embeds:
-                        for embed in msg.embeds:
-                            if embed.title and "Weekly Wish Summary" in embed.title:
-                                found_duplicate = True
-                                break
-                    if found_duplicate:
-                        break
+        await run_per_guild('weekly_summary', self.bot.guilds, self._send_weekly_summary)
 
-                # Skip posting if duplicate found
-                if found_duplicate:
-                    continue
-            except:
-                pass  # Continue even if duplicate check fails
+        # Counted from now, so a caught-up run doesn't fire again at the missed slot
+        state['next_run_at'] = self._next_summary_time(datetime.utcnow()).isoformat()
+        await self._save_summary_state()
+
+    async def _send_weekly_summary(self, guild):
+        """Post one guild's weekly summary unless it was already posted"""
+        suggestions_channel = self.get_suggestions_channel(guild)
+        if not suggestions_channel:
+            return
 
-            suggestions = self._load_suggestions()
-            guild_suggestions = {
-                msg_id: data for msg_id, data in suggestions.items()
-                if data['guild_id'] == guild.id
-                and data.get('status', 'active') == 'active'
-            }
+        # Skip guilds already posted for the slot being served (e.g. a run
+        # interrupted by a restart after posting some guilds)
+        state = await self._get_summary_state()
+        slot = state['next_run_at']
+        last_summary = state['last_posts'].get(str(guild.id))
+        if last_summary and last_summary.get('slot') == slot:
+            return
 
-            # Get top video, channel, and other suggestions (active only)
-            video_suggestions = [(msg_id, data) for msg_id, data in guild_suggestions.items() if data['type'] == 'video']
-            channel_suggestions = [(msg_id, data) for msg_id, data in guild_suggestions.items() if data['type'] == 'channel']
-            other_suggestions = [(msg_id, data) for msg_id, data in guild_suggestions.items() if data['type'] == 'other']
+        suggestions = await self._get_suggestions()
 
-            video_suggestions.sort(key=lambda x: x[1]['votes'], reverse=True)
-            channel_suggestions.sort(key=lambda x: x[1]['votes'], reverse=True)
-            other_suggestions.sort(key=lambda x: x[1]['votes'], reverse=True)
+        # Get top video, channel, and other suggestions (active only)
+        video_suggestions = self._top_wishes(suggestions, guild.id, 'video', 5)
+        channel_suggestions = self._top_wishes(suggestions, guild.id, 'channel', 5)
+        other_suggestions = self._top_wishes(suggestions, guild.id, 'other', 5)
 
-            embed = discord.Embed(
-                title="📅 Weekly Wish Summary",
-                description="*The pattern reveals the most desired manifestations...*",
-                color=discord.Color.dark_purple(),
-                timestamp=datetime.utcnow()
-            )
+        embed = discord.Embed(
+            title="📅 Weekly Wish Summary",
+            description="*The pattern reveals the most desired manifestations...*",
+            color=discord.Color.dark_purple(),
+            timestamp=datetime.utcnow()
+        )
+
+        # Top video wishes
+        if video_suggestions:
+            video_text = ""
+            for i, (msg_id, data) in enumerate(video_suggestions[:5], 1):
+                # Get channel_id, default to suggestions channel if not present
+                channel_id = data.get('channel_id', suggestions_channel.id)
+                message_link = f"https://discord.com/channels/{guild.id}/{channel_id}/{msg_id}"
+                video_text += f"{i}. **{data['votes']} 🌟** - [View Wish]({message_link})\n*{data['description'][:80]}{'...' if len(data['description']) > 80 else ''}*\n\n"
+            embed.add_field(name="🎬 Top Video Wishes", value=video_text, inline=False)
+
+        # Top channel wishes
+        if channel_suggestions:
+            channel_text = ""
+            for i, (msg_id, data) in enumerate(channel_suggestions[:5], 1):
+                # Get channel_id, default to suggestions channel if not present
+                channel_id = data.get('channel_id', suggestions_channel.id)
+                message_link = f"https://discord.com/channels/{guild.id}/{channel_id}/{msg_id}"
+                channel_text += f"{i}. **{data['votes']} 🌟** - [View Wish]({message_link})\n*{data['description'][:80]}{'...' if len(data['description']) > 80 else ''}*\n\n"
+            embed.add_field(name="💬 Top Channel Wishes", value=channel_text, inline=False)
+
+        # Top other wishes
+        if other_suggestions:
+            other_text = ""
+            for i, (msg_id, data) in enumerate(other_suggestions[:5], 1):
+                # Get channel_id, default to suggestions channel if not present
+                channel_id = data.get('channel_id', suggestions_channel.id)
+                message_link = f"https://discord.com/channels/{guild.id}/{channel_id}/{msg_id}"
+                other_text += f"{i}. **{data['votes']} 🌟** - [View Wish]({message_link})\n*{data['description'][:80]}{'...' if len(data['description']) > 80 else ''}*\n\n"
+            embed.add_field(name="✨ Top Other Wishes", value=other_text, inline=False)
 
-            # Top video wishes
-            if video_suggestions:
-                video_text = ""
-                for i, (msg_id, data) in enumerate(video_suggestions[:5], 1):
-                    # Get channel_id, default to suggestions channel if not present
-                    channel_id = data.get('channel_id', suggestions_channel.id)
-                    message_link = f"https://discord.com/channels/{guild.id}/{channel_id}/{msg_id}"
-                    video_text += f"{i}. **{data['votes']} 🌟** - [View Wish]({message_link})\n*{data['description'][:80]}{'...' if len(data['description']) > 80 else ''}*\n\n"
-                embed.add_field(name="🎬 Top Video Wishes", value=video_text, inline=False)
-
-            # Top channel wishes
-            if channel_suggestions:
-                channel_text = ""
-                for i, (msg_id, data) in enumerate(channel_suggestions[:5], 1):
-                    # Get channel_id, default to suggestions channel if not present
-                    channel_id = data.get('channel_id', suggestions_channel.id)
-                    message_link = f"https://discord.com/channels/{guild.id}/{channel_id}/{msg_id}"
-                    channel_text += f"{i}. **{data['votes']} 🌟** - [View Wish]({message_link})\n*{data['description'][:80]}{'...' if len(data['description']) > 80 else ''}*\n\n"
-                embed.add_field(name="💬 Top Channel Wishes", value=channel_text, inline=False)
-
-            # Top other wishes
-            if other_suggestions:
-                other_text = ""
-                for i, (msg_id, data) in enumerate(other_suggestions[:5], 1):
-                    # Get channel_id, default to suggestions channel if not present
-                    channel_id = data.get('channel_id', suggestions_channel.id)
-                    message_link = f"https://discord.com/channels/{guild.id}/{channel_id}/{msg_id}"
-                    other_text += f"{i}. **{data['votes']} 🌟** - [View Wish]({message_link})\n*{data['description'][:80]}{'...' if len(data['description']) > 80 else ''}*\n\n"
-                embed.add_field(name="✨ Top Other Wishes", value=other_text, inline=False)
-
-            if video_suggestions or channel_suggestions or other_suggestions:
-                await suggestions_channel.send(embed=embed)
+        if video_suggestions or channel_suggestions or other_suggestions:
+            summary_message = await suggestions_channel.send(embed=embed)
+            await self._record_summary(guild, summary_message, slot)
 
     @weekly_summary.before_loop
     async def before_weekly_summary(self):
         """Wait for the bot to be ready before starting the weekly summary"""
         await self.bot.wait_until_ready()
 
-        # Calculate next Monday at midnight
-        now = datetime.utcnow()
-        days_ahead = 0 - now.weekday()  # Monday is 0
-        if days_ahead <= 0:  # Target day already happened this week
-            days_ahead += 7
-
-        next_monday = now + timedelta(days=days_ahead)
-        next_monday = next_monday.replace(hour=0, minute=0, second=0, microsecond=0)
-
-        # Wait until next Monday
-        wait_seconds = (next_monday - now).total_seconds()
-        await asyncio.sleep(wait_seconds)
-
 
 async def setup(bot):
     await bot.add_cog(Suggestions(bot))
\ No newline at end of file
@@ -9,6 +9,8 @@ import logging
 from datetime import datetime
 from utils import has_mod_role, zalgo_text, zalgo_embed
 from tasks.whispers import select_weighted_whisper
+from events.message_events import USAGE_POOL_NAMES
+from database import adb
 from config import DREAMER_ROLE, MOD_ROLES
 
 logger = logging.getLogger(__name__)
@@ -36,7 +38,7 @@ class Utilities(commands.Cog):
     async def whisper(self, ctx):
         """Summon an eldritch whisper (uses weighted selection)"""
         # Use weighted selection (same algorithm as periodic whispers)
-        message = select_weighted_whisper()
+        message = await select_weighted_whisper()
         intensity = random.choice(['high', 'extreme'])
         zalgo_message = zalgo_text(message, intensity)
         await ctx.send(f"*{zalgo_message}*")
@@ -66,6 +68,33 @@ class Utilities(commands.Cog):
         confirmation = zalgo_text("Your words echo through the void, o bearer mine...", intensity='low')
         await ctx.message.add_reaction('✅')
 
+    @commands.command()
+    @has_mod_role()
+    async def migrateusage(self, ctx):
+        """
+        Copy the per-pool response usage tables into the unified response_usage table.
+
+        Run once before switching USAGE_STORAGE to 'unified'. Safe to re-run.
+        """
+        status_msg = await ctx.send(f"🔮 Migrating usage data for {len(USAGE_POOL_NAMES)} pools...")
+
+        results = await adb.migrate_usage_to_unified(USAGE_POOL_NAMES)
+        if not results:
+            await status_msg.edit(content="❌ Supabase is not configured - nothing to migrate.")
+            return
+
+        failed = [pool_name for pool_name, count in results.items() if count is None]
+        copied = sum(count for count in results.values() if count)
+
+        embed = discord.Embed(
+            title="✅ Usage Migration Complete" if not failed else "⚠️ Usage Migration Incomplete",
+            description=f"Copied **{copied}** rows from **{len(results) - len(failed)}** pools into `response_usage`.",
+            color=discord.Color.green() if not failed else discord.Color.orange()
+        )
+        if failed:
+            embed.add_field(name="Failed Pools", value=', '.join(failed), inline=False)
+        await status_msg.edit(content=None, embed=embed)
+
     @commands.command()
     async def ping(self, ctx):
         """Check bot latency"""
@@ -290,7 +319,8 @@ class Utilities(commands.Cog):
             embed.add_field(name="⚔️ Enforcement Powers", value=mod_commands, inline=False)
 
             admin_commands = """
-            `!setup_roles` - Manifest the role selection chamber
+            `!setup_roles [rebuild]` - Manifest the role selection chamber (mends only what is missing unless rebuilt)
+            `!setup_role_picker [#channel]` - Manifest the select-menu role picker
             `!give_supporter @user` - Grant supporter blessing
             """
             embed.add_field(name="👑 Administrative Rites", value=admin_commands, inline=False)
@@ -306,6 +336,7 @@ class Utilities(commands.Cog):
             `!removewish <message_id>` - Unmake a wish from the pattern
             `!weeklysummary` - Post weekly summary (testing)
             `!migratewishes` - Update existing wishes (run once after upgrade)
+            `!migratewishstorage` - Copy wishes into normalized storage (run once)
             """
             embed.add_field(name="✨ Wish Manifestation", value=suggestion_commands, inline=False)
 
@@ -313,6 +344,7 @@ class Utilities(commands.Cog):
             `!whisper` - Summon an eldritch whisper
             `!speak <message>` - Manifest zalgo whispers to #general-chat
             `!harvest [channel] [limit]` - Harvest conversation data for analysis
+            `!migrateusage` - Copy usage tables into unified storage (run once)
             `!ping` - Test the void's echo
             `!help` - Reveal this codex
             """
@@ -16,4 +16,15 @@ ELDRITCH_WHISPER_RANDOM_DELAY = 1800  # 30 minutes max delay
 AUTO_TIMEOUT_WARNINGS = 3
 AUTO_TIMEOUT_DURATION_HOURS = 24
 
-PURGE_MAX_MESSAGES = 100
\ No newline at end of file
+PURGE_MAX_MESSAGES = 100
+
+USAGE_FLUSH_SECONDS = 30  # How often buffered response usage counters are written out
+JOURNAL_COMPACT_MINUTES = 15  # How often JSON fallback journals are folded into snapshots
+
+ROLE_COALESCE_SECONDS = 1.0  # Window in which a member's role changes are merged into one edit
+
+WISH_WRITE_DEBOUNCE_SECONDS = 2.0  # Quiet period after a wish's last vote before its row is written
+WISH_WRITE_MAX_DELAY_SECONDS = 10.0  # Longest a changed wish waits for its write during a vote burst
+
+GUILD_JOB_CONCURRENCY = 4  # Guilds processed at once by startup sync and the weekly summary
+GUILD_JOB_TIMEOUT_SECONDS = 120  # Per-guild limit before a multi-guild job gives up on that guild
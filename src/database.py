@@ -1,13 +1,139 @@
 import os
 import json
+import atexit
+import asyncio
+import functools
 import logging
+import threading
+import time
+from concurrent.futures import ThreadPoolExecutor
+from datetime import datetime, timezone
 from supabase import create_client, Client
+from sqlite_store import SQLiteStore
+from json_journal import JsonJournal
+from repositories import KeyedRepository
 
 # Set up logging
 logger = logging.getLogger(__name__)
 
+# Usage pools that predate the generic response_<pool>_usage layout
+# pool_name: (table, json_file, id_column, text_column)
+LEGACY_USAGE_TABLES = {
+    'whisper': ('whisper_usage', 'whisper_usage.json', 'whisper_id', 'whisper_text'),
+    '8ball': ('response_8ball_usage', '8ball_usage.json', 'response_id', 'response_text'),
+    'vague': ('response_vague_usage', 'vague_usage.json', 'statement_id', 'statement_text'),
+}
+
+# Usage storage layouts (USAGE_STORAGE env var):
+#   per_pool - one response_<pool>_usage table per pool (original layout)
+#   unified  - a single response_usage table keyed by (pool, response_id)
+USAGE_STORAGE_MODES = ('per_pool', 'unified')
+UNIFIED_USAGE_TABLE = 'response_usage'
+USAGE_PAGE_SIZE = 1000  # PostgREST's default max rows per response
+
+# Suggestion storage layouts (SUGGESTIONS_STORAGE env var):
+#   jsonb      - suggestions table, each wish an opaque JSONB blob (original layout)
+#   normalized - wishes table with one indexed column per field
+SUGGESTIONS_STORAGE_MODES = ('jsonb', 'normalized')
+NORMALIZED_SUGGESTIONS_TABLE = 'wishes'
+# Wish fields stored as wishes columns; (column, default when missing)
+WISH_COLUMNS = (
+    ('guild_id', None),
+    ('channel_id', None),
+    ('type', None),
+    ('status', 'active'),
+    ('votes', 0),
+    ('author_id', None),
+    ('description', ''),
+    ('created_at', None),
+    ('granted_at', None),
+    ('granted_by', None),
+    ('granted_notes', None),
+)
+
+# Bulk writes: rows per Supabase upsert request, and attempts per chunk
+UPSERT_CHUNK_SIZE = int(os.getenv('UPSERT_CHUNK_SIZE', '500'))
+UPSERT_MAX_ATTEMPTS = 3
+UPSERT_RETRY_DELAY = 0.5  # Seconds, multiplied by the attempt number
+
+# Storage backends (DATABASE_BACKEND env var):
+#   supabase - Supabase when credentials are set, JSON files otherwise
+#   sqlite   - local SQLite database at SQLITE_PATH (WAL mode)
+DATABASE_BACKENDS = ('supabase', 'sqlite')
+DEFAULT_SQLITE_PATH = 'dreambot.db'
+
+# Threads available to AsyncBotDatabase for blocking Supabase/JSON calls
+DB_EXECUTOR_WORKERS = int(os.getenv('DB_EXECUTOR_WORKERS', '4'))
+
+def wish_to_row(data):
+    """Spread a wish dict over the wishes table's columns"""
+    return {column: data.get(column, default) for column, default in WISH_COLUMNS}
+
+
+def wish_from_row(row):
+    """Rebuild a wish dict from a wishes row, leaving out unset optional fields"""
+    return {
+        column: row[column] for column, default in WISH_COLUMNS
+        if row.get(column) is not None or default is not None
+    }
+
+
 class BotDatabase:
     def __init__(self):
+        # Write-behind usage cache: pool_name -> {response_id: stats}
+        self._usage_cache = {}
+        # Increments not yet persisted: pool_name -> {response_id: count}
+        self._usage_pending = {}
+        self._usage_lock = threading.RLock()
+        self._flush_lock = threading.Lock()
+
+        # JSON storage (fallback) goes through an append-only journal
+        self.journal = JsonJournal()
+
+        # Supabase saves only send rows that changed since the last load/save
+        self.repositories = {
+            'reaction_roles': KeyedRepository('reaction_roles', ('message_id',), 'data'),
+            'warnings': KeyedRepository('warnings', ('guild_id', 'user_id'), 'warnings'),
+            'suggestions': KeyedRepository('suggestions', ('message_id',), 'data'),
+            'prebans': KeyedRepository('prebans', ('guild_id', 'user_id'), 'data'),
+            'wishes': KeyedRepository(
+                NORMALIZED_SUGGESTIONS_TABLE, ('message_id',), None,
+                encode=wish_to_row, decode=wish_from_row
+            ),
+        }
+        # Held across each repository's diff, write and mark: the async facade
+        # calls in from several threads, and a single-row write landing in the
+        # middle of a full save would be diffed away as a delete
+        self._repository_locks = {name: threading.RLock() for name in self.repositories}
+
+        self.suggestions_storage = os.getenv('SUGGESTIONS_STORAGE', 'jsonb')
+        if self.suggestions_storage not in SUGGESTIONS_STORAGE_MODES:
+            logger.warning(f"[Database] Unknown SUGGESTIONS_STORAGE '{self.suggestions_storage}', using 'jsonb'")
+            self.suggestions_storage = 'jsonb'
+
+        self.usage_storage = os.getenv('USAGE_STORAGE', 'per_pool')
+        if self.usage_storage not in USAGE_STORAGE_MODES:
+            logger.warning(f"[Database] Unknown USAGE_STORAGE '{self.usage_storage}', using 'per_pool'")
+            self.usage_storage = 'per_pool'
+
+        self.sqlite = None
+        self.backend = os.getenv('DATABASE_BACKEND', 'supabase')
+        if self.backend not in DATABASE_BACKENDS:
+            logger.warning(f"[Database] Unknown DATABASE_BACKEND '{self.backend}', using 'supabase'")
+            self.backend = 'supabase'
+
+        if self.backend == 'sqlite':
+            path = os.getenv('SQLITE_PATH', DEFAULT_SQLITE_PATH)
+            try:
+                self.sqlite = SQLiteStore(path)
+                self.supabase = None
+                self.use_json = False
+                logger.info(f"[Database] Initialized with SQLite at '{path}'")
+                return
+            except Exception as e:
+                logger.error(f"[Database] Failed to open SQLite at '{path}': {type(e).__name__}: {e}")
+                logger.warning("[Database] Falling back to default storage")
+
         url = os.getenv('SUPABASE_URL')
         key = os.getenv('SUPABASE_KEY')
 
@@ -31,488 +157,983 @@ class BotDatabase:
         """Tables must be created via Supabase dashboard first"""
         # We'll provide SQL commands for this
         pass
+
+    def _bulk_upsert(self, table_name, rows, label, on_conflict=''):
+        """
+        Upsert rows as array requests of UPSERT_CHUNK_SIZE rows each.
+
+        Each chunk is retried up to UPSERT_MAX_ATTEMPTS times. If a chunk still
+        fails the exception is re-raised so the caller can fall back to JSON.
+
+        Returns:
+            int: Number of requests sent
+        """
+        total_chunks = (len(rows) + UPSERT_CHUNK_SIZE - 1) // UPSERT_CHUNK_SIZE
+        requests = 0
+
+        for index in range(total_chunks):
+            chunk = rows[index * UPSERT_CHUNK_SIZE:(index + 1) * UPSERT_CHUNK_SIZE]
+            for attempt in range(1, UPSERT_MAX_ATTEMPTS + 1):
+                requests += 1
+                try:
+                    response = self.supabase.table(table_name).upsert(chunk, on_conflict=on_conflict).execute()
+                    if response.data is not None and len(response.data) < len(chunk):
+                        logger.warning(f"[Database] {label}: Chunk {index + 1}/{total_chunks} returned {len(response.data)} of {len(chunk)} rows - some may have failed silently")
+                    break
+                except Exception as e:
+                    if attempt == UPSERT_MAX_ATTEMPTS:
+                        logger.error(f"[Database] {label}: Chunk {index + 1}/{total_chunks} ({len(chunk)} rows) failed after {attempt} attempts: {type(e).__name__}: {e}")
+                        raise
+                    logger.warning(f"[Database] {label}: Chunk {index + 1}/{total_chunks} failed (attempt {attempt}/{UPSERT_MAX_ATTEMPTS}), retrying: {type(e).__name__}: {e}")
+                    time.sleep(UPSERT_RETRY_DELAY * attempt)
+
+        logger.debug(f"[Database] {label}: Upserted {len(rows)} rows in {requests} requests")
+        return requests
+
+    def _select_all(self, table_name):
+        """Page through every row of a table (PostgREST caps each response)"""
+        items = []
+        start = 0
+        while True:
+            page = self.supabase.table(table_name).select("*").range(start, start + USAGE_PAGE_SIZE - 1).execute().data
+            items.extend(page)
+            if len(page) < USAGE_PAGE_SIZE:
+                return items
+            start += USAGE_PAGE_SIZE
+
+    def _load_keyed(self, name, refresh=False):
+        """
+        Load a keyed table from Supabase and record it as the save baseline.
+
+        After the first load the table is served from memory unless refresh
+        is set; this process is the only writer once it is running.
+        """
+        repository = self.repositories[name]
+        with self._repository_locks[name]:
+            if repository.primed and not refresh:
+                return repository.snapshot()
+            data = repository.from_rows(self._select_all(repository.table))
+            repository.mark_persisted(data)
+            return data
+
+    def _save_keyed(self, name, data, label):
+        """
+        Write only the added/changed/removed keys of a keyed table to Supabase.
+
+        Upserts go first and deletes are by key, so readers never see the
+        table emptied. On failure the baseline is dropped and the next save
+        re-reads the table before diffing.
+
+        Returns:
+            tuple: (rows upserted, rows deleted)
+        """
+        repository = self.repositories[name]
+        with self._repository_locks[name]:
+            try:
+                if not repository.primed:
+                    self._load_keyed(name, refresh=True)
+                upserts, deletes = repository.changes(data)
+                if upserts:
+                    self._bulk_upsert(repository.table, upserts, label, on_conflict=repository.on_conflict)
+                self._bulk_delete(repository, deletes)
+            except Exception:
+                repository.invalidate()
+                raise
+            repository.mark_persisted(data)
+            return len(upserts), len(deletes)
+
+    def _bulk_delete(self, repository, keys):
+        """Delete rows by key, UPSERT_CHUNK_SIZE keys per request"""
+        *parent_columns, last_column = repository.key_columns
+        groups = {}
+        for key in keys:
+            groups.setdefault(key[:-1], []).append(key[-1])
+
+        for parents, values in groups.items():
+            for index in range(0, len(values), UPSERT_CHUNK_SIZE):
+                query = self.supabase.table(repository.table).delete()
+                for column, value in zip(parent_columns, parents):
+                    query = query.eq(column, value)
+                query.in_(last_column, values[index:index + UPSERT_CHUNK_SIZE]).execute()
     
-    def load_reaction_roles(self):
-        """Load reaction roles from Supabase or JSON"""
+    def load_reaction_roles(self, strict=False):
+        """
+        Load reaction roles from SQLite, Supabase or JSON.
+
+        Args:
+            strict (bool): Re-raise a failed read instead of returning an empty
+                dict, for callers that keep the result and must retry
+
+        Returns:
+            dict: message_id -> reaction-role menu data
+        """
+        if self.sqlite:
+            try:
+                data = self.sqlite.load_reaction_roles()
+                logger.info(f"[Database] load_reaction_roles: Success ({len(data)} items from SQLite)")
+                return data
+            except Exception as e:
+                logger.warning(f"[Database] load_reaction_roles: SQLite error, falling back to JSON: {type(e).__name__}: {e}")
+
         if not self.supabase:
             try:
-                with open('reaction_roles.json', 'r') as f:
-                    data = json.load(f)
-                    logger.info(f"[Database] load_reaction_roles: Success ({len(data)} items from JSON)")
-                    return data
+                data = self.journal.load('reaction_roles.json')
+                logger.info(f"[Database] load_reaction_roles: Success ({len(data)} items from JSON)")
+                return data
             except FileNotFoundError:
                 logger.info("[Database] load_reaction_roles: No JSON file found, returning empty dict")
                 return {}
             except Exception as e:
                 logger.error(f"[Database] load_reaction_roles: JSON read failed: {type(e).__name__}: {e}")
+                if strict:
+                    raise
                 return {}
 
         try:
-            response = self.supabase.table('reaction_roles').select("*").execute()
-            data = {item['message_id']: item['data'] for item in response.data}
-            logger.info(f"[Database] load_reaction_roles: Success ({len(data)} items from Supabase)")
+            source = 'cache' if self.repositories['reaction_roles'].primed else 'Supabase'
+            data = self._load_keyed('reaction_roles')
+            logger.info(f"[Database] load_reaction_roles: Success ({len(data)} items from {source})")
             return data
         except Exception as e:
             logger.error(f"[Database] load_reaction_roles: Supabase query failed: {type(e).__name__}: {e}")
+            if strict:
+                raise
             return {}
     
     def save_reaction_roles(self, data):
-        """Save reaction roles to Supabase or JSON"""
+        """Save reaction roles to SQLite, Supabase or JSON"""
+        if self.sqlite:
+            try:
+                written, deleted = self.sqlite.save_reaction_roles(data)
+                logger.info(f"[Database] save_reaction_roles: Success ({len(data)} items to SQLite, {written} written, {deleted} deleted)")
+                return
+            except Exception as e:
+                logger.warning(f"[Database] save_reaction_roles: SQLite error, falling back to JSON: {type(e).__name__}: {e}")
+
         if not self.supabase:
             try:
-                with open('reaction_roles.json', 'w') as f:
-                    json.dump(data, f)
+                self.journal.save('reaction_roles.json', data)
                 logger.info(f"[Database] save_reaction_roles: Success ({len(data)} items to JSON)")
             except Exception as e:
                 logger.error(f"[Database] save_reaction_roles: JSON write failed: {type(e).__name__}: {e}")
             return
 
         try:
-            # Clear existing
-            self.supabase.table('reaction_roles').delete().neq('message_id', '0').execute()
-
-            # Insert new data
-            for message_id, msg_data in data.items():
-                self.supabase.table('reaction_roles').upsert({
-                    'message_id': message_id,
-                    'data': msg_data
-                }).execute()
-            logger.info(f"[Database] save_reaction_roles: Success ({len(data)} items to Supabase)")
+            upserted, deleted = self._save_keyed('reaction_roles', data, 'save_reaction_roles')
+            logger.info(f"[Database] save_reaction_roles: Success ({len(data)} items to Supabase, {upserted} upserted, {deleted} deleted)")
         except Exception as e:
             logger.warning(f"[Database] save_reaction_roles: Supabase error, falling back to JSON: {type(e).__name__}: {e}")
             try:
-                with open('reaction_roles.json', 'w') as f:
-                    json.dump(data, f)
+                self.journal.save('reaction_roles.json', data)
                 logger.info(f"[Database] save_reaction_roles: JSON fallback successful ({len(data)} items)")
             except Exception as json_e:
                 logger.error(f"[Database] save_reaction_roles: JSON fallback failed: {type(json_e).__name__}: {json_e}")
     
-    def load_warnings(self):
-        """Load warnings from Supabase or JSON"""
+    def load_warnings(self, strict=False):
+        """
+        Load warnings from SQLite, Supabase or JSON.
+
+        Args:
+            strict (bool): Re-raise a failed read instead of returning an empty dict
+        """
+        if self.sqlite:
+            try:
+                data = self.sqlite.load_warnings()
+                count = sum(len(users) for users in data.values())
+                logger.info(f"[Database] load_warnings: Success ({count} users from SQLite)")
+                return data
+            except Exception as e:
+                logger.warning(f"[Database] load_warnings: SQLite error, falling back to JSON: {type(e).__name__}: {e}")
+
         if not self.supabase:
             try:
-                with open('warnings.json', 'r') as f:
-                    data = json.load(f)
-                    # Count total warnings across all guilds/users
-                    count = sum(len(users) for users in data.values())
-                    logger.info(f"[Database] load_warnings: Success ({count} users from JSON)")
-                    return data
+                data = self.journal.load('warnings.json')
+                # Count total warnings across all guilds/users
+                count = sum(len(users) for users in data.values())
+                logger.info(f"[Database] load_warnings: Success ({count} users from JSON)")
+                return data
             except FileNotFoundError:
                 logger.info("[Database] load_warnings: No JSON file found, returning empty dict")
                 return {}
             except Exception as e:
                 logger.error(f"[Database] load_warnings: JSON read failed: {type(e).__name__}: {e}")
+                if strict:
+                    raise
                 return {}
 
         try:
-            response = self.supabase.table('warnings').select("*").execute()
-            warnings_dict = {}
-            for item in response.data:
-                guild_id = item['guild_id']
-                user_id = item['user_id']
-                if guild_id not in warnings_dict:
-                    warnings_dict[guild_id] = {}
-                warnings_dict[guild_id][user_id] = item['warnings']
+            source = 'cache' if self.repositories['warnings'].primed else 'Supabase'
+            warnings_dict = self._load_keyed('warnings')
             count = sum(len(users) for users in warnings_dict.values())
-            logger.info(f"[Database] load_warnings: Success ({count} users from Supabase)")
+            logger.info(f"[Database] load_warnings: Success ({count} users from {source})")
             return warnings_dict
         except Exception as e:
             logger.error(f"[Database] load_warnings: Supabase query failed: {type(e).__name__}: {e}")
+            if strict:
+                raise
             return {}
     
     def save_warnings(self, data):
-        """Save warnings to Supabase or JSON"""
+        """Save warnings to SQLite, Supabase or JSON"""
         count = sum(len(users) for users in data.values())
 
+        if self.sqlite:
+            try:
+                written, deleted = self.sqlite.save_warnings(data)
+                logger.info(f"[Database] save_warnings: Success ({count} users to SQLite, {written} written, {deleted} deleted)")
+                return
+            except Exception as e:
+                logger.warning(f"[Database] save_warnings: SQLite error, falling back to JSON: {type(e).__name__}: {e}")
+
         if not self.supabase:
             try:
-                with open('warnings.json', 'w') as f:
-                    json.dump(data, f)
+                self.journal.save('warnings.json', data, depth=2)
                 logger.info(f"[Database] save_warnings: Success ({count} users to JSON)")
             except Exception as e:
                 logger.error(f"[Database] save_warnings: JSON write failed: {type(e).__name__}: {e}")
             return
 
         try:
-            # Clear existing
-            self.supabase.table('warnings').delete().neq('guild_id', '0').execute()
-
-            # Insert new data
-            for guild_id, guild_warnings in data.items():
-                for user_id, user_warnings in guild_warnings.items():
-                    self.supabase.table('warnings').upsert({
-                        'guild_id': guild_id,
-                        'user_id': user_id,
-                        'warnings': user_warnings
-                    }).execute()
-            logger.info(f"[Database] save_warnings: Success ({count} users to Supabase)")
+            upserted, deleted = self._save_keyed('warnings', data, 'save_warnings')
+            logger.info(f"[Database] save_warnings: Success ({count} users to Supabase, {upserted} upserted, {deleted} deleted)")
         except Exception as e:
             logger.warning(f"[Database] save_warnings: Supabase error, falling back to JSON: {type(e).__name__}: {e}")
             try:
-                with open('warnings.json', 'w') as f:
-                    json.dump(data, f)
+                self.journal.save('warnings.json', data, depth=2)
                 logger.info(f"[Database] save_warnings: JSON fallback successful ({count} users)")
             except Exception as json_e:
                 logger.error(f"[Database] save_warnings: JSON fallback failed: {type(json_e).__name__}: {json_e}")
 
-    def load_suggestions(self):
-        """Load suggestions from Supabase or JSON"""
+    def load_suggestions(self, strict=False):
+        """
+        Load suggestions from SQLite, Supabase or JSON.
+
+        Args:
+            strict (bool): Re-raise a failed read instead of returning an empty
+                dict, for callers that keep the result and must retry
+
+        Returns:
+            dict: message_id -> wish data
+        """
+        if self.sqlite:
+            try:
+                data = self.sqlite.load_suggestions()
+                logger.info(f"[Database] load_suggestions: Success ({len(data)} items from SQLite)")
+                return data
+            except Exception as e:
+                logger.warning(f"[Database] load_suggestions: SQLite error, falling back to JSON: {type(e).__name__}: {e}")
+
         if not self.supabase:
             try:
-                with open('suggestions.json', 'r') as f:
-                    data = json.load(f)
-                    logger.info(f"[Database] load_suggestions: Success ({len(data)} items from JSON)")
-                    return data
+                data = self.journal.load('suggestions.json')
+                logger.info(f"[Database] load_suggestions: Success ({len(data)} items from JSON)")
+                return data
             except FileNotFoundError:
                 logger.info("[Database] load_suggestions: No JSON file found, returning empty dict")
                 return {}
             except Exception as e:
                 logger.error(f"[Database] load_suggestions: JSON read failed: {type(e).__name__}: {e}")
+                if strict:
+                    raise
                 return {}
 
         try:
-            response = self.supabase.table('suggestions').select("*").execute()
-            data = {item['message_id']: item['data'] for item in response.data}
-            logger.info(f"[Database] load_suggestions: Success ({len(data)} items from Supabase)")
+            name = self._suggestions_repository
+            source = 'cache' if self.repositories[name].primed else 'Supabase'
+            data = self._load_keyed(name)
+            logger.info(f"[Database] load_suggestions: Success ({len(data)} items from {source})")
             return data
         except Exception as e:
             logger.error(f"[Database] load_suggestions: Supabase query failed: {type(e).__name__}: {e}")
+            if strict:
+                raise
             return {}
 
     def save_suggestions(self, data):
-        """Save suggestions to Supabase or JSON"""
+        """Save suggestions to SQLite, Supabase or JSON"""
+        if self.sqlite:
+            try:
+                written, deleted = self.sqlite.save_suggestions(data)
+                logger.info(f"[Database] save_suggestions: Success ({len(data)} items to SQLite, {written} written, {deleted} deleted)")
+                return
+            except Exception as e:
+                logger.warning(f"[Database] save_suggestions: SQLite error, falling back to JSON: {type(e).__name__}: {e}")
+
         if not self.supabase:
             try:
-                with open('suggestions.json', 'w') as f:
-                    json.dump(data, f)
+                self.journal.save('suggestions.json', data)
                 logger.info(f"[Database] save_suggestions: Success ({len(data)} items to JSON)")
             except Exception as e:
                 logger.error(f"[Database] save_suggestions: JSON write failed: {type(e).__name__}: {e}")
             return
 
         try:
-            # Clear existing
-            self.supabase.table('suggestions').delete().neq('message_id', '0').execute()
-
-            # Insert new data
-            for message_id, suggestion_data in data.items():
-                self.supabase.table('suggestions').upsert({
-                    'message_id': message_id,
-                    'data': suggestion_data
-                }).execute()
-            logger.info(f"[Database] save_suggestions: Success ({len(data)} items to Supabase)")
+            upserted, deleted = self._save_keyed(self._suggestions_repository, data, 'save_suggestions')
+            logger.info(f"[Database] save_suggestions: Success ({len(data)} items to Supabase, {upserted} upserted, {deleted} deleted)")
         except Exception as e:
             logger.warning(f"[Database] save_suggestions: Supabase error, falling back to JSON: {type(e).__name__}: {e}")
             try:
-                with open('suggestions.json', 'w') as f:
-                    json.dump(data, f)
+                self.journal.save('suggestions.json', data)
                 logger.info(f"[Database] save_suggestions: JSON fallback successful ({len(data)} items)")
             except Exception as json_e:
                 logger.error(f"[Database] save_suggestions: JSON fallback failed: {type(json_e).__name__}: {json_e}")
 
-    def load_whisper_usage(self):
-        """Load whisper usage statistics from Supabase or JSON"""
+    def save_suggestion(self, message_id, data):
+        """Write a single wish to SQLite, Supabase or JSON (one row, no full-table diff)"""
+        if self.sqlite:
+            try:
+                self.sqlite.save_suggestion(message_id, data)
+                logger.debug(f"[Database] save_suggestion: Success ({message_id} to SQLite)")
+                return
+            except Exception as e:
+                logger.warning(f"[Database] save_suggestion: SQLite error, falling back to JSON: {type(e).__name__}: {e}")
+
         if not self.supabase:
             try:
-                with open('whisper_usage.json', 'r') as f:
-                    data = json.load(f)
-                    logger.info(f"[Database] load_whisper_usage: Success ({len(data)} whispers from JSON)")
-                    return data
-            except FileNotFoundError:
-                logger.info("[Database] load_whisper_usage: No JSON file found, returning empty dict")
-                return {}
+                self.journal.set_items('suggestions.json', {message_id: data})
+                logger.debug(f"[Database] save_suggestion: Success ({message_id} to JSON)")
             except Exception as e:
-                logger.error(f"[Database] load_whisper_usage: JSON read failed: {type(e).__name__}: {e}")
-                return {}
+                logger.error(f"[Database] save_suggestion: JSON write failed: {type(e).__name__}: {e}")
+            return
 
-        try:
-            response = self.supabase.table('whisper_usage').select("*").execute()
-            # Return dict keyed by whisper_id
-            data = {item['whisper_id']: {
-                'text': item['whisper_text'],
-                'usage_count': item['usage_count'],
-                'last_used': item['last_used']
-            } for item in response.data}
-            logger.info(f"[Database] load_whisper_usage: Success ({len(data)} whispers from Supabase)")
-            return data
-        except Exception as e:
-            logger.error(f"[Database] load_whisper_usage: Supabase query failed: {type(e).__name__}: {e}")
-            return {}
+        name = self._suggestions_repository
+        repository = self.repositories[name]
+        with self._repository_locks[name]:
+            try:
+                self._bulk_upsert(repository.table, [repository.to_row((message_id,), data)], 'save_suggestion', on_conflict=repository.on_conflict)
+                repository.mark_row_persisted((message_id,), data)
+                logger.debug(f"[Database] save_suggestion: Success ({message_id} to Supabase)")
+            except Exception as e:
+                repository.invalidate()
+                logger.warning(f"[Database] save_suggestion: Supabase error, falling back to JSON: {type(e).__name__}: {e}")
+                try:
+                    self.journal.set_items('suggestions.json', {message_id: data})
+                except Exception as json_e:
+                    logger.error(f"[Database] save_suggestion: JSON fallback failed: {type(json_e).__name__}: {json_e}")
+
+    def delete_suggestion(self, message_id):
+        """Delete a single wish from SQLite, Supabase or JSON"""
+        if self.sqlite:
+            try:
+                self.sqlite.delete_suggestion(message_id)
+                logger.debug(f"[Database] delete_suggestion: Success ({message_id} from SQLite)")
+                return
+            except Exception as e:
+                logger.warning(f"[Database] delete_suggestion: SQLite error, falling back to JSON: {type(e).__name__}: {e}")
 
-    def save_whisper_usage(self, data):
-        """Save whisper usage statistics to Supabase or JSON"""
         if not self.supabase:
             try:
-                with open('whisper_usage.json', 'w') as f:
-                    json.dump(data, f, indent=2)
-                logger.info(f"[Database] save_whisper_usage: Success ({len(data)} whispers to JSON)")
+                self.journal.delete_items('suggestions.json', [message_id])
+                logger.debug(f"[Database] delete_suggestion: Success ({message_id} from JSON)")
             except Exception as e:
-                logger.error(f"[Database] save_whisper_usage: JSON write failed: {type(e).__name__}: {e}")
+                logger.error(f"[Database] delete_suggestion: JSON write failed: {type(e).__name__}: {e}")
             return
 
-        try:
-            # Clear existing
-            self.supabase.table('whisper_usage').delete().neq('whisper_id', '').execute()
-
-            # Insert new data
-            for whisper_id, stats in data.items():
-                self.supabase.table('whisper_usage').upsert({
-                    'whisper_id': whisper_id,
-                    'whisper_text': stats['text'],
-                    'usage_count': stats['usage_count'],
-                    'last_used': stats['last_used']
-                }).execute()
-            logger.info(f"[Database] save_whisper_usage: Success ({len(data)} whispers to Supabase)")
-        except Exception as e:
-            logger.warning(f"[Database] save_whisper_usage: Supabase error, falling back to JSON: {type(e).__name__}: {e}")
+        name = self._suggestions_repository
+        repository = self.repositories[name]
+        with self._repository_locks[name]:
             try:
-                with open('whisper_usage.json', 'w') as f:
-                    json.dump(data, f, indent=2)
-                logger.info(f"[Database] save_whisper_usage: JSON fallback successful ({len(data)} whispers)")
-            except Exception as json_e:
-                logger.error(f"[Database] save_whisper_usage: JSON fallback failed: {type(json_e).__name__}: {json_e}")
+                self._bulk_delete(repository, [(message_id,)])
+                repository.mark_row_deleted((message_id,))
+                logger.debug(f"[Database] delete_suggestion: Success ({message_id} from Supabase)")
+            except Exception as e:
+                repository.invalidate()
+                logger.error(f"[Database] delete_suggestion: Supabase error: {type(e).__name__}: {e}")
 
-    def increment_whisper_usage(self, whisper_id, whisper_text):
-        """Increment usage count for a whisper (ID-based)"""
-        from datetime import datetime, timezone
+    @property
+    def _suggestions_repository(self):
+        return 'wishes' if self.suggestions_storage == 'normalized' else 'suggestions'
 
-        try:
-            usage_data = self.load_whisper_usage()
+    @property
+    def suggestions_queryable(self):
+        """Whether query_suggestions runs server-side against indexed columns"""
+        return bool(self.supabase) and self.suggestions_storage == 'normalized'
 
-            if whisper_id not in usage_data:
-                usage_data[whisper_id] = {'text': whisper_text, 'usage_count': 0, 'last_used': None}
-                logger.debug(f"[Database] increment_whisper_usage: New whisper '{whisper_id}'")
+    def query_suggestions(self, guild_id, wish_type=None, status='active', limit=10):
+        """
+        A guild's top wishes: active ones by votes, granted ones newest first.
 
-            # Update both usage AND text (in case text was edited in constants.py)
-            usage_data[whisper_id]['text'] = whisper_text
-            usage_data[whisper_id]['usage_count'] += 1
-            usage_data[whisper_id]['last_used'] = datetime.now(timezone.utc).isoformat()
-            new_count = usage_data[whisper_id]['usage_count']
+        With SUGGESTIONS_STORAGE=normalized on Supabase this is a single
+        indexed query (WHERE guild_id AND type AND status ORDER BY ... LIMIT);
+        other storage filters and sorts the loaded suggestions instead.
 
-            self.save_whisper_usage(usage_data)
-            logger.debug(f"[Database] increment_whisper_usage: '{whisper_id}' now at {new_count} uses")
-            return new_count
+        Args:
+            guild_id (int): Guild to query
+            wish_type (str): 'video', 'channel' or 'other'; None for every type
+            status (str): 'active' (ordered by votes) or 'granted' (ordered by granted_at)
+            limit (int): Maximum wishes to return
+
+        Returns:
+            list: (message_id, wish dict) pairs in order
+        """
+        order_column = 'votes' if status == 'active' else 'granted_at'
+
+        if self.suggestions_queryable:
+            try:
+                query = self.supabase.table(NORMALIZED_SUGGESTIONS_TABLE).select("*").eq('guild_id', guild_id).eq('status', status)
+                if wish_type:
+                    query = query.eq('type', wish_type)
+                rows = query.order(order_column, desc=True).limit(limit).execute().data
+                logger.debug(f"[Database] query_suggestions: {len(rows)} rows from Supabase")
+                return [(row['message_id'], wish_from_row(row)) for row in rows]
+            except Exception as e:
+                logger.warning(f"[Database] query_suggestions: Supabase query failed, filtering loaded suggestions: {type(e).__name__}: {e}")
+
+        matches = [
+            (message_id, data) for message_id, data in self.load_suggestions().items()
+            if data['guild_id'] == guild_id
+            and data.get('status', 'active') == status
+            and (wish_type is None or data['type'] == wish_type)
+        ]
+        if status == 'active':
+            matches.sort(key=lambda item: item[1].get('votes', 0), reverse=True)
+        else:
+            matches.sort(key=lambda item: item[1].get('granted_at') or '', reverse=True)
+        return matches[:limit]
+
+    def migrate_suggestions_to_normalized(self):
+        """
+        Copy the JSONB suggestions table into the normalized wishes table.
+
+        Safe to re-run: rows are upserted on message_id.
+
+        Returns:
+            int: Rows copied, or None if Supabase isn't configured or the copy failed
+        """
+        label = "migrate_suggestions_to_normalized"
+        if not self.supabase:
+            logger.warning(f"[Database] {label}: Supabase not configured, nothing to migrate")
+            return None
+
+        try:
+            rows = [
+                {'message_id': item['message_id'], **wish_to_row(item['data'])}
+                for item in self._select_all('suggestions')
+            ]
+            self._bulk_upsert(NORMALIZED_SUGGESTIONS_TABLE, rows, label, on_conflict='message_id')
         except Exception as e:
-            logger.error(f"[Database] increment_whisper_usage: Failed for '{whisper_id}': {type(e).__name__}: {e}")
-            return 1  # Return 1 as fallback to indicate it was used once
+            logger.error(f"[Database] {label}: Failed: {type(e).__name__}: {e}")
+            return None
+        # The wishes table changed underneath any cached baseline
+        with self._repository_locks['wishes']:
+            self.repositories['wishes'].invalidate()
+        logger.info(f"[Database] {label}: Copied {len(rows)} rows into '{NORMALIZED_SUGGESTIONS_TABLE}'")
+        return len(rows)
+
+    # =========================================================================
+    # RESPONSE USAGE TRACKING (write-behind cache)
+    # =========================================================================
+    #
+    # Usage counters are served from memory once a pool has been loaded.
+    # Increments only touch the in-process cache and are recorded as pending
+    # deltas; flush_usage() applies them atomically in one batch per pool. The
+    # flush is driven by tasks/usage_flush.py on an interval and by the bot's
+    # shutdown path.
+
+    def _usage_spec(self, pool_name):
+        """Return (table, json_file, id_column, text_column) for a usage pool"""
+        if pool_name in LEGACY_USAGE_TABLES:
+            return LEGACY_USAGE_TABLES[pool_name]
+        return (f'response_{pool_name}_usage', f'{pool_name}_usage.json', 'response_id', 'response_text')
+
+    def _usage_label(self, action, pool_name):
+        """Log label matching the public method name for this pool"""
+        if pool_name in LEGACY_USAGE_TABLES:
+            return f"{action}_{pool_name}_usage"
+        return f"{action}_pool_usage({pool_name})"
+
+    def _read_usage(self, pool_name):
+        """Read a usage pool straight from SQLite, Supabase or JSON (bypasses the cache)"""
+        table_name, json_file, id_column, text_column = self._usage_spec(pool_name)
+        label = self._usage_label('load', pool_name)
+
+        if self.sqlite:
+            try:
+                data = self.sqlite.load_usage(pool_name)
+                logger.info(f"[Database] {label}: Success ({len(data)} items from SQLite)")
+                return data
+            except Exception as e:
+                logger.error(f"[Database] {label}: SQLite query failed: {type(e).__name__}: {e}")
+                return None
 
-    def load_8ball_usage(self):
-        """Load 8-ball response usage statistics from Supabase or JSON"""
         if not self.supabase:
             try:
-                with open('8ball_usage.json', 'r') as f:
-                    data = json.load(f)
-                    logger.info(f"[Database] load_8ball_usage: Success ({len(data)} responses from JSON)")
-                    return data
+                data = self.journal.load(json_file)
+                logger.info(f"[Database] {label}: Success ({len(data)} items from JSON)")
+                return data
             except FileNotFoundError:
-                logger.info("[Database] load_8ball_usage: No JSON file found, returning empty dict")
+                logger.info(f"[Database] {label}: No JSON file found, returning empty dict")
                 return {}
             except Exception as e:
-                logger.error(f"[Database] load_8ball_usage: JSON read failed: {type(e).__name__}: {e}")
-                return {}
+                logger.error(f"[Database] {label}: JSON read failed: {type(e).__name__}: {e}")
+                return None
 
         try:
-            response = self.supabase.table('response_8ball_usage').select("*").execute()
-            # Return dict keyed by response_id
-            data = {item['response_id']: {
-                'text': item['response_text'],
+            if self.usage_storage == 'unified':
+                table_name, id_column, text_column = UNIFIED_USAGE_TABLE, 'response_id', 'response_text'
+                items = self._select_unified_usage(pool_name)
+            else:
+                items = self.supabase.table(table_name).select("*").execute().data
+            if not items:
+                logger.warning(f"[Database] {label}: Table '{table_name}' returned empty")
+            data = {item[id_column]: {
+                'text': item[text_column],
                 'usage_count': item['usage_count'],
                 'last_used': item['last_used']
-            } for item in response.data}
-            logger.info(f"[Database] load_8ball_usage: Success ({len(data)} responses from Supabase)")
+            } for item in items}
+            logger.info(f"[Database] {label}: Success ({len(data)} items from Supabase)")
             return data
         except Exception as e:
-            logger.error(f"[Database] load_8ball_usage: Supabase query failed: {type(e).__name__}: {e}")
+            logger.error(f"[Database] {label}: Supabase query failed: {type(e).__name__}: {e}")
+            return None
+
+    def _select_unified_usage(self, pool_name=None):
+        """Page through response_usage, optionally for a single pool"""
+        items = []
+        start = 0
+        while True:
+            query = self.supabase.table(UNIFIED_USAGE_TABLE).select("*")
+            if pool_name is not None:
+                query = query.eq('pool', pool_name)
+            page = query.range(start, start + USAGE_PAGE_SIZE - 1).execute().data
+            items.extend(page)
+            if len(page) < USAGE_PAGE_SIZE:
+                return items
+            start += USAGE_PAGE_SIZE
+
+    def _write_usage_json(self, pool_name, data, label):
+        """Journal a usage pool's changes to its JSON store. Returns True on success."""
+        _, json_file, _, _ = self._usage_spec(pool_name)
+        try:
+            self.journal.save(json_file, data)
+            return True
+        except Exception as e:
+            logger.error(f"[Database] {label}: JSON write failed: {type(e).__name__}: {e}")
+            return False
+
+    def load_usage(self, pool_name, strict=False):
+        """
+        Load usage data for a pool, serving it from memory after the first read.
+
+        The returned dict is the live cache entry and must not be mutated by
+        callers; use increment_usage() or save_usage() instead.
+
+        Args:
+            pool_name (str): Pool identifier (e.g., 'greeting', 'whisper', '8ball')
+            strict (bool): Raise RuntimeError on a failed read instead of
+                returning an empty dict
+
+        Returns:
+            dict: Usage data keyed by response_id
+        """
+        with self._usage_lock:
+            cached = self._usage_cache.get(pool_name)
+            if cached is not None:
+                return cached
+
+        # Read without the lock, so increments and other pools' loads don't
+        # wait on this pool's I/O
+        data = self._read_usage(pool_name)
+        if data is None:
+            # Don't cache read failures - the next call should retry
+            if strict:
+                raise RuntimeError(f"{self._usage_label('load', pool_name)}: read failed")
             return {}
+        with self._usage_lock:
+            # Another thread may have cached the pool meanwhile; keep its entry
+            return self._usage_cache.setdefault(pool_name, data)
 
-    def save_8ball_usage(self, data):
-        """Save 8-ball response usage statistics to Supabase or JSON"""
+    @property
+    def batched_usage_load(self):
+        """True when load_all_pool_usage() reads every pool with one query"""
+        return bool(self.sqlite) or (bool(self.supabase) and self.usage_storage == 'unified')
+
+    def load_all_pool_usage(self, pool_names, strict=False):
+        """
+        Load many usage pools into the cache in one go.
+
+        With SQLite, or USAGE_STORAGE=unified on Supabase, this is a single
+        query over response_usage; otherwise each pool is loaded individually.
+        Pools that are already cached keep their in-memory data.
+
+        Args:
+            pool_names (list): Pool identifiers to load
+            strict (bool): Raise if a pool can't be read at all (the batched
+                query failing falls back to per-pool reads first)
+
+        Returns:
+            dict: pool_name -> usage data keyed by response_id
+        """
+        if self.sqlite:
+            source = 'SQLite'
+            try:
+                stored = self.sqlite.load_all_usage()
+            except Exception as e:
+                logger.error(f"[Database] load_all_pool_usage: SQLite query failed: {type(e).__name__}: {e}")
+                return {pool_name: self.load_usage(pool_name, strict) for pool_name in pool_names}
+            grouped = {pool_name: {} for pool_name in pool_names}
+            grouped.update(stored)
+            total = sum(len(data) for data in stored.values())
+        elif self.supabase and self.usage_storage == 'unified':
+            source = 'Supabase'
+            try:
+                items = self._select_unified_usage()
+            except Exception as e:
+                logger.error(f"[Database] load_all_pool_usage: Supabase query failed: {type(e).__name__}: {e}")
+                return {pool_name: self.load_usage(pool_name, strict) for pool_name in pool_names}
+
+            grouped = {pool_name: {} for pool_name in pool_names}
+            for item in items:
+                grouped.setdefault(item['pool'], {})[item['response_id']] = {
+                    'text': item['response_text'],
+                    'usage_count': item['usage_count'],
+                    'last_used': item['last_used']
+                }
+            total = len(items)
+        else:
+            return {pool_name: self.load_usage(pool_name, strict) for pool_name in pool_names}
+
+        with self._usage_lock:
+            for pool_name, data in grouped.items():
+                self._usage_cache.setdefault(pool_name, data)
+            result = {pool_name: self._usage_cache[pool_name] for pool_name in grouped}
+
+        logger.info(f"[Database] load_all_pool_usage: Success ({total} items across {len(grouped)} pools from {source})")
+        return result
+
+    def migrate_usage_to_unified(self, pool_names):
+        """
+        Copy per-pool usage tables into the unified response_usage table.
+
+        Safe to re-run: rows are upserted on (pool, response_id), so the
+        per-pool counts overwrite whatever the unified table holds.
+
+        Args:
+            pool_names (list): Pool identifiers to migrate
+
+        Returns:
+            dict: pool_name -> rows copied, or None if that pool failed
+        """
         if not self.supabase:
+            logger.warning("[Database] migrate_usage_to_unified: Supabase not configured, nothing to migrate")
+            return {}
+
+        results = {}
+        for pool_name in pool_names:
+            table_name, _, id_column, text_column = self._usage_spec(pool_name)
+            label = f"migrate_usage_to_unified({pool_name})"
             try:
-                with open('8ball_usage.json', 'w') as f:
-                    json.dump(data, f, indent=2)
-                logger.info(f"[Database] save_8ball_usage: Success ({len(data)} responses to JSON)")
+                response = self.supabase.table(table_name).select("*").execute()
+                rows = [{
+                    'pool': pool_name,
+                    'response_id': item[id_column],
+                    'response_text': item[text_column],
+                    'usage_count': item['usage_count'],
+                    'last_used': item['last_used']
+                } for item in response.data]
+                self._bulk_upsert(UNIFIED_USAGE_TABLE, rows, label, on_conflict='pool,response_id')
+                results[pool_name] = len(rows)
+                logger.info(f"[Database] {label}: Copied {len(rows)} rows from '{table_name}'")
             except Exception as e:
-                logger.error(f"[Database] save_8ball_usage: JSON write failed: {type(e).__name__}: {e}")
+                logger.error(f"[Database] {label}: Failed: {type(e).__name__}: {e}")
+                results[pool_name] = None
+        return results
+
+    def save_usage(self, pool_name, data):
+        """
+        Replace all usage data for a pool in storage and in the cache.
+
+        Args:
+            pool_name (str): Pool identifier
+            data (dict): Usage data to save
+        """
+        table_name, _, id_column, text_column = self._usage_spec(pool_name)
+        label = self._usage_label('save', pool_name)
+
+        with self._usage_lock:
+            self._usage_cache[pool_name] = data
+            self._usage_pending.pop(pool_name, None)
+
+        if self.sqlite:
+            try:
+                written, deleted = self.sqlite.save_usage(pool_name, data)
+                logger.info(f"[Database] {label}: Success ({len(data)} items to SQLite, {written} written, {deleted} deleted)")
+                return
+            except Exception as e:
+                logger.warning(f"[Database] {label}: SQLite error, falling back to JSON: {type(e).__name__}: {e}")
+
+        if not self.supabase:
+            if self._write_usage_json(pool_name, data, label):
+                logger.info(f"[Database] {label}: Success ({len(data)} items to JSON)")
             return
 
         try:
+            if self.usage_storage == 'unified':
+                table_name, id_column, text_column = UNIFIED_USAGE_TABLE, 'response_id', 'response_text'
+                delete_query = self.supabase.table(table_name).delete().eq('pool', pool_name)
+                on_conflict = 'pool,response_id'
+            else:
+                delete_query = self.supabase.table(table_name).delete().neq(id_column, '')
+                on_conflict = id_column
+
             # Clear existing
-            self.supabase.table('response_8ball_usage').delete().neq('response_id', '').execute()
+            delete_response = delete_query.execute()
+            logger.debug(f"[Database] {label}: Deleted {len(delete_response.data) if delete_response.data else 0} rows")
 
             # Insert new data
-            for response_id, stats in data.items():
-                self.supabase.table('response_8ball_usage').upsert({
-                    'response_id': response_id,
-                    'response_text': stats['text'],
-                    'usage_count': stats['usage_count'],
-                    'last_used': stats['last_used']
-                }).execute()
-            logger.info(f"[Database] save_8ball_usage: Success ({len(data)} responses to Supabase)")
+            rows = [{
+                id_column: response_id,
+                text_column: stats['text'],
+                'usage_count': stats['usage_count'],
+                'last_used': stats['last_used']
+            } for response_id, stats in data.items()]
+            if self.usage_storage == 'unified':
+                for row in rows:
+                    row['pool'] = pool_name
+            self._bulk_upsert(table_name, rows, label, on_conflict=on_conflict)
+            logger.info(f"[Database] {label}: Success ({len(data)} items to Supabase)")
         except Exception as e:
-            logger.warning(f"[Database] save_8ball_usage: Supabase error, falling back to JSON: {type(e).__name__}: {e}")
-            try:
-                with open('8ball_usage.json', 'w') as f:
-                    json.dump(data, f, indent=2)
-                logger.info(f"[Database] save_8ball_usage: JSON fallback successful ({len(data)} responses)")
-            except Exception as json_e:
-                logger.error(f"[Database] save_8ball_usage: JSON fallback failed: {type(json_e).__name__}: {json_e}")
+            logger.warning(f"[Database] {label}: Supabase error, falling back to JSON: {type(e).__name__}: {e}")
+            if self._write_usage_json(pool_name, data, label):
+                logger.info(f"[Database] {label}: JSON fallback successful ({len(data)} items)")
 
-    def increment_8ball_usage(self, response_id, response_text):
-        """Increment usage count for an 8-ball response (ID-based)"""
-        from datetime import datetime, timezone
+    def increment_usage(self, pool_name, response_id, response_text):
+        """
+        Increment the usage count for a response in memory.
 
-        try:
-            usage_data = self.load_8ball_usage()
+        The change is queued and written out by the next flush_usage().
 
-            if response_id not in usage_data:
-                usage_data[response_id] = {'text': response_text, 'usage_count': 0, 'last_used': None}
-                logger.debug(f"[Database] increment_8ball_usage: New response '{response_id}'")
+        Args:
+            pool_name (str): Pool identifier
+            response_id (str): Response ID
+            response_text (str): Response text (updates if changed)
 
-            # Update both usage AND text (in case text was edited in constants.py)
-            usage_data[response_id]['text'] = response_text
-            usage_data[response_id]['usage_count'] += 1
-            usage_data[response_id]['last_used'] = datetime.now(timezone.utc).isoformat()
-            new_count = usage_data[response_id]['usage_count']
+        Returns:
+            int: New usage count
+        """
+        label = self._usage_label('increment', pool_name)
 
-            self.save_8ball_usage(usage_data)
-            logger.debug(f"[Database] increment_8ball_usage: '{response_id}' now at {new_count} uses")
+        try:
+            usage_data = self.load_usage(pool_name)
+            with self._usage_lock:
+                # If the backend read failed this starts an empty cache entry,
+                # so the increment isn't lost and gets flushed later
+                usage_data = self._usage_cache.setdefault(pool_name, usage_data)
+
+                if response_id not in usage_data:
+                    usage_data[response_id] = {'text': response_text, 'usage_count': 0, 'last_used': None}
+                    logger.debug(f"[Database] {label}: New response '{response_id}'")
+
+                # Update both usage AND text (in case text was edited)
+                entry = usage_data[response_id]
+                entry['text'] = response_text
+                entry['usage_count'] += 1
+                entry['last_used'] = datetime.now(timezone.utc).isoformat()
+                new_count = entry['usage_count']
+
+                pending = self._usage_pending.setdefault(pool_name, {})
+                pending[response_id] = pending.get(response_id, 0) + 1
+
+            logger.debug(f"[Database] {label}: '{response_id}' now at {new_count} uses")
             return new_count
         except Exception as e:
-            logger.error(f"[Database] increment_8ball_usage: Failed for '{response_id}': {type(e).__name__}: {e}")
+            logger.error(f"[Database] {label}: Failed for '{response_id}': {type(e).__name__}: {e}")
             return 1  # Return 1 as fallback to indicate it was used once
 
-    def load_vague_usage(self):
-        """Load vague statement usage statistics from Supabase or JSON"""
-        if not self.supabase:
-            try:
-                with open('vague_usage.json', 'r') as f:
-                    data = json.load(f)
-                    logger.info(f"[Database] load_vague_usage: Success ({len(data)} statements from JSON)")
-                    return data
-            except FileNotFoundError:
-                logger.info("[Database] load_vague_usage: No JSON file found, returning empty dict")
-                return {}
-            except Exception as e:
-                logger.error(f"[Database] load_vague_usage: JSON read failed: {type(e).__name__}: {e}")
-                return {}
+    def pending_usage_count(self):
+        """Number of increments waiting to be flushed"""
+        with self._usage_lock:
+            return sum(sum(pending.values()) for pending in self._usage_pending.values())
 
-        try:
-            response = self.supabase.table('response_vague_usage').select("*").execute()
-            # Return dict keyed by statement_id
-            data = {item['statement_id']: {
-                'text': item['statement_text'],
-                'usage_count': item['usage_count'],
-                'last_used': item['last_used']
-            } for item in response.data}
-            logger.info(f"[Database] load_vague_usage: Success ({len(data)} statements from Supabase)")
-            return data
-        except Exception as e:
-            logger.error(f"[Database] load_vague_usage: Supabase query failed: {type(e).__name__}: {e}")
-            return {}
+    def flush_usage(self):
+        """
+        Apply all pending usage increments to SQLite, Supabase or JSON.
 
-    def save_vague_usage(self, data):
-        """Save vague statement usage statistics to Supabase or JSON"""
-        if not self.supabase:
+        Pending increments are sent as deltas, one atomic batch per pool, so
+        concurrent writers add to the stored count instead of overwriting it.
+        Pools that fail to persist are re-queued for the next flush.
+
+        Returns:
+            int: Number of pools flushed
+        """
+        with self._flush_lock:
+            with self._usage_lock:
+                pending = self._usage_pending
+                self._usage_pending = {}
+                batches = {
+                    pool_name: [{
+                        'id': response_id,
+                        'text': self._usage_cache[pool_name][response_id]['text'],
+                        'delta': delta,
+                        'last_used': self._usage_cache[pool_name][response_id]['last_used']
+                    } for response_id, delta in deltas.items()]
+                    for pool_name, deltas in pending.items()
+                }
+
+            flushed = 0
+            for pool_name, batch in batches.items():
+                label = self._usage_label('flush', pool_name)
+                counts = self._apply_usage_deltas(pool_name, batch, label)
+                if counts is None:
+                    self._requeue_usage(pool_name, pending[pool_name])
+                    continue
+                self._merge_usage_counts(pool_name, counts)
+                flushed += 1
+                logger.debug(f"[Database] {label}: Flushed {len(batch)} items")
+
+        if flushed:
+            logger.info(f"[Database] flush_usage: Success ({flushed} pools)")
+        return flushed
+
+    def _apply_usage_deltas(self, pool_name, batch, label):
+        """
+        Atomically add a batch of deltas to a pool's stored counts.
+
+        A failed SQLite or Supabase write returns None so the deltas stay
+        pending and are retried; counts from the JSON fallback must never be
+        merged into a cache loaded from another backend.
+
+        Returns:
+            dict: Stored usage_count per response_id after the update, or None on failure
+        """
+        if self.sqlite:
             try:
-                with open('vague_usage.json', 'w') as f:
-                    json.dump(data, f, indent=2)
-                logger.info(f"[Database] save_vague_usage: Success ({len(data)} statements to JSON)")
+                return self.sqlite.apply_usage_deltas(pool_name, batch)
             except Exception as e:
-                logger.error(f"[Database] save_vague_usage: JSON write failed: {type(e).__name__}: {e}")
-            return
+                logger.warning(f"[Database] {label}: SQLite error, will retry next flush: {type(e).__name__}: {e}")
+                return None
 
-        try:
-            # Clear existing
-            self.supabase.table('response_vague_usage').delete().neq('statement_id', '').execute()
+        if not self.supabase:
+            return self._apply_usage_deltas_json(pool_name, batch, label)
 
-            # Insert new data
-            for statement_id, stats in data.items():
-                self.supabase.table('response_vague_usage').upsert({
-                    'statement_id': statement_id,
-                    'statement_text': stats['text'],
-                    'usage_count': stats['usage_count'],
-                    'last_used': stats['last_used']
+        table_name, _, id_column, text_column = self._usage_spec(pool_name)
+        try:
+            # Single INSERT ... ON CONFLICT DO UPDATE SET usage_count = usage_count + delta
+            if self.usage_storage == 'unified':
+                response = self.supabase.rpc('increment_unified_response_usage', {
+                    'p_pool': pool_name,
+                    'p_rows': batch
+                }).execute()
+            else:
+                response = self.supabase.rpc('increment_response_usage', {
+                    'p_table': table_name,
+                    'p_id_column': id_column,
+                    'p_text_column': text_column,
+                    'p_rows': batch
                 }).execute()
-            logger.info(f"[Database] save_vague_usage: Success ({len(data)} statements to Supabase)")
+            return {item['id']: item['usage_count'] for item in (response.data or [])}
         except Exception as e:
-            logger.warning(f"[Database] save_vague_usage: Supabase error, falling back to JSON: {type(e).__name__}: {e}")
-            try:
-                with open('vague_usage.json', 'w') as f:
-                    json.dump(data, f, indent=2)
-                logger.info(f"[Database] save_vague_usage: JSON fallback successful ({len(data)} statements)")
-            except Exception as json_e:
-                logger.error(f"[Database] save_vague_usage: JSON fallback failed: {type(json_e).__name__}: {json_e}")
+            logger.warning(f"[Database] {label}: Supabase error, will retry next flush: {type(e).__name__}: {e}")
+            return None
 
-    def increment_vague_usage(self, statement_id, statement_text):
-        """Increment usage count for a vague statement (ID-based)"""
-        from datetime import datetime, timezone
+    def _apply_usage_deltas_json(self, pool_name, batch, label):
+        """Per-key JSON equivalent of the increment_response_usage RPC"""
+        _, json_file, _, _ = self._usage_spec(pool_name)
+        try:
+            # Only the flushed keys are read and journaled, not the whole pool
+            data = self.journal.get_items(json_file, [row['id'] for row in batch])
+        except Exception as e:
+            logger.error(f"[Database] {label}: JSON read failed: {type(e).__name__}: {e}")
+            return None
+
+        for row in batch:
+            entry = data.setdefault(row['id'], {'text': row['text'], 'usage_count': 0, 'last_used': None})
+            entry['text'] = row['text']
+            entry['usage_count'] += row['delta']
+            entry['last_used'] = row['last_used']
 
         try:
-            usage_data = self.load_vague_usage()
+            self.journal.set_items(json_file, data)
+        except Exception as e:
+            logger.error(f"[Database] {label}: JSON write failed: {type(e).__name__}: {e}")
+            return None
+        return {row['id']: data[row['id']]['usage_count'] for row in batch}
+
+    def _merge_usage_counts(self, pool_name, counts):
+        """Adopt stored counts (which include other writers' increments) into the cache"""
+        with self._usage_lock:
+            cache = self._usage_cache.get(pool_name, {})
+            pending = self._usage_pending.get(pool_name, {})
+            for response_id, usage_count in counts.items():
+                if response_id in cache:
+                    # Keep increments that arrived while the flush was in flight
+                    cache[response_id]['usage_count'] = usage_count + pending.get(response_id, 0)
+
+    def _requeue_usage(self, pool_name, deltas):
+        """Put unflushed increments back so the next flush retries them"""
+        with self._usage_lock:
+            pending = self._usage_pending.setdefault(pool_name, {})
+            for response_id, count in deltas.items():
+                pending[response_id] = pending.get(response_id, 0) + count
+
+    def compact_json_storage(self):
+        """
+        Fold JSON journals into fresh snapshots.
+
+        Driven by tasks/usage_flush.py on an interval; a no-op unless the JSON
+        fallback has written anything.
 
-            if statement_id not in usage_data:
-                usage_data[statement_id] = {'text': statement_text, 'usage_count': 0, 'last_used': None}
-                logger.debug(f"[Database] increment_vague_usage: New statement '{statement_id}'")
+        Returns:
+            int: Number of stores compacted
+        """
+        compacted = self.journal.compact_all()
+        if compacted:
+            logger.info(f"[Database] compact_json_storage: Success ({compacted} stores)")
+        return compacted
 
-            # Update both usage AND text (in case text was edited in constants.py)
-            usage_data[statement_id]['text'] = statement_text
-            usage_data[statement_id]['usage_count'] += 1
-            usage_data[statement_id]['last_used'] = datetime.now(timezone.utc).isoformat()
-            new_count = usage_data[statement_id]['usage_count']
+    def load_whisper_usage(self):
+        """Load whisper usage statistics (cached)"""
+        return self.load_usage('whisper')
 
-            self.save_vague_usage(usage_data)
-            logger.debug(f"[Database] increment_vague_usage: '{statement_id}' now at {new_count} uses")
-            return new_count
-        except Exception as e:
-            logger.error(f"[Database] increment_vague_usage: Failed for '{statement_id}': {type(e).__name__}: {e}")
-            return 1  # Return 1 as fallback to indicate it was used once
+    def save_whisper_usage(self, data):
+        """Save whisper usage statistics to Supabase or JSON"""
+        self.save_usage('whisper', data)
+
+    def increment_whisper_usage(self, whisper_id, whisper_text):
+        """Increment usage count for a whisper (ID-based)"""
+        return self.increment_usage('whisper', whisper_id, whisper_text)
+
+    def load_8ball_usage(self):
+        """Load 8-ball response usage statistics (cached)"""
+        return self.load_usage('8ball')
+
+    def save_8ball_usage(self, data):
+        """Save 8-ball response usage statistics to Supabase or JSON"""
+        self.save_usage('8ball', data)
+
+    def increment_8ball_usage(self, response_id, response_text):
+        """Increment usage count for an 8-ball response (ID-based)"""
+        return self.increment_usage('8ball', response_id, response_text)
+
+    def load_vague_usage(self):
+        """Load vague statement usage statistics (cached)"""
+        return self.load_usage('vague')
+
+    def save_vague_usage(self, data):
+        """Save vague statement usage statistics to Supabase or JSON"""
+        self.save_usage('vague', data)
+
+    def increment_vague_usage(self, statement_id, statement_text):
+        """Increment usage count for a vague statement (ID-based)"""
+        return self.increment_usage('vague', statement_id, statement_text)
 
     # =========================================================================
     # GENERIC INTENT POOL FUNCTIONS (Phase 1)
     # =========================================================================
 
-    def load_pool_usage(self, pool_name):
+    def load_pool_usage(self, pool_name, strict=False):
         """
         Generic pool usage loader for any response pool.
 
         Args:
             pool_name (str): Pool identifier (e.g., 'greeting', 'kebab')
+            strict (bool): Raise RuntimeError on a failed read instead of
+                returning an empty dict
 
         Returns:
             dict: Usage data keyed by response_id
         """
-        json_file = f'{pool_name}_usage.json'
-        table_name = f'response_{pool_name}_usage'
-
-        if not self.supabase:
-            try:
-                with open(json_file, 'r') as f:
-                    data = json.load(f)
-                    logger.info(f"[Database] load_pool_usage({pool_name}): Success ({len(data)} items from JSON)")
-                    return data
-            except FileNotFoundError:
-                logger.info(f"[Database] load_pool_usage({pool_name}): No JSON file found, returning empty dict")
-                return {}
-            except Exception as e:
-                logger.error(f"[Database] load_pool_usage({pool_name}): JSON read failed: {type(e).__name__}: {e}")
-                return {}
-
-        try:
-            response = self.supabase.table(table_name).select("*").execute()
-            # Log raw response for debugging
-            if not response.data:
-                logger.warning(f"[Database] load_pool_usage({pool_name}): Table '{table_name}' returned empty (count={response.count})")
-            data = {item['response_id']: {
-                'text': item['response_text'],
-                'usage_count': item['usage_count'],
-                'last_used': item['last_used']
-            } for item in response.data}
-            logger.info(f"[Database] load_pool_usage({pool_name}): Success ({len(data)} items from Supabase)")
-            return data
-        except Exception as e:
-            logger.error(f"[Database] load_pool_usage({pool_name}): Supabase query failed: {type(e).__name__}: {e}")
-            return {}
+        return self.load_usage(pool_name, strict)
 
     def save_pool_usage(self, pool_name, data):
         """
@@ -522,43 +1143,7 @@ class BotDatabase:
             pool_name (str): Pool identifier
             data (dict): Usage data to save
         """
-        json_file = f'{pool_name}_usage.json'
-        table_name = f'response_{pool_name}_usage'
-
-        if not self.supabase:
-            try:
-                with open(json_file, 'w') as f:
-                    json.dump(data, f, indent=2)
-                logger.info(f"[Database] save_pool_usage({pool_name}): Success ({len(data)} items to JSON)")
-            except Exception as e:
-                logger.error(f"[Database] save_pool_usage({pool_name}): JSON write failed: {type(e).__name__}: {e}")
-            return
-
-        try:
-            # Clear existing
-            delete_response = self.supabase.table(table_name).delete().neq('response_id', '').execute()
-            logger.debug(f"[Database] save_pool_usage({pool_name}): Deleted {len(delete_response.data) if delete_response.data else 0} rows")
-
-            # Insert new data
-            for response_id, stats in data.items():
-                upsert_response = self.supabase.table(table_name).upsert({
-                    'response_id': response_id,
-                    'response_text': stats['text'],
-                    'usage_count': stats['usage_count'],
-                    'last_used': stats['last_used']
-                }).execute()
-                # Check if upsert actually worked
-                if not upsert_response.data:
-                    logger.warning(f"[Database] save_pool_usage({pool_name}): Upsert for '{response_id}' returned no data - may have failed silently")
-            logger.info(f"[Database] save_pool_usage({pool_name}): Success ({len(data)} items to Supabase)")
-        except Exception as e:
-            logger.warning(f"[Database] save_pool_usage({pool_name}): Supabase error, falling back to JSON: {type(e).__name__}: {e}")
-            try:
-                with open(json_file, 'w') as f:
-                    json.dump(data, f, indent=2)
-                logger.info(f"[Database] save_pool_usage({pool_name}): JSON fallback successful ({len(data)} items)")
-            except Exception as json_e:
-                logger.error(f"[Database] save_pool_usage({pool_name}): JSON fallback failed: {type(json_e).__name__}: {json_e}")
+        self.save_usage(pool_name, data)
 
     def increment_pool_usage(self, pool_name, response_id, response_text):
         """
@@ -572,98 +1157,228 @@ class BotDatabase:
         Returns:
             int: New usage count
         """
-        from datetime import datetime, timezone
-
-        try:
-            usage_data = self.load_pool_usage(pool_name)
-
-            if response_id not in usage_data:
-                usage_data[response_id] = {'text': response_text, 'usage_count': 0, 'last_used': None}
-                logger.debug(f"[Database] increment_pool_usage({pool_name}): New response '{response_id}'")
+        return self.increment_usage(pool_name, response_id, response_text)
 
-            # Update both usage AND text (in case text was edited)
-            usage_data[response_id]['text'] = response_text
-            usage_data[response_id]['usage_count'] += 1
-            usage_data[response_id]['last_used'] = datetime.now(timezone.utc).isoformat()
-            new_count = usage_data[response_id]['usage_count']
+    def load_prebans(self, strict=False):
+        """
+        Load prebanned user IDs from SQLite, Supabase or JSON.
 
-            self.save_pool_usage(pool_name, usage_data)
-            logger.debug(f"[Database] increment_pool_usage({pool_name}): '{response_id}' now at {new_count} uses")
-            return new_count
-        except Exception as e:
-            logger.error(f"[Database] increment_pool_usage({pool_name}): Failed for '{response_id}': {type(e).__name__}: {e}")
-            return 1
+        Args:
+            strict (bool): Re-raise a failed read instead of returning an empty dict
+        """
+        if self.sqlite:
+            try:
+                data = self.sqlite.load_prebans()
+                count = sum(len(users) for users in data.values())
+                logger.info(f"[Database] load_prebans: Success ({count} users from SQLite)")
+                return data
+            except Exception as e:
+                logger.warning(f"[Database] load_prebans: SQLite error, falling back to JSON: {type(e).__name__}: {e}")
 
-    def load_prebans(self):
-        """Load prebanned user IDs from Supabase or JSON"""
         if not self.supabase:
             try:
-                with open('prebans.json', 'r') as f:
-                    data = json.load(f)
-                    # Count total prebans across all guilds
-                    count = sum(len(users) for users in data.values())
-                    logger.info(f"[Database] load_prebans: Success ({count} users from JSON)")
-                    return data
+                data = self.journal.load('prebans.json')
+                # Count total prebans across all guilds
+                count = sum(len(users) for users in data.values())
+                logger.info(f"[Database] load_prebans: Success ({count} users from JSON)")
+                return data
             except FileNotFoundError:
                 logger.info("[Database] load_prebans: No JSON file found, returning empty dict")
                 return {}
             except Exception as e:
                 logger.error(f"[Database] load_prebans: JSON read failed: {type(e).__name__}: {e}")
+                if strict:
+                    raise
                 return {}
 
         try:
-            response = self.supabase.table('prebans').select("*").execute()
-            prebans_dict = {}
-            for item in response.data:
-                guild_id = item['guild_id']
-                user_id = item['user_id']
-                if guild_id not in prebans_dict:
-                    prebans_dict[guild_id] = {}
-                prebans_dict[guild_id][user_id] = item['data']
+            source = 'cache' if self.repositories['prebans'].primed else 'Supabase'
+            prebans_dict = self._load_keyed('prebans')
             count = sum(len(users) for users in prebans_dict.values())
-            logger.info(f"[Database] load_prebans: Success ({count} users from Supabase)")
+            logger.info(f"[Database] load_prebans: Success ({count} users from {source})")
             return prebans_dict
         except Exception as e:
             logger.error(f"[Database] load_prebans: Supabase query failed: {type(e).__name__}: {e}")
+            if strict:
+                raise
             return {}
 
+    def get_preban(self, guild_id, user_id):
+        """
+        Look up a single preban entry.
+
+        SQLite answers this with a primary-key lookup; other backends read the
+        full preban list.
+
+        Args:
+            guild_id (str): Guild ID
+            user_id (str): User ID
+
+        Returns:
+            dict: Preban data, or None if the user isn't prebanned
+        """
+        if self.sqlite:
+            try:
+                return self.sqlite.get_preban(guild_id, user_id)
+            except Exception as e:
+                logger.warning(f"[Database] get_preban: SQLite error, falling back to JSON: {type(e).__name__}: {e}")
+        return self.load_prebans().get(guild_id, {}).get(user_id)
+
+    def load_task_state(self, name, strict=False):
+        """
+        Load the persisted state of a scheduled task (one row per task).
+
+        Args:
+            name (str): Task name, e.g. 'weekly_summary'
+            strict (bool): Re-raise a failed read instead of returning None,
+                which would be indistinguishable from a task never saved
+
+        Returns:
+            dict: The task's state, or None if it has never been saved
+        """
+        if self.sqlite:
+            try:
+                return self.sqlite.load_task_state(name)
+            except Exception as e:
+                logger.warning(f"[Database] load_task_state: SQLite error, falling back to JSON: {type(e).__name__}: {e}")
+
+        if not self.supabase:
+            try:
+                return self.journal.get_items('task_state.json', [name]).get(name)
+            except Exception as e:
+                logger.error(f"[Database] load_task_state: JSON read failed: {type(e).__name__}: {e}")
+                if strict:
+                    raise
+                return None
+
+        try:
+            response = self.supabase.table('task_state').select('data').eq('name', name).execute()
+            return response.data[0]['data'] if response.data else None
+        except Exception as e:
+            logger.error(f"[Database] load_task_state: Supabase query failed: {type(e).__name__}: {e}")
+            if strict:
+                raise
+            return None
+
+    def save_task_state(self, name, data):
+        """Save the state of a scheduled task to SQLite, Supabase or JSON"""
+        if self.sqlite:
+            try:
+                self.sqlite.save_task_state(name, data)
+                logger.debug(f"[Database] save_task_state: Success ({name} to SQLite)")
+                return
+            except Exception as e:
+                logger.warning(f"[Database] save_task_state: SQLite error, falling back to JSON: {type(e).__name__}: {e}")
+
+        if not self.supabase:
+            try:
+                self.journal.set_items('task_state.json', {name: data})
+                logger.debug(f"[Database] save_task_state: Success ({name} to JSON)")
+            except Exception as e:
+                logger.error(f"[Database] save_task_state: JSON write failed: {type(e).__name__}: {e}")
+            return
+
+        try:
+            self._bulk_upsert('task_state', [{'name': name, 'data': data}], 'save_task_state', on_conflict='name')
+            logger.debug(f"[Database] save_task_state: Success ({name} to Supabase)")
+        except Exception as e:
+            logger.warning(f"[Database] save_task_state: Supabase error, falling back to JSON: {type(e).__name__}: {e}")
+            try:
+                self.journal.set_items('task_state.json', {name: data})
+            except Exception as json_e:
+                logger.error(f"[Database] save_task_state: JSON fallback failed: {type(json_e).__name__}: {json_e}")
+
     def save_prebans(self, data):
-        """Save prebanned user IDs to Supabase or JSON"""
+        """Save prebanned user IDs to SQLite, Supabase or JSON"""
         count = sum(len(users) for users in data.values())
 
+        if self.sqlite:
+            try:
+                written, deleted = self.sqlite.save_prebans(data)
+                logger.info(f"[Database] save_prebans: Success ({count} users to SQLite, {written} written, {deleted} deleted)")
+                return
+            except Exception as e:
+                logger.warning(f"[Database] save_prebans: SQLite error, falling back to JSON: {type(e).__name__}: {e}")
+
         if not self.supabase:
             try:
-                with open('prebans.json', 'w') as f:
-                    json.dump(data, f)
+                self.journal.save('prebans.json', data, depth=2)
                 logger.info(f"[Database] save_prebans: Success ({count} users to JSON)")
             except Exception as e:
                 logger.error(f"[Database] save_prebans: JSON write failed: {type(e).__name__}: {e}")
             return
 
         try:
-            # Clear existing
-            self.supabase.table('prebans').delete().neq('guild_id', '0').execute()
-
-            # Insert new data
-            for guild_id, guild_prebans in data.items():
-                for user_id, preban_data in guild_prebans.items():
-                    self.supabase.table('prebans').upsert({
-                        'guild_id': guild_id,
-                        'user_id': user_id,
-                        'data': preban_data
-                    }).execute()
-            logger.info(f"[Database] save_prebans: Success ({count} users to Supabase)")
+            upserted, deleted = self._save_keyed('prebans', data, 'save_prebans')
+            logger.info(f"[Database] save_prebans: Success ({count} users to Supabase, {upserted} upserted, {deleted} deleted)")
         except Exception as e:
             logger.warning(f"[Database] save_prebans: Supabase error, falling back to JSON: {type(e).__name__}: {e}")
             try:
-                with open('prebans.json', 'w') as f:
-                    json.dump(data, f)
+                self.journal.save('prebans.json', data, depth=2)
                 logger.info(f"[Database] save_prebans: JSON fallback successful ({count} users)")
             except Exception as json_e:
                 logger.error(f"[Database] save_prebans: JSON fallback failed: {type(json_e).__name__}: {json_e}")
 
+class AsyncBotDatabase:
+    """
+    Awaitable facade over BotDatabase for use inside coroutines.
+
+    Every BotDatabase method is available with the same arguments, e.g.
+    ``await adb.load_pool_usage('greeting')``. Calls run on a bounded thread
+    pool so a slow Supabase round-trip or file write never stalls the
+    discord.py event loop (gateway heartbeats, other guilds' events).
+    """
+
+    def __init__(self, database, max_workers=DB_EXECUTOR_WORKERS):
+        self._db = database
+        self._executor = ThreadPoolExecutor(max_workers=max_workers, thread_name_prefix='dreambot-db')
+        self._locks = {}
+
+    def lock(self, store):
+        """
+        asyncio.Lock for a store's load-modify-save sequences.
+
+        Loads and saves await the thread pool, so other events can run in
+        between; holding the store's lock across the whole sequence keeps two
+        commands from saving over each other's changes.
+
+        Args:
+            store (str): Store name, e.g. 'warnings' or 'prebans'
+        """
+        return self._locks.setdefault(store, asyncio.Lock())
+
+    @property
+    def database(self):
+        """The wrapped BotDatabase, for reading its (non-callable) attributes"""
+        return self._db
+
+    async def run(self, func, *args, **kwargs):
+        """Run any blocking callable on the database thread pool"""
+        loop = asyncio.get_running_loop()
+        return await loop.run_in_executor(self._executor, functools.partial(func, *args, **kwargs))
+
+    def __getattr__(self, name):
+        method = getattr(self._db, name)
+        if name.startswith('_') or not callable(method):
+            raise AttributeError(f"'{type(self).__name__}' has no awaitable method '{name}'")
+
+        async def call(*args, **kwargs):
+            return await self.run(method, *args, **kwargs)
+
+        call.__name__ = name
+        return call
+
+    def shutdown(self):
+        """Wait for in-flight calls and stop the thread pool"""
+        self._executor.shutdown(wait=True)
+
 # Create global instance
 db = BotDatabase()
+adb = AsyncBotDatabase(db)
+
+# Last-chance flush of buffered usage counters on interpreter exit
+atexit.register(db.flush_usage)
+atexit.register(db.compact_json_storage)
 
 # Export functions
 def load_reaction_roles():
@@ -684,6 +1399,12 @@ def load_suggestions():
 def save_suggestions(data):
     db.save_suggestions(data)
 
+def save_suggestion(message_id, data):
+    db.save_suggestion(message_id, data)
+
+def delete_suggestion(message_id):
+    db.delete_suggestion(message_id)
+
 def load_whisper_usage():
     return db.load_whisper_usage()
 
@@ -717,6 +1438,15 @@ def load_prebans():
 def save_prebans(data):
     db.save_prebans(data)
 
+def get_preban(guild_id, user_id):
+    return db.get_preban(guild_id, user_id)
+
+def load_task_state(name):
+    return db.load_task_state(name)
+
+def save_task_state(name, data):
+    db.save_task_state(name, data)
+
 # Generic pool functions for intent-based response pools
 def load_pool_usage(pool_name):
     return db.load_pool_usage(pool_name)
@@ -725,4 +1455,13 @@ def save_pool_usage(pool_name, data):
     db.save_pool_usage(pool_name, data)
 
 def increment_pool_usage(pool_name, response_id, response_text):
-    return db.increment_pool_usage(pool_name, response_id, response_text)
\ No newline at end of file
+    return db.increment_pool_usage(pool_name, response_id, response_text)
+
+def flush_usage():
+    return db.flush_usage()
+
+def load_all_pool_usage(pool_names):
+    return db.load_all_pool_usage(pool_names)
+
+def compact_json_storage():
+    return db.compact_json_storage()
\ No newline at end of file
@@ -1,8 +1,9 @@
 import discord
 from discord.ext import commands
 from config import SUPPORTER_ROLE
-from database import load_prebans, save_prebans
+from database import adb
 from utils import log_moderation
+from utils.member_counts import human_member_counts
 
 class MemberEvents(commands.Cog):
     """Handle member-related events"""
@@ -10,15 +11,33 @@ class MemberEvents(commands.Cog):
     def __init__(self, bot):
         self.bot = bot
 
+    @commands.Cog.listener()
+    async def on_ready(self):
+        """Count each guild's human members once the member cache is populated"""
+        human_member_counts.build(self.bot.guilds)
+
+    @commands.Cog.listener()
+    async def on_guild_join(self, guild):
+        human_member_counts.build([guild])
+
+    @commands.Cog.listener()
+    async def on_guild_remove(self, guild):
+        human_member_counts.invalidate(guild.id)
+
+    @commands.Cog.listener()
+    async def on_member_remove(self, member):
+        human_member_counts.member_removed(member)
+
     @commands.Cog.listener()
     async def on_member_join(self, member):
         """Check if joining member is on the preban list"""
-        prebans = load_prebans()
+        human_member_counts.member_joined(member)
+
         guild_id = str(member.guild.id)
         user_id_str = str(member.id)
 
-        if guild_id in prebans and user_id_str in prebans[guild_id]:
-            preban_data = prebans[guild_id][user_id_str]
+        preban_data = await adb.get_preban(guild_id, user_id_str)
+        if preban_data:
             reason = f"Preban: {preban_data['reason']}"
 
             try:
@@ -26,8 +45,10 @@ class MemberEvents(commands.Cog):
                 await member.guild.ban(member, reason=reason, delete_message_days=0)
 
                 # Remove from preban list (one-time use)
-                del prebans[guild_id][user_id_str]
-                save_prebans(prebans)
+                async with adb.lock('prebans'):
+                    prebans = await adb.load_prebans()
+                    prebans.get(guild_id, {}).pop(user_id_str, None)
+                    await adb.save_prebans(prebans)
 
                 # Notify mods in mod-logs
                 await log_moderation(
@@ -51,6 +72,8 @@ class MemberEvents(commands.Cog):
     @commands.Cog.listener()
     async def on_member_update(self, before, after):
         """Automatically assign Supporter role to boosters"""
+        human_member_counts.member_updated(before, after)
+
         # Check if user just started boosting
         if not before.premium_since and after.premium_since:
             supporter_role = discord.utils.get(after.guild.roles, name=SUPPORTER_ROLE)
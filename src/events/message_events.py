@@ -38,14 +38,7 @@ from config import (
     # Escape path pool
     ESCAPE_RESPONSES,
 )
-from database import (
-    load_8ball_usage,
-    increment_8ball_usage,
-    load_vague_usage,
-    increment_vague_usage,
-    load_pool_usage,
-    increment_pool_usage,
-)
+from database import adb
 from events.intent_detection import detect_intent
 from events.topic_extraction import extract_topic, format_response
 from events.conversation_context import (
@@ -95,9 +88,9 @@ def is_question(text):
     return False
 
 
-def select_weighted_8ball():
+async def select_weighted_8ball():
     """Select a magic 8-ball response using weighted randomness (ID-based)."""
-    usage_data = load_8ball_usage()
+    usage_data = await adb.load_8ball_usage()
 
     weights = []
     for response in AHAMKARA_8BALL:
@@ -107,14 +100,14 @@ def select_weighted_8ball():
         weights.append(weight)
 
     selected = random.choices(AHAMKARA_8BALL, weights=weights, k=1)[0]
-    increment_8ball_usage(selected["id"], selected["text"])
+    await adb.increment_8ball_usage(selected["id"], selected["text"])
 
     return selected["text"]
 
 
-def select_weighted_vague():
+async def select_weighted_vague():
     """Select a vague statement using weighted randomness (ID-based)."""
-    usage_data = load_vague_usage()
+    usage_data = await adb.load_vague_usage()
 
     weights = []
     for statement in VAGUE_STATEMENTS:
@@ -124,12 +117,12 @@ def select_weighted_vague():
         weights.append(weight)
 
     selected = random.choices(VAGUE_STATEMENTS, weights=weights, k=1)[0]
-    increment_vague_usage(selected["id"], selected["text"])
+    await adb.increment_vague_usage(selected["id"], selected["text"])
 
     return selected["text"]
 
 
-def select_weighted_pool_response(pool_name, response_pool, topic=None):
+async def select_weighted_pool_response(pool_name, response_pool, topic=None):
     """
     Generic weighted response selector with dynamic template support.
 
@@ -141,7 +134,7 @@ def select_weighted_pool_response(pool_name, response_pool, topic=None):
     Returns:
         str: Selected and formatted response text
     """
-    usage_data = load_pool_usage(pool_name)
+    usage_data = await adb.load_pool_usage(pool_name)
 
     # Filter candidates based on topic availability
     if topic:
@@ -170,7 +163,7 @@ def select_weighted_pool_response(pool_name, response_pool, topic=None):
         response_text = format_response(response_text, topic=topic)
 
     # Increment usage with the TEMPLATE (not the formatted text)
-    increment_pool_usage(pool_name, selected["id"], selected["text"])
+    await adb.increment_pool_usage(pool_name, selected["id"], selected["text"])
 
     return response_text
 
@@ -216,6 +209,13 @@ CONTEXT_POOLS = {
     'ESCAPE': ('escape', ESCAPE_RESPONSES),
 }
 
+# Every usage pool the bot writes to, including the whisper/8ball/vague pools
+USAGE_POOL_NAMES = (
+    ['whisper', '8ball', 'vague']
+    + [pool_name for pool_name, _, _ in INTENT_POOL_MAP.values()]
+    + [pool_name for pool_name, _ in CONTEXT_POOLS.values()]
+)
+
 
 class MessageEvents(commands.Cog):
     """Handle message-related events"""
@@ -247,7 +247,7 @@ class MessageEvents(commands.Cog):
             if should_trigger_escape(user_id):
                 # Send escape message and trigger escape
                 pool_name, response_pool = CONTEXT_POOLS['ESCAPE']
-                escape_response = select_weighted_pool_response(pool_name, response_pool)
+                escape_response = await select_weighted_pool_response(pool_name, response_pool)
                 trigger_escape(user_id)
                 logger.info(f"[Escape] Triggered for user {user_id}")
 
@@ -278,14 +278,14 @@ class MessageEvents(commands.Cog):
                 kebab_intensity = get_joke_intensity(user_id, 'kebab')
                 if kebab_intensity >= KEBAB_INTENSE_THRESHOLD:
                     pool_name, response_pool = CONTEXT_POOLS['KEBAB_INTENSE']
-                    response = select_weighted_pool_response(pool_name, response_pool)
+                    response = await select_weighted_pool_response(pool_name, response_pool)
                     logger.info(f"[Context] Kebab intensity {kebab_intensity} -> KEBAB_INTENSE")
                     used_context = True
 
             # Check for repetition (same question asked before)
             if not response and detect_repetition(user_id, intent, topic):
                 pool_name, response_pool = CONTEXT_POOLS['REPETITION_META']
-                response = select_weighted_pool_response(pool_name, response_pool)
+                response = await select_weighted_pool_response(pool_name, response_pool)
                 logger.info(f"[Context] Repetition detected for intent '{intent}'")
                 used_context = True
 
@@ -296,25 +296,25 @@ class MessageEvents(commands.Cog):
 
                     # Pass topic only if this pool supports it
                     if supports_topic and topic:
-                        response = select_weighted_pool_response(pool_name, response_pool, topic=topic)
+                        response = await select_weighted_pool_response(pool_name, response_pool, topic=topic)
                         logger.info(f"[Intent] Matched '{intent}' with topic '{topic}'")
                     else:
-                        response = select_weighted_pool_response(pool_name, response_pool)
+                        response = await select_weighted_pool_response(pool_name, response_pool)
                         logger.info(f"[Intent] Matched '{intent}' (no topic)")
                 else:
                     # Fallback to default question/statement pools
                     if is_question_flag:
-                        response = select_weighted_8ball()
+                        response = await select_weighted_8ball()
                         logger.debug(f"[Intent] Fallback to 8ball (question)")
                     else:
-                        response = select_weighted_vague()
+                        response = await select_weighted_vague()
                         logger.debug(f"[Intent] Fallback to vague (statement)")
 
             # Step 5: Check for lore callback opportunity (append to response)
             lore_suffix = None
             if should_lore_callback(user_id) and not used_context:
                 pool_name, response_pool = CONTEXT_POOLS['LORE_CALLBACK']
-                lore_suffix = select_weighted_pool_response(pool_name, response_pool)
+                lore_suffix = await select_weighted_pool_response(pool_name, response_pool)
                 logger.info(f"[Context] Lore callback triggered")
 
             # Step 6: Record message in context
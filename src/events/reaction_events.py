@@ -1,200 +1,125 @@
 import discord
 from discord.ext import commands
-import asyncio
 import logging
-from database import load_reaction_roles
-from config import COLOR_ROLES, EXOTIC_COLORS, SPECIAL_ROLES, PRONOUN_ROLES, DREAMER_ROLE
+import time
+from database import adb
+from utils.reaction_roles import reaction_role_index
+from utils.role_cache import guild_role_cache
+from utils.role_queue import role_mutation_queue
 
 logger = logging.getLogger(__name__)
 
-# Rate limit handling for role modifications
-# Discord has per-member rate limits, so we add small delays
-ROLE_MODIFY_DELAY = 0.25  # 250ms between role operations
+# Seconds between attempts to build the reaction-role index after a failed load
+INDEX_RETRY_SECONDS = 30
 
 class ReactionEvents(commands.Cog):
     """Handle reaction role events"""
 
     def __init__(self, bot):
         self.bot = bot
+        self._index_retry_at = 0
 
-    @commands.Cog.listener()
-    async def on_raw_reaction_add(self, payload):
-        if payload.user_id == self.bot.user.id:
+    async def cog_load(self):
+        """Build the reaction-role index before any reaction events arrive"""
+        await self._ensure_index()
+
+    async def _ensure_index(self):
+        """Build the reaction-role index unless it is built, retrying a failed load at most every INDEX_RETRY_SECONDS"""
+        if reaction_role_index.loaded or time.monotonic() < self._index_retry_at:
             return
+        # Set before awaiting so concurrent events don't start loads of their own
+        self._index_retry_at = time.monotonic() + INDEX_RETRY_SECONDS
+        try:
+            reaction_data = await adb.load_reaction_roles(strict=True)
+        except Exception as e:
+            logger.warning(f"[ReactionEvents] Reaction-role load failed, retrying in {INDEX_RETRY_SECONDS}s: {type(e).__name__}: {e}")
+            return
+        reaction_role_index.rebuild(reaction_data)
+        logger.info(f"[ReactionEvents] Indexed {len(reaction_role_index)} reaction-role messages")
 
-        reaction_data = load_reaction_roles()
-        message_id = str(payload.message_id)
+    @commands.Cog.listener()
+    async def on_ready(self):
+        """Build role lookups for every guild once the guild cache is populated"""
+        guild_role_cache.build(self.bot.guilds)
+        await self._ensure_index()
 
-        if message_id not in reaction_data:
-            return
+    @commands.Cog.listener()
+    async def on_guild_role_create(self, role):
+        guild_role_cache.invalidate(role.guild.id)
 
-        msg_data = reaction_data[message_id]
+    @commands.Cog.listener()
+    async def on_guild_role_update(self, before, after):
+        guild_role_cache.invalidate(after.guild.id)
+
+    @commands.Cog.listener()
+    async def on_guild_role_delete(self, role):
+        guild_role_cache.invalidate(role.guild.id)
+
+    async def _get_member(self, payload):
+        """Resolve the reacting member, fetching if they aren't cached"""
         guild = self.bot.get_guild(payload.guild_id)
+        if not guild:
+            return None, None
         member = guild.get_member(payload.user_id)
-
         if not member:
             try:
                 member = await guild.fetch_member(payload.user_id)
             except discord.NotFound:
-                return
-
-        # VERIFICATION
-        if msg_data['type'] == 'verify' and str(payload.emoji) == '✅':
-            role = discord.utils.get(guild.roles, name=DREAMER_ROLE)
-            if role and role not in member.roles:
-                try:
-                    await member.add_roles(role)
-                except discord.Forbidden:
-                    pass
-
-        # COLOR ROLES
-        elif msg_data['type'] in ['color', 'exotic']:
-            emoji_str = str(payload.emoji)
-
-            # Determine which color map to use
-            if msg_data['type'] == 'color':
-                color_map = COLOR_ROLES
-            else:
-                color_map = EXOTIC_COLORS
-
-            if emoji_str in color_map:
-                role_name = color_map[emoji_str]
-                new_role = discord.utils.get(guild.roles, name=role_name)
-
-                if new_role:
-                    try:
-                        # Remove all other color roles (with rate limiting)
-                        all_color_names = list(COLOR_ROLES.values()) + list(EXOTIC_COLORS.values())
-                        roles_to_remove = []
-                        for color_name in all_color_names:
-                            old_role = discord.utils.get(guild.roles, name=color_name)
-                            if old_role and old_role in member.roles:
-                                roles_to_remove.append(old_role)
-
-                        # Batch remove all color roles at once (more efficient)
-                        if roles_to_remove:
-                            await member.remove_roles(*roles_to_remove)
-                            await asyncio.sleep(ROLE_MODIFY_DELAY)
-
-                        # Add new color
-                        await member.add_roles(new_role)
-                    except discord.Forbidden:
-                        pass
-
-        # SPECIAL ROLES
-        elif msg_data['type'] == 'special':
-            emoji_str = str(payload.emoji)
-
-            if emoji_str in SPECIAL_ROLES:
-                role_name = SPECIAL_ROLES[emoji_str]
-                role = discord.utils.get(guild.roles, name=role_name)
-
-                if role and role not in member.roles:
-                    try:
-                        await member.add_roles(role)
-                    except discord.Forbidden:
-                        pass
-
-        # PRONOUN ROLES
-        elif msg_data['type'] == 'pronouns':
-            emoji_str = str(payload.emoji)
-
-            if emoji_str in PRONOUN_ROLES:
-                role_name = PRONOUN_ROLES[emoji_str]
-                role = discord.utils.get(guild.roles, name=role_name)
-
-                if role and role not in member.roles:
-                    try:
-                        await member.add_roles(role)
-                    except discord.Forbidden:
-                        pass
+                return guild, None
+        return guild, member
+
+    @commands.Cog.listener()
+    async def on_raw_reaction_add(self, payload):
+        if payload.user_id == self.bot.user.id:
+            return
+
+        await self._ensure_index()
+        # O(1) rejection of reactions that aren't on a role menu - no I/O
+        match = reaction_role_index.lookup(payload.message_id, str(payload.emoji))
+        if match is None:
+            return
+        message_type, role_name = match
+
+        guild, member = await self._get_member(payload)
+        if not member:
+            return
+
+        role = guild_role_cache.get_by_name(guild, role_name)
+        if not role:
+            return
+
+        # Changes are coalesced per member into one member.edit (last write wins)
+        # COLOR ROLES - only one color at a time
+        if message_type in ['color', 'exotic']:
+            other_colors = [color for color in guild_role_cache.color_roles(guild) if color.id != role.id]
+            role_mutation_queue.request(member, add=[role], remove=other_colors)
+
+        # VERIFICATION, SPECIAL and PRONOUN ROLES
+        else:
+            role_mutation_queue.request(member, add=[role])
 
     @commands.Cog.listener()
     async def on_raw_reaction_remove(self, payload):
         if payload.user_id == self.bot.user.id:
             return
 
-        reaction_data = load_reaction_roles()
-        message_id = str(payload.message_id)
+        await self._ensure_index()
+        match = reaction_role_index.lookup(payload.message_id, str(payload.emoji))
+        if match is None:
+            return
+        message_type, role_name = match
 
-        if message_id not in reaction_data:
+        # Un-reacting the verification message doesn't revoke Dreamer
+        if message_type == 'verify':
+            return
+
+        guild, member = await self._get_member(payload)
+        if not member:
             return
 
-        msg_data = reaction_data[message_id]
-
-        # Handle color removal
-        if msg_data['type'] in ['color', 'exotic']:
-            emoji_str = str(payload.emoji)
-
-            if msg_data['type'] == 'color':
-                color_map = COLOR_ROLES
-            else:
-                color_map = EXOTIC_COLORS
-
-            if emoji_str in color_map:
-                guild = self.bot.get_guild(payload.guild_id)
-                member = guild.get_member(payload.user_id)
-
-                if not member:
-                    try:
-                        member = await guild.fetch_member(payload.user_id)
-                    except discord.NotFound:
-                        return
-
-                role_name = color_map[emoji_str]
-                role = discord.utils.get(guild.roles, name=role_name)
-
-                if role and role in member.roles:
-                    try:
-                        await member.remove_roles(role)
-                    except discord.Forbidden:
-                        pass
-
-        # Handle special role removal
-        elif msg_data['type'] == 'special':
-            emoji_str = str(payload.emoji)
-
-            if emoji_str in SPECIAL_ROLES:
-                guild = self.bot.get_guild(payload.guild_id)
-                member = guild.get_member(payload.user_id)
-
-                if not member:
-                    try:
-                        member = await guild.fetch_member(payload.user_id)
-                    except discord.NotFound:
-                        return
-
-                role_name = SPECIAL_ROLES[emoji_str]
-                role = discord.utils.get(guild.roles, name=role_name)
-
-                if role and role in member.roles:
-                    try:
-                        await member.remove_roles(role)
-                    except discord.Forbidden:
-                        pass
-
-        # Handle pronoun role removal
-        elif msg_data['type'] == 'pronouns':
-            emoji_str = str(payload.emoji)
-
-            if emoji_str in PRONOUN_ROLES:
-                guild = self.bot.get_guild(payload.guild_id)
-                member = guild.get_member(payload.user_id)
-
-                if not member:
-                    try:
-                        member = await guild.fetch_member(payload.user_id)
-                    except discord.NotFound:
-                        return
-
-                role_name = PRONOUN_ROLES[emoji_str]
-                role = discord.utils.get(guild.roles, name=role_name)
-
-                if role and role in member.roles:
-                    try:
-                        await member.remove_roles(role)
-                    except discord.Forbidden:
-                        pass
+        role = guild_role_cache.get_by_name(guild, role_name)
+        if role:
+            role_mutation_queue.request(member, remove=[role])
 
 async def setup(bot):
     await bot.add_cog(ReactionEvents(bot))
\ No newline at end of file
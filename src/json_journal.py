@@ -0,0 +1,249 @@
+"""
+Append-only change journal for BotDatabase's JSON storage.
+
+Each JSON store (``warnings.json``, ``<pool>_usage.json``, ...) is a snapshot
+plus a ``<file>.log`` journal with one JSON line per mutation::
+
+    {"op": "set", "key": ["guild", "user"], "value": [...]}
+    {"op": "del", "key": ["guild", "user"]}
+
+Saving diffs the new data against the last persisted state and appends only
+the keys that changed, so a single warning or usage increment costs one short
+append instead of a whole-file rewrite. Loading replays the journal over the
+snapshot; a torn final line from a crash mid-append is cut off the file, so
+the next append starts on a line of its own.
+
+Compaction folds the journal into a fresh snapshot, written to a temp file and
+swapped in with ``os.replace`` so the snapshot is never seen half-written.
+"""
+
+import copy
+import json
+import logging
+import os
+import threading
+
+logger = logging.getLogger(__name__)
+
+# Journal entries after which a store is compacted on the next save
+JOURNAL_COMPACT_ENTRIES = int(os.getenv('JOURNAL_COMPACT_ENTRIES', '1000'))
+
+
+def _diff(old, new, depth, prefix=()):
+    """Yield journal entries turning ``old`` into ``new``, nesting ``depth`` levels deep"""
+    for key in old:
+        if key not in new:
+            yield {'op': 'del', 'key': [*prefix, key]}
+    for key, value in new.items():
+        if key not in old:
+            yield {'op': 'set', 'key': [*prefix, key], 'value': value}
+        elif depth > 1 and isinstance(value, dict) and isinstance(old[key], dict):
+            yield from _diff(old[key], value, depth - 1, (*prefix, key))
+        elif old[key] != value:
+            yield {'op': 'set', 'key': [*prefix, key], 'value': value}
+
+
+def _apply(data, entry):
+    """Apply one journal entry to ``data`` in place"""
+    *parents, last = entry['key']
+    target = data
+    for key in parents:
+        target = target.setdefault(key, {})
+    if entry['op'] == 'set':
+        target[last] = entry['value']
+    else:
+        target.pop(last, None)
+
+
+class JsonJournal:
+    """Snapshot + append-only journal storage for the JSON fallback files"""
+
+    def __init__(self, compact_entries=JOURNAL_COMPACT_ENTRIES):
+        self.compact_entries = compact_entries
+        # path -> last persisted data (private copy) and journal length
+        self._state = {}
+        self._entries = {}
+        self._lock = threading.RLock()
+
+    @staticmethod
+    def _log_path(path):
+        return f"{path}.log"
+
+    def _read(self, path):
+        """Replay snapshot + journal from disk. Raises FileNotFoundError if neither exists."""
+        log_path = self._log_path(path)
+        has_snapshot = os.path.exists(path)
+        if not has_snapshot and not os.path.exists(log_path):
+            raise FileNotFoundError(path)
+
+        data = {}
+        if has_snapshot:
+            with open(path, 'r') as f:
+                data = json.load(f)
+
+        entries = 0
+        if os.path.exists(log_path):
+            with open(log_path, 'rb+') as f:
+                complete = 0  # Bytes up to the end of the last whole line
+                for line_number, line in enumerate(f, 1):
+                    if not line.endswith(b'\n'):
+                        # Appends always end in a newline, so this is a torn
+                        # write; appending onto it would tear the next entry too
+                        logger.warning(f"[Journal] {log_path}: Truncating torn final line {line_number}")
+                        f.truncate(complete)
+                        break
+                    complete += len(line)
+                    try:
+                        entry = json.loads(line)
+                    except ValueError:
+                        logger.warning(f"[Journal] {log_path}: Skipping unreadable line {line_number} (likely a torn write)")
+                        continue
+                    _apply(data, entry)
+                    entries += 1
+        return data, entries
+
+    def _ensure_loaded(self, path):
+        """Load a store into memory, treating a missing store as empty"""
+        if path not in self._state:
+            try:
+                self._state[path], self._entries[path] = self._read(path)
+            except FileNotFoundError:
+                self._state[path], self._entries[path] = {}, 0
+        return self._state[path]
+
+    def _append(self, path, entries):
+        with open(self._log_path(path), 'a') as f:
+            f.write(''.join(json.dumps(entry) + '\n' for entry in entries))
+            f.flush()
+        self._entries[path] += len(entries)
+
+    def load(self, path):
+        """
+        Return the current contents of a store.
+
+        The result is a copy; callers may mutate it and pass it to save().
+
+        Raises:
+            FileNotFoundError: Neither the snapshot nor the journal exists
+        """
+        with self._lock:
+            if path not in self._state:
+                self._state[path], self._entries[path] = self._read(path)
+            return copy.deepcopy(self._state[path])
+
+    def save(self, path, data, depth=1):
+        """
+        Persist ``data`` by appending the changes since the last save.
+
+        Args:
+            path (str): Snapshot file name
+            data (dict): Full new contents of the store
+            depth (int): Nesting levels diffed key-by-key (2 for guild -> user maps)
+
+        Returns:
+            int: Journal entries appended
+        """
+        with self._lock:
+            try:
+                state = self._ensure_loaded(path)
+            except ValueError as e:
+                # Unreadable snapshot: replace it outright rather than
+                # journaling on top of it
+                logger.warning(f"[Journal] {path}: Snapshot unreadable, rewriting: {type(e).__name__}: {e}")
+                self._write_snapshot(path, data)
+                if os.path.exists(self._log_path(path)):
+                    os.remove(self._log_path(path))
+                self._state[path], self._entries[path] = copy.deepcopy(data), 0
+                return 0
+
+            entries = list(_diff(state, data, depth))
+            if not entries:
+                return 0
+
+            self._append(path, entries)
+            self._state[path] = copy.deepcopy(data)
+            if self._entries[path] >= self.compact_entries:
+                self.compact(path)
+            return len(entries)
+
+    def get_items(self, path, keys):
+        """Return copies of the given top-level entries (missing keys are omitted)"""
+        with self._lock:
+            state = self._ensure_loaded(path)
+            return {key: copy.deepcopy(state[key]) for key in keys if key in state}
+
+    def set_items(self, path, items):
+        """
+        Append 'set' entries for some top-level keys without diffing the whole store.
+
+        Returns:
+            int: Journal entries appended
+        """
+        with self._lock:
+            state = self._ensure_loaded(path)
+            entries = [{'op': 'set', 'key': [key], 'value': value} for key, value in items.items()]
+            if not entries:
+                return 0
+
+            self._append(path, entries)
+            for key, value in items.items():
+                state[key] = copy.deepcopy(value)
+            if self._entries[path] >= self.compact_entries:
+                self.compact(path)
+            return len(entries)
+
+    def delete_items(self, path, keys):
+        """
+        Append 'del' entries for some top-level keys without diffing the whole store.
+
+        Returns:
+            int: Journal entries appended
+        """
+        with self._lock:
+            state = self._ensure_loaded(path)
+            entries = [{'op': 'del', 'key': [key]} for key in keys if key in state]
+            if not entries:
+                return 0
+
+            self._append(path, entries)
+            for entry in entries:
+                state.pop(entry['key'][0], None)
+            if self._entries[path] >= self.compact_entries:
+                self.compact(path)
+            return len(entries)
+
+    def _write_snapshot(self, path, data):
+        temp_path = f"{path}.tmp"
+        with open(temp_path, 'w') as f:
+            json.dump(data, f)
+            f.flush()
+            os.fsync(f.fileno())
+        os.replace(temp_path, path)
+
+    def compact(self, path):
+        """Fold a store's journal into a new snapshot. Returns True if anything was compacted."""
+        with self._lock:
+            log_path = self._log_path(path)
+            if not os.path.exists(log_path):
+                return False
+            self._write_snapshot(path, self._ensure_loaded(path))
+            # The snapshot already contains every journaled change; a crash
+            # before this remove just replays them onto it again (idempotent)
+            os.remove(log_path)
+            entries = self._entries[path]
+            self._entries[path] = 0
+            logger.debug(f"[Journal] {path}: Compacted {entries} entries into snapshot")
+            return True
+
+    def compact_all(self):
+        """Compact every store with a non-empty journal. Returns the number compacted."""
+        with self._lock:
+            paths = [path for path, entries in self._entries.items() if entries]
+            compacted = 0
+            for path in paths:
+                try:
+                    if self.compact(path):
+                        compacted += 1
+                except Exception as e:
+                    logger.error(f"[Journal] {path}: Compaction failed: {type(e).__name__}: {e}")
+            return compacted
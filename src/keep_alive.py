@@ -1,6 +1,8 @@
-from flask import Flask
+from flask import Flask, jsonify
 from threading import Thread
 import os
+import warmup
+from utils.request_scheduler import request_scheduler
 
 app = Flask('')
 
@@ -51,7 +53,7 @@ def home():
 
 @app.route('/health')
 def health():
-    return "OK", 200
+    return jsonify(status="OK", warmup=warmup.status, scheduler=request_scheduler.stats()), 200
 
 def run():
     port = int(os.environ.get('PORT', 8080))
@@ -0,0 +1,123 @@
+"""
+Dirty-tracking repositories for BotDatabase's keyed Supabase tables.
+
+Each repository remembers what was last loaded from or written to its table,
+so a save of the full dict turns into upserts for just the added/changed keys
+and deletes for just the removed ones. Nothing is deleted wholesale, so the
+table is never empty between a delete and a reinsert.
+
+The remembered state doubles as the in-memory read cache: once a table has
+been loaded, later loads are served from it without a round-trip. Values are
+kept as canonical JSON strings, so every load hands out a fresh copy and
+callers are free to mutate it without disturbing the comparison baseline.
+"""
+
+import json
+
+
+class KeyedRepository:
+    """
+    Change tracking for a table of JSON values keyed by one or more text columns.
+
+    Values live in ``value_column`` unless ``encode``/``decode`` are given, in
+    which case each value is spread over its own columns: ``encode(value)``
+    returns the non-key columns of a row and ``decode(row)`` rebuilds the value.
+    """
+
+    def __init__(self, table, key_columns, value_column, encode=None, decode=None):
+        self.table = table
+        self.key_columns = key_columns
+        self.value_column = value_column
+        self.encode = encode
+        self.decode = decode
+        # key tuple -> serialized value, or None until first load/save
+        self._persisted = None
+
+    @property
+    def on_conflict(self):
+        return ','.join(self.key_columns)
+
+    @property
+    def primed(self):
+        return self._persisted is not None
+
+    @staticmethod
+    def _serialize(value):
+        return json.dumps(value, sort_keys=True)
+
+    def _flatten(self, data):
+        """Yield (key tuple, value) pairs from the nested dict form"""
+        if len(self.key_columns) == 1:
+            for key, value in data.items():
+                yield (key,), value
+            return
+        for outer, inner in data.items():
+            for key, value in inner.items():
+                yield (outer, key), value
+
+    def from_rows(self, rows):
+        """Build the nested dict form (e.g. guild_id -> user_id -> value) from table rows"""
+        data = {}
+        for row in rows:
+            *parents, last = (row[column] for column in self.key_columns)
+            target = data
+            for key in parents:
+                target = target.setdefault(key, {})
+            target[last] = self.decode(row) if self.decode else row[self.value_column]
+        return data
+
+    def snapshot(self):
+        """Fresh copy of the last persisted data in nested dict form"""
+        data = {}
+        for key, serialized in self._persisted.items():
+            *parents, last = key
+            target = data
+            for part in parents:
+                target = target.setdefault(part, {})
+            target[last] = json.loads(serialized)
+        return data
+
+    def changes(self, data):
+        """
+        Diff ``data`` against the last persisted state.
+
+        Returns:
+            tuple: (rows to upsert, key tuples to delete)
+        """
+        persisted = self._persisted or {}
+        current = {}
+        upserts = []
+        for key, value in self._flatten(data):
+            serialized = self._serialize(value)
+            current[key] = serialized
+            if persisted.get(key) != serialized:
+                upserts.append(self.to_row(key, value))
+        deletes = [key for key in persisted if key not in current]
+        return upserts, deletes
+
+    def to_row(self, key, value):
+        """The table row for one key tuple and value"""
+        row = dict(zip(self.key_columns, key))
+        if self.encode:
+            row.update(self.encode(value))
+        else:
+            row[self.value_column] = value
+        return row
+
+    def mark_row_persisted(self, key, value):
+        """Record a single-row write (no-op until the baseline is primed)"""
+        if self._persisted is not None:
+            self._persisted[key] = self._serialize(value)
+
+    def mark_row_deleted(self, key):
+        """Record a single-row delete (no-op until the baseline is primed)"""
+        if self._persisted is not None:
+            self._persisted.pop(key, None)
+
+    def mark_persisted(self, data):
+        """Record ``data`` as what the table now holds"""
+        self._persisted = {key: self._serialize(value) for key, value in self._flatten(data)}
+
+    def invalidate(self):
+        """Forget the baseline (e.g. after a partial write); the next save re-reads the table"""
+        self._persisted = None
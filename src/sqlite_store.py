@@ -0,0 +1,256 @@
+"""
+Embedded SQLite storage for BotDatabase (DATABASE_BACKEND=sqlite).
+
+Mirrors the tables in schema.sql so single-instance deployments and local
+testing get durable storage without a network round-trip. The database runs
+in WAL mode; saves only touch rows that actually changed, and point lookups
+go through the primary-key indexes.
+
+Response usage for every pool lives in the unified response_usage table, the
+same layout as USAGE_STORAGE=unified on Supabase.
+"""
+
+import json
+import sqlite3
+import threading
+
+SCHEMA = """
+CREATE TABLE IF NOT EXISTS reaction_roles (
+    message_id TEXT PRIMARY KEY,
+    data TEXT NOT NULL,
+    created_at TEXT DEFAULT CURRENT_TIMESTAMP
+);
+
+CREATE TABLE IF NOT EXISTS warnings (
+    guild_id TEXT NOT NULL,
+    user_id TEXT NOT NULL,
+    warnings TEXT NOT NULL,
+    created_at TEXT DEFAULT CURRENT_TIMESTAMP,
+    updated_at TEXT DEFAULT CURRENT_TIMESTAMP,
+    PRIMARY KEY (guild_id, user_id)
+);
+
+CREATE TABLE IF NOT EXISTS suggestions (
+    message_id TEXT PRIMARY KEY,
+    data TEXT NOT NULL,
+    created_at TEXT DEFAULT CURRENT_TIMESTAMP
+);
+
+CREATE TABLE IF NOT EXISTS prebans (
+    guild_id TEXT NOT NULL,
+    user_id TEXT NOT NULL,
+    data TEXT NOT NULL,
+    created_at TEXT DEFAULT CURRENT_TIMESTAMP,
+    PRIMARY KEY (guild_id, user_id)
+);
+
+CREATE TABLE IF NOT EXISTS task_state (
+    name TEXT PRIMARY KEY,
+    data TEXT NOT NULL,
+    updated_at TEXT DEFAULT CURRENT_TIMESTAMP
+);
+
+CREATE TABLE IF NOT EXISTS response_usage (
+    pool TEXT NOT NULL,
+    response_id TEXT NOT NULL,
+    response_text TEXT NOT NULL,
+    usage_count INTEGER NOT NULL DEFAULT 0,
+    last_used TEXT,
+    created_at TEXT DEFAULT CURRENT_TIMESTAMP,
+    updated_at TEXT DEFAULT CURRENT_TIMESTAMP,
+    PRIMARY KEY (pool, response_id)
+);
+"""
+
+
+class SQLiteStore:
+    """Thread-safe SQLite storage with the same data shapes as BotDatabase"""
+
+    def __init__(self, path):
+        self.path = path
+        # One shared connection; the lock serialises access from the
+        # AsyncBotDatabase worker threads
+        self._lock = threading.Lock()
+        self._conn = sqlite3.connect(path, check_same_thread=False)
+        self._conn.row_factory = sqlite3.Row
+        self._conn.execute('PRAGMA journal_mode=WAL')
+        self._conn.execute('PRAGMA synchronous=NORMAL')
+        self._conn.executescript(SCHEMA)
+
+    def close(self):
+        with self._lock:
+            self._conn.close()
+
+    def _query(self, sql, params=()):
+        with self._lock:
+            return self._conn.execute(sql, params).fetchall()
+
+    def _sync_rows(self, table, key_columns, value_columns, rows, scope=None):
+        """
+        Make a table (or the scoped part of it) match ``rows``.
+
+        Only new or changed rows are written and only vanished keys are
+        deleted, all inside one transaction.
+
+        Args:
+            rows (dict): key tuple -> value tuple
+            scope (tuple): Optional (column, value) restricting the sync
+
+        Returns:
+            tuple: (rows written, rows deleted)
+        """
+        where = f" WHERE {scope[0]} = ?" if scope else ""
+        where_params = (scope[1],) if scope else ()
+        columns = key_columns + value_columns
+        placeholders = ', '.join('?' for _ in columns)
+        updates = ', '.join(f"{column} = excluded.{column}" for column in value_columns)
+        changed = ' OR '.join(f"{column} IS NOT excluded.{column}" for column in value_columns)
+        upsert_sql = (
+            f"INSERT INTO {table} ({', '.join(columns)}) VALUES ({placeholders}) "
+            f"ON CONFLICT ({', '.join(key_columns)}) DO UPDATE SET {updates} WHERE {changed}"
+        )
+        key_match = ' AND '.join(f"{column} = ?" for column in key_columns)
+
+        with self._lock, self._conn:
+            existing = {
+                tuple(row) for row in
+                self._conn.execute(f"SELECT {', '.join(key_columns)} FROM {table}{where}", where_params)
+            }
+            before = self._conn.total_changes
+            self._conn.executemany(upsert_sql, [key + values for key, values in rows.items()])
+            written = self._conn.total_changes - before
+
+            removed = [key for key in existing if key not in rows]
+            self._conn.executemany(f"DELETE FROM {table} WHERE {key_match}", removed)
+        return written, len(removed)
+
+    # -------------------------------------------------------------------------
+    # Keyed JSON tables
+    # -------------------------------------------------------------------------
+
+    def load_reaction_roles(self):
+        return {row['message_id']: json.loads(row['data']) for row in self._query("SELECT * FROM reaction_roles")}
+
+    def save_reaction_roles(self, data):
+        rows = {(message_id,): (json.dumps(msg_data),) for message_id, msg_data in data.items()}
+        return self._sync_rows('reaction_roles', ('message_id',), ('data',), rows)
+
+    def load_suggestions(self):
+        return {row['message_id']: json.loads(row['data']) for row in self._query("SELECT * FROM suggestions")}
+
+    def save_suggestions(self, data):
+        rows = {(message_id,): (json.dumps(suggestion),) for message_id, suggestion in data.items()}
+        return self._sync_rows('suggestions', ('message_id',), ('data',), rows)
+
+    def save_suggestion(self, message_id, suggestion):
+        """Insert or update a single wish"""
+        with self._lock, self._conn:
+            self._conn.execute(
+                "INSERT INTO suggestions (message_id, data) VALUES (?, ?) "
+                "ON CONFLICT (message_id) DO UPDATE SET data = excluded.data",
+                (message_id, json.dumps(suggestion))
+            )
+
+    def delete_suggestion(self, message_id):
+        """Delete a single wish. Returns True if it existed."""
+        with self._lock, self._conn:
+            return self._conn.execute("DELETE FROM suggestions WHERE message_id = ?", (message_id,)).rowcount > 0
+
+    def load_warnings(self):
+        warnings = {}
+        for row in self._query("SELECT * FROM warnings"):
+            warnings.setdefault(row['guild_id'], {})[row['user_id']] = json.loads(row['warnings'])
+        return warnings
+
+    def save_warnings(self, data):
+        rows = {
+            (guild_id, user_id): (json.dumps(user_warnings),)
+            for guild_id, guild_warnings in data.items()
+            for user_id, user_warnings in guild_warnings.items()
+        }
+        return self._sync_rows('warnings', ('guild_id', 'user_id'), ('warnings',), rows)
+
+    def load_prebans(self):
+        prebans = {}
+        for row in self._query("SELECT * FROM prebans"):
+            prebans.setdefault(row['guild_id'], {})[row['user_id']] = json.loads(row['data'])
+        return prebans
+
+    def save_prebans(self, data):
+        rows = {
+            (guild_id, user_id): (json.dumps(preban_data),)
+            for guild_id, guild_prebans in data.items()
+            for user_id, preban_data in guild_prebans.items()
+        }
+        return self._sync_rows('prebans', ('guild_id', 'user_id'), ('data',), rows)
+
+    def get_preban(self, guild_id, user_id):
+        rows = self._query("SELECT data FROM prebans WHERE guild_id = ? AND user_id = ?", (guild_id, user_id))
+        return json.loads(rows[0]['data']) if rows else None
+
+    def load_task_state(self, name):
+        rows = self._query("SELECT data FROM task_state WHERE name = ?", (name,))
+        return json.loads(rows[0]['data']) if rows else None
+
+    def save_task_state(self, name, data):
+        with self._lock, self._conn:
+            self._conn.execute(
+                "INSERT INTO task_state (name, data) VALUES (?, ?) "
+                "ON CONFLICT (name) DO UPDATE SET data = excluded.data, updated_at = CURRENT_TIMESTAMP",
+                (name, json.dumps(data))
+            )
+
+    # -------------------------------------------------------------------------
+    # Response usage
+    # -------------------------------------------------------------------------
+
+    @staticmethod
+    def _usage_entry(row):
+        return {'text': row['response_text'], 'usage_count': row['usage_count'], 'last_used': row['last_used']}
+
+    def load_usage(self, pool_name):
+        rows = self._query("SELECT * FROM response_usage WHERE pool = ?", (pool_name,))
+        return {row['response_id']: self._usage_entry(row) for row in rows}
+
+    def load_all_usage(self):
+        usage = {}
+        for row in self._query("SELECT * FROM response_usage"):
+            usage.setdefault(row['pool'], {})[row['response_id']] = self._usage_entry(row)
+        return usage
+
+    def save_usage(self, pool_name, data):
+        rows = {
+            (pool_name, response_id): (stats['text'], stats['usage_count'], stats['last_used'])
+            for response_id, stats in data.items()
+        }
+        return self._sync_rows(
+            'response_usage', ('pool', 'response_id'), ('response_text', 'usage_count', 'last_used'),
+            rows, scope=('pool', pool_name)
+        )
+
+    def apply_usage_deltas(self, pool_name, batch):
+        """Add usage deltas atomically; returns the stored count per id"""
+        with self._lock, self._conn:
+            self._conn.executemany(
+                "INSERT INTO response_usage (pool, response_id, response_text, usage_count, last_used) "
+                "VALUES (?, ?, ?, ?, ?) "
+                "ON CONFLICT (pool, response_id) DO UPDATE SET "
+                "usage_count = usage_count + excluded.usage_count, "
+                "response_text = excluded.response_text, "
+                "last_used = COALESCE(MAX(last_used, excluded.last_used), excluded.last_used, last_used), "
+                "updated_at = CURRENT_TIMESTAMP",
+                [(pool_name, row['id'], row['text'], row['delta'], row['last_used']) for row in batch]
+            )
+            counts = {}
+            ids = [row['id'] for row in batch]
+            # Stay under SQLite's bound-parameter limit on older builds
+            for start in range(0, len(ids), 500):
+                chunk = ids[start:start + 500]
+                placeholders = ', '.join('?' for _ in chunk)
+                for row in self._conn.execute(
+                    f"SELECT response_id, usage_count FROM response_usage "
+                    f"WHERE pool = ? AND response_id IN ({placeholders})",
+                    [pool_name] + chunk
+                ):
+                    counts[row['response_id']] = row['usage_count']
+        return counts
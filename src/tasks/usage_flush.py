@@ -0,0 +1,26 @@
+from discord.ext import tasks
+from config import USAGE_FLUSH_SECONDS, JOURNAL_COMPACT_MINUTES
+from database import adb
+
+
+class UsageFlushTasks:
+    """Background tasks that persist buffered usage counters and compact JSON journals"""
+
+    def __init__(self, bot):
+        self.bot = bot
+        self.flush_usage.start()
+        self.compact_json_storage.start()
+
+    def cog_unload(self):
+        self.flush_usage.cancel()
+        self.compact_json_storage.cancel()
+
+    @tasks.loop(seconds=USAGE_FLUSH_SECONDS)
+    async def flush_usage(self):
+        """Write pending usage increments in one batch per pool"""
+        await adb.flush_usage()
+
+    @tasks.loop(minutes=JOURNAL_COMPACT_MINUTES)
+    async def compact_json_storage(self):
+        """Fold JSON fallback journals into fresh snapshots"""
+        await adb.compact_json_storage()
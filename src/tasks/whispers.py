@@ -4,10 +4,10 @@ import random
 import asyncio
 from utils import zalgo_text
 from config import ELDRITCH_WHISPERS, ELDRITCH_WHISPER_HOURS, ELDRITCH_WHISPER_RANDOM_DELAY
-from database import load_whisper_usage, increment_whisper_usage
+from database import adb
 
 
-def select_weighted_whisper():
+async def select_weighted_whisper():
     """
     Select a whisper using weighted randomness that favors unselected whispers (ID-based).
 
@@ -19,7 +19,7 @@ def select_weighted_whisper():
 
     This makes it exponentially less likely to select frequently-used whispers.
     """
-    usage_data = load_whisper_usage()
+    usage_data = await adb.load_whisper_usage()
 
     # Calculate weights based on ID usage
     weights = []
@@ -32,7 +32,7 @@ def select_weighted_whisper():
 
     # Select whisper object and increment
     selected = random.choices(ELDRITCH_WHISPERS, weights=weights, k=1)[0]
-    increment_whisper_usage(selected["id"], selected["text"])
+    await adb.increment_whisper_usage(selected["id"], selected["text"])
 
     # Return just the text for display
     return selected["text"]
@@ -58,7 +58,7 @@ class WhisperTasks:
             channel = discord.utils.get(guild.text_channels, name='general-chat')
             if channel and channel.permissions_for(guild.me).send_messages:
                 # Use weighted selection that favors unselected whispers
-                message = select_weighted_whisper()
+                message = await select_weighted_whisper()
 
                 # Randomly choose zalgo intensity
                 intensity = random.choice(['medium', 'high', 'extreme'])
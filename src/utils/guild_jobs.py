@@ -0,0 +1,60 @@
+import asyncio
+import logging
+import time
+from config.settings import GUILD_JOB_CONCURRENCY, GUILD_JOB_TIMEOUT_SECONDS
+
+logger = logging.getLogger(__name__)
+
+
+async def run_per_guild(name, guilds, job, concurrency=GUILD_JOB_CONCURRENCY, timeout=GUILD_JOB_TIMEOUT_SECONDS):
+    """
+    Run a coroutine for every guild in a bounded task group.
+
+    At most ``concurrency`` guilds run at once and each gets ``timeout``
+    seconds, so one slow or failing guild doesn't hold up or abort the
+    others. A summary of per-guild durations is logged when all are done.
+
+    Args:
+        name (str): Job name for the log summary
+        guilds (iterable): Guilds to process
+        job: Coroutine function called as ``await job(guild)``
+        concurrency (int): Maximum guilds in flight
+        timeout (float): Seconds allowed per guild
+
+    Returns:
+        dict: guild id -> {'seconds': float, 'result': job result, 'error': str or None}
+    """
+    semaphore = asyncio.Semaphore(concurrency)
+    results = {}
+    started = time.perf_counter()
+
+    async def run_guild(guild):
+        async with semaphore:
+            guild_started = time.perf_counter()
+            result, error = None, None
+            try:
+                async with asyncio.timeout(timeout):
+                    result = await job(guild)
+            except TimeoutError:
+                error = f"timed out after {timeout}s"
+            except Exception as e:
+                error = f"{type(e).__name__}: {e}"
+            elapsed = time.perf_counter() - guild_started
+            if error:
+                logger.warning(f"[GuildJobs] {name}: {guild.name} ({guild.id}) failed: {error}")
+            results[guild.id] = {'seconds': elapsed, 'result': result, 'error': error}
+
+    # Failures are caught per guild, so the task group never cancels siblings
+    async with asyncio.TaskGroup() as group:
+        for guild in guilds:
+            group.create_task(run_guild(guild))
+
+    total = time.perf_counter() - started
+    failed = sum(1 for outcome in results.values() if outcome['error'])
+    slowest = sorted(((outcome['seconds'], guild_id) for guild_id, outcome in results.items()), reverse=True)[:5]
+    logger.info(
+        f"[GuildJobs] {name}: {len(results) - failed}/{len(results)} guilds in {total:.2f}s "
+        f"(concurrency {concurrency}); slowest: "
+        + (', '.join(f"{guild_id} {seconds:.2f}s" for seconds, guild_id in slowest) or 'none')
+    )
+    return results
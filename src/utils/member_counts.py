@@ -0,0 +1,48 @@
+class HumanMemberCounter:
+    """
+    Per-guild count of non-bot members.
+
+    Counted once per guild from guild.members (on ready, or lazily on first
+    use) and then kept current from member join, remove and update events,
+    so threshold checks don't rescan the member list on every vote.
+    """
+
+    def __init__(self):
+        self._counts = {}
+
+    def build(self, guilds):
+        """(Re)count the given guilds"""
+        for guild in guilds:
+            self._counts[guild.id] = sum(1 for member in guild.members if not member.bot)
+
+    def invalidate(self, guild_id):
+        self._counts.pop(guild_id, None)
+
+    def count(self, guild):
+        """Number of non-bot members in a guild"""
+        count = self._counts.get(guild.id)
+        if count is None:
+            self.build([guild])
+            count = self._counts[guild.id]
+        return count
+
+    def _adjust(self, guild_id, delta):
+        # Guilds not counted yet pick the change up when they're first counted
+        if guild_id in self._counts:
+            self._counts[guild_id] = max(0, self._counts[guild_id] + delta)
+
+    def member_joined(self, member):
+        if not member.bot:
+            self._adjust(member.guild.id, 1)
+
+    def member_removed(self, member):
+        if not member.bot:
+            self._adjust(member.guild.id, -1)
+
+    def member_updated(self, before, after):
+        if before.bot != after.bot:
+            self._adjust(after.guild.id, -1 if after.bot else 1)
+
+
+# Shared by every cog that needs a guild's human member count
+human_member_counts = HumanMemberCounter()
@@ -0,0 +1,63 @@
+from config.constants import COLOR_ROLES, EXOTIC_COLORS, SPECIAL_ROLES, PRONOUN_ROLES, DREAMER_ROLE
+
+# Emoji -> role name for each reaction-role message type
+REACTION_ROLE_MAPS = {
+    'verify': {'✅': DREAMER_ROLE},
+    'color': COLOR_ROLES,
+    'exotic': EXOTIC_COLORS,
+    'special': SPECIAL_ROLES,
+    'pronouns': PRONOUN_ROLES,
+}
+
+
+class ReactionRoleIndex:
+    """
+    In-memory index of reaction-role messages: message_id -> emoji -> role.
+
+    Reaction handlers check it before doing any I/O, so reactions on ordinary
+    messages (almost all of them) are dropped with a dict lookup. Built from
+    the stored reaction roles when the ReactionEvents cog loads (retried if
+    that load fails) and rebuilt whenever Roles.setup_roles saves new menus.
+    """
+
+    def __init__(self):
+        # message_id (int) -> (message type, {emoji: role name})
+        self._messages = {}
+        # False until built from a successful load
+        self.loaded = False
+
+    def rebuild(self, reaction_data):
+        """Replace the index with the contents of a load_reaction_roles() dict"""
+        messages = {}
+        for message_id, msg_data in reaction_data.items():
+            role_map = REACTION_ROLE_MAPS.get(msg_data.get('type'))
+            if role_map is not None:
+                messages[int(message_id)] = (msg_data['type'], role_map)
+        self._messages = messages
+        self.loaded = True
+
+    def lookup(self, message_id, emoji):
+        """
+        Find the role a reaction maps to.
+
+        Returns:
+            tuple: (message type, role name), or None if the reaction isn't a role reaction
+        """
+        entry = self._messages.get(message_id)
+        if entry is None:
+            return None
+        message_type, role_map = entry
+        role_name = role_map.get(emoji)
+        if role_name is None:
+            return None
+        return message_type, role_name
+
+    def __contains__(self, message_id):
+        return message_id in self._messages
+
+    def __len__(self):
+        return len(self._messages)
+
+
+# Shared by the ReactionEvents and Roles cogs
+reaction_role_index = ReactionRoleIndex()
@@ -0,0 +1,143 @@
+import asyncio
+import contextvars
+import logging
+import threading
+import time
+import aiohttp
+
+logger = logging.getLogger(__name__)
+
+# Logical route of the request currently being sent from this task
+_current_route = contextvars.ContextVar('dreambot_request_route', default=None)
+
+
+class _Bucket:
+    """Latest rate-limit headers seen for one logical route"""
+
+    __slots__ = ('name', 'limit', 'remaining', 'reset_at', 'lock', 'queued')
+
+    def __init__(self):
+        self.name = None
+        self.limit = None
+        self.remaining = None
+        self.reset_at = 0.0
+        self.lock = asyncio.Lock()
+        self.queued = 0
+
+
+class RequestScheduler:
+    """
+    Paces bulk Discord requests by the rate-limit headers Discord returns.
+
+    Callers tag requests with a logical route (e.g. ``('reactions', channel_id)``)
+    and run them through ``run()``. Every response's X-RateLimit-* headers are
+    captured via an aiohttp trace hook on the bot's HTTP session and recorded
+    against the route of the task that sent it. Requests on a route go out
+    back to back while the bucket has capacity and only wait - until the
+    bucket's reset - once it is exhausted, so bursts run at the speed Discord
+    allows instead of behind fixed sleeps. discord.py's own bucket handling
+    still applies underneath.
+    """
+
+    def __init__(self):
+        self._buckets = {}
+        # stats() is called from keep_alive's Flask thread while the event
+        # loop adds buckets; it copies the dict under this lock
+        self._buckets_lock = threading.Lock()
+        self.requests = 0
+        self.waits = 0
+        self.wait_seconds = 0.0
+        self.rate_limited = 0
+
+    def trace_config(self):
+        """aiohttp TraceConfig to pass to the bot as ``http_trace``"""
+        trace = aiohttp.TraceConfig()
+        trace.on_request_end.append(self._on_request_end)
+        return trace
+
+    async def _on_request_end(self, session, context, params):
+        route = _current_route.get()
+        if route is None:
+            return
+        self.record(route, params.response.status, params.response.headers)
+
+    def record(self, route, status, headers):
+        """Update a route's bucket from a response's rate-limit headers"""
+        bucket = self._bucket(route)
+        if status == 429:
+            self.rate_limited += 1
+        if 'X-RateLimit-Remaining' not in headers:
+            return
+        bucket.name = headers.get('X-RateLimit-Bucket', bucket.name)
+        bucket.limit = int(headers.get('X-RateLimit-Limit', 1))
+        bucket.remaining = int(headers['X-RateLimit-Remaining'])
+        bucket.reset_at = time.monotonic() + float(headers.get('X-RateLimit-Reset-After', 0))
+
+    def _bucket(self, route):
+        bucket = self._buckets.get(route)
+        if bucket is None:
+            with self._buckets_lock:
+                bucket = self._buckets[route] = _Bucket()
+        return bucket
+
+    async def run(self, route, request):
+        """
+        Send a request on a route as soon as its bucket allows.
+
+        Requests on the same route are sent in call order.
+
+        Args:
+            route (hashable): Logical route, e.g. ('roles', guild_id)
+            request (callable): Zero-argument function returning the awaitable to send
+
+        Returns:
+            The awaited request's result
+        """
+        bucket = self._bucket(route)
+        bucket.queued += 1
+        try:
+            async with bucket.lock:
+                if bucket.remaining == 0:
+                    delay = bucket.reset_at - time.monotonic()
+                    if delay > 0:
+                        self.waits += 1
+                        self.wait_seconds += delay
+                        logger.debug(f"[Scheduler] {route}: Bucket exhausted, waiting {delay:.2f}s")
+                        await asyncio.sleep(delay)
+                    bucket.remaining = None
+
+                self.requests += 1
+                token = _current_route.set(route)
+                try:
+                    return await request()
+                finally:
+                    _current_route.reset(token)
+        finally:
+            bucket.queued -= 1
+
+    def stats(self):
+        """Queue depth, waiting and bucket state for monitoring (safe from other threads)"""
+        with self._buckets_lock:
+            buckets = list(self._buckets.items())
+        now = time.monotonic()
+        return {
+            'queued': sum(bucket.queued for _, bucket in buckets),
+            'requests': self.requests,
+            'waits': self.waits,
+            'wait_seconds': round(self.wait_seconds, 3),
+            'rate_limited': self.rate_limited,
+            'buckets': {
+                str(route): {
+                    'bucket': bucket.name,
+                    'limit': bucket.limit,
+                    'remaining': bucket.remaining,
+                    'reset_in': round(max(bucket.reset_at - now, 0.0), 3),
+                    'queued': bucket.queued,
+                }
+                for route, bucket in buckets
+            },
+        }
+
+
+# Shared by every cog that sends bulk requests; hooked into the bot's HTTP session
+request_scheduler = RequestScheduler()
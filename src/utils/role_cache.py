@@ -0,0 +1,56 @@
+from config.constants import COLOR_ROLES, EXOTIC_COLORS
+
+COLOR_ROLE_NAMES = frozenset(COLOR_ROLES.values()) | frozenset(EXOTIC_COLORS.values())
+
+
+class _GuildRoles:
+    """Role lookups for one guild, built from a single pass over guild.roles"""
+
+    def __init__(self, guild):
+        self.by_id = {role.id: role for role in guild.roles}
+        self.by_name = {}
+        for role in guild.roles:
+            # Keep the first role with a given name, as discord.utils.get would
+            self.by_name.setdefault(role.name, role)
+        self.color_role_ids = frozenset(
+            role.id for name, role in self.by_name.items() if name in COLOR_ROLE_NAMES
+        )
+
+
+class GuildRoleCache:
+    """
+    Per-guild name -> Role lookups and colour-role lists.
+
+    Replaces linear scans of guild.roles in the reaction-role handlers. Built
+    for every guild on ready (and lazily for guilds joined later), and dropped
+    for a guild whenever one of its roles is created, updated or deleted.
+    """
+
+    def __init__(self):
+        self._guilds = {}
+
+    def _get(self, guild):
+        roles = self._guilds.get(guild.id)
+        if roles is None:
+            roles = self._guilds[guild.id] = _GuildRoles(guild)
+        return roles
+
+    def build(self, guilds):
+        """(Re)build the cache for the given guilds"""
+        for guild in guilds:
+            self._guilds[guild.id] = _GuildRoles(guild)
+
+    def invalidate(self, guild_id):
+        self._guilds.pop(guild_id, None)
+
+    def get_by_name(self, guild, name):
+        return self._get(guild).by_name.get(name)
+
+    def color_roles(self, guild):
+        """Every colour role (COLOR_ROLES + EXOTIC_COLORS) that exists in the guild"""
+        roles = self._get(guild)
+        return [roles.by_id[role_id] for role_id in roles.color_role_ids]
+
+
+# Shared by every cog that resolves roles by name
+guild_role_cache = GuildRoleCache()
@@ -0,0 +1,129 @@
+import logging
+import discord
+from config.constants import COLOR_ROLES, EXOTIC_COLORS, SPECIAL_ROLES, PRONOUN_ROLES
+from utils.role_cache import guild_role_cache
+from utils.request_scheduler import request_scheduler
+
+logger = logging.getLogger(__name__)
+
+# Discord allows at most 25 options per select menu
+MAX_SELECT_OPTIONS = 25
+
+# group -> (emoji -> role name, placeholder, exclusive)
+# 'color' and 'exotic' are one exclusive group split across two selects
+# because together they exceed MAX_SELECT_OPTIONS.
+PICKER_GROUPS = {
+    'color': (COLOR_ROLES, "🎨 Choose your essence...", True),
+    'exotic': (EXOTIC_COLORS, "🌌 ...or an exotic essence", True),
+    'special': (SPECIAL_ROLES, "✨ Choose your craft", False),
+    'pronouns': (PRONOUN_ROLES, "🏳️‍🌈 Choose your pronouns", False),
+}
+
+CUSTOM_ID_PREFIX = 'dreambot:role_picker:'
+
+
+def managed_role_names(group, selected=True):
+    """
+    Role names a selection in this group replaces.
+
+    Picking a role in an exclusive group replaces the roles of every select
+    sharing it; clearing a select (``selected`` false) only removes that
+    select's own options, so clearing the exotic colour keeps a primary one.
+    """
+    if selected and PICKER_GROUPS[group][2]:
+        return {
+            name for role_map, _, exclusive in PICKER_GROUPS.values() if exclusive
+            for name in role_map.values()
+        }
+    return set(PICKER_GROUPS[group][0].values())
+
+
+def resolve_selection(member, group, selected):
+    """
+    Compute a member's full role list after picking ``selected`` in a group.
+
+    Roles the group manages are replaced by the selection; every other role
+    the member holds is kept.
+
+    Returns:
+        tuple: (roles to set, whether they differ from the current roles, selected role names missing from the guild)
+    """
+    guild = member.guild
+    managed = managed_role_names(group, bool(selected))
+    current = {role.id: role for role in member.roles}
+    wanted = {role_id: role for role_id, role in current.items() if role.name not in managed}
+
+    missing = []
+    for name in selected:
+        role = guild_role_cache.get_by_name(guild, name)
+        if role is None:
+            missing.append(name)
+        else:
+            wanted[role.id] = role
+
+    return list(wanted.values()), wanted.keys() != current.keys(), missing
+
+
+class RoleSelect(discord.ui.Select):
+    """One group's select menu; each submission becomes a single member.edit"""
+
+    def __init__(self, group):
+        role_map, placeholder, exclusive = PICKER_GROUPS[group]
+        super().__init__(
+            custom_id=f"{CUSTOM_ID_PREFIX}{group}",
+            placeholder=placeholder,
+            min_values=0,
+            max_values=1 if exclusive else len(role_map),
+            options=[
+                discord.SelectOption(label=role_name, value=role_name, emoji=emoji)
+                for emoji, role_name in role_map.items()
+            ]
+        )
+        self.group = group
+
+    async def callback(self, interaction):
+        member = interaction.user
+        if interaction.guild is None or not isinstance(member, discord.Member):
+            return
+
+        # Ack first: the edit may wait on the guild's member-role bucket
+        await interaction.response.defer(ephemeral=True, thinking=True)
+
+        roles, changed, missing = resolve_selection(member, self.group, self.values)
+        if changed:
+            try:
+                await request_scheduler.run(
+                    ('member_roles', member.guild.id),
+                    lambda: member.edit(roles=roles, reason="Role picker")
+                )
+            except discord.HTTPException as e:
+                logger.warning(f"[RolePicker] Role edit failed for member {member.id}: {e}")
+                await interaction.followup.send(embed=discord.Embed(
+                    description="❌ The pattern resisted... your roles could not be changed.",
+                    color=discord.Color.red()
+                ), ephemeral=True)
+                return
+
+        description = "✨ Your roles have been woven anew." if changed else "Your roles already match your wish."
+        if missing:
+            description += f"\n\n⚠️ Not found on this server: {', '.join(missing)}"
+        await interaction.followup.send(embed=discord.Embed(
+            description=description,
+            color=discord.Color.purple()
+        ), ephemeral=True)
+
+
+class RolePickerView(discord.ui.View):
+    """
+    Persistent select-menu role picker.
+
+    A lower-cost alternative to reaction roles: one interaction is one
+    member.edit, with no reactions to add, track or remove. Custom ids are
+    fixed, so registering a fresh instance with ``bot.add_view`` on startup
+    keeps every previously posted picker working across restarts.
+    """
+
+    def __init__(self):
+        super().__init__(timeout=None)
+        for group in PICKER_GROUPS:
+            self.add_item(RoleSelect(group))
@@ -0,0 +1,107 @@
+import asyncio
+import logging
+import discord
+from config.settings import ROLE_COALESCE_SECONDS
+from utils.request_scheduler import request_scheduler
+
+logger = logging.getLogger(__name__)
+
+
+class RoleMutationQueue:
+    """
+    Per-member queue that coalesces role changes into one member.edit call.
+
+    Changes requested within ROLE_COALESCE_SECONDS of a member's first pending
+    change are merged, last write wins per role, and applied together as a
+    single ``member.edit(roles=...)``. Someone clicking through several colour
+    emojis costs one API call instead of a remove/add pair per click, and the
+    final role set is whatever they picked last. Edits for the same member
+    never overlap, so they can't complete out of order.
+    """
+
+    def __init__(self, window=ROLE_COALESCE_SECONDS):
+        self.window = window
+        # (guild_id, member_id) -> {role_id: (role, wanted)}
+        self._pending = {}
+        self._members = {}
+        self._tasks = {}
+        self._locks = {}
+        self.edits = 0
+        self.requests = 0
+
+    def request(self, member, add=(), remove=()):
+        """
+        Queue role changes for a member.
+
+        Args:
+            member (discord.Member): Member to update
+            add (iterable): Roles the member should end up with
+            remove (iterable): Roles the member should end up without
+
+        Returns:
+            asyncio.Task: The pending edit for this member
+        """
+        key = (member.guild.id, member.id)
+        changes = self._pending.setdefault(key, {})
+        for role in remove:
+            changes[role.id] = (role, False)
+        for role in add:
+            changes[role.id] = (role, True)
+        self._members[key] = member
+        self.requests += 1
+
+        task = self._tasks.get(key)
+        if task is None or task.done():
+            task = self._tasks[key] = asyncio.create_task(self._apply_later(key))
+        return task
+
+    async def _apply_later(self, key):
+        await asyncio.sleep(self.window)
+        lock = self._locks.setdefault(key, asyncio.Lock())
+        try:
+            async with lock:
+                changes = self._pending.pop(key, {})
+                member = self._members.pop(key, None)
+                self._tasks.pop(key, None)
+                if member is None or not changes:
+                    return
+                await self._apply(member, changes)
+        finally:
+            # A later edit for this member registers its task before waiting on
+            # the lock, so with no task queued nothing else can be using it
+            if key not in self._tasks:
+                self._locks.pop(key, None)
+
+    async def _apply(self, member, changes):
+        current = {role.id: role for role in member.roles}
+        wanted = dict(current)
+        for role_id, (role, keep) in changes.items():
+            if keep:
+                wanted[role_id] = role
+            else:
+                wanted.pop(role_id, None)
+
+        if wanted.keys() == current.keys():
+            return
+
+        try:
+            roles = list(wanted.values())
+            await request_scheduler.run(
+                ('member_roles', member.guild.id),
+                lambda: member.edit(roles=roles, reason="Reaction roles")
+            )
+            self.edits += 1
+        except discord.Forbidden:
+            pass
+        except discord.HTTPException as e:
+            logger.warning(f"[RoleQueue] Role edit failed for member {member.id}: {e}")
+
+    async def drain(self):
+        """Wait for every pending edit to be applied"""
+        tasks = [task for task in self._tasks.values() if not task.done()]
+        if tasks:
+            await asyncio.gather(*tasks, return_exceptions=True)
+
+
+# Shared by the reaction-role handlers
+role_mutation_queue = RoleMutationQueue()
@@ -0,0 +1,89 @@
+import bisect
+import heapq
+from itertools import islice
+
+WISH_TYPES = ('video', 'channel', 'other')
+
+
+class SuggestionIndex:
+    """
+    In-memory leaderboards of wishes, partitioned by (guild_id, type).
+
+    Active wishes are kept sorted by votes (most first) and granted wishes by
+    granted_at, so top-N queries slice the front of one list instead of
+    filtering and sorting every wish. Maintained incrementally by the
+    Suggestions cog whenever a wish is created, voted on, granted or removed;
+    it stores only message ids, the wish data stays in the cog.
+    """
+
+    def __init__(self):
+        # (guild_id, type) -> sorted [(-votes, message_id)]
+        self._active = {}
+        # (guild_id, type) -> sorted [(granted_at, message_id)]
+        self._granted = {}
+        # message_id (str) -> (partition, key, item) as currently indexed
+        self._entries = {}
+
+    @staticmethod
+    def _entry(partitions, message_id, data):
+        active, granted = partitions
+        key = (data['guild_id'], data['type'])
+        status = data.get('status', 'active')
+        if status == 'active':
+            return active, key, (-data.get('votes', 0), int(message_id))
+        if status == 'granted':
+            return granted, key, (data.get('granted_at') or '', int(message_id))
+        return None
+
+    def rebuild(self, suggestions):
+        """Replace the index with the contents of a load_suggestions() dict"""
+        active, granted, entries = {}, {}, {}
+        for message_id, data in suggestions.items():
+            entry = self._entry((active, granted), message_id, data)
+            if entry is not None:
+                partition, key, item = entry
+                partition.setdefault(key, []).append(item)
+                entries[str(message_id)] = entry
+        for items in list(active.values()) + list(granted.values()):
+            items.sort()
+        self._active, self._granted, self._entries = active, granted, entries
+
+    def update(self, message_id, data):
+        """(Re)index a wish after it was created or its votes or status changed"""
+        self.remove(message_id)
+        entry = self._entry((self._active, self._granted), message_id, data)
+        if entry is not None:
+            partition, key, item = entry
+            bisect.insort(partition.setdefault(key, []), item)
+            self._entries[str(message_id)] = entry
+
+    def remove(self, message_id):
+        """Drop a wish from the index"""
+        entry = self._entries.pop(str(message_id), None)
+        if entry is None:
+            return
+        partition, key, item = entry
+        items = partition[key]
+        i = bisect.bisect_left(items, item)
+        if i < len(items) and items[i] == item:
+            del items[i]
+
+    def top(self, guild_id, wish_type, limit):
+        """Message ids of a guild's most-voted active wishes of a type"""
+        return [str(message_id) for _, message_id in self._active.get((guild_id, wish_type), [])[:limit]]
+
+    def granted(self, guild_id, wish_type=None, limit=10):
+        """Message ids of a guild's granted wishes, newest first (all types if wish_type is None)"""
+        types = [wish_type] if wish_type else WISH_TYPES
+        newest = heapq.merge(
+            *(reversed(self._granted.get((guild_id, t), [])) for t in types),
+            reverse=True
+        )
+        return [str(message_id) for _, message_id in islice(newest, limit)]
+
+    def __len__(self):
+        return len(self._entries)
+
+
+# Shared by the Suggestions cog
+suggestion_index = SuggestionIndex()
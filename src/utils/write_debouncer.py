@@ -0,0 +1,111 @@
+import asyncio
+import logging
+from config.settings import WISH_WRITE_DEBOUNCE_SECONDS, WISH_WRITE_MAX_DELAY_SECONDS
+
+logger = logging.getLogger(__name__)
+
+
+class DebouncedWriter:
+    """
+    Per-key debounce for persistence writes.
+
+    Updates to the same key are coalesced: the latest value is written once
+    the key has been quiet for ``window`` seconds, or at most ``max_delay``
+    seconds after its first unwritten update, so a steady burst can't hold a
+    write back indefinitely. Writes for the same key never overlap, and
+    ``flush()`` writes everything still pending (used on shutdown).
+    """
+
+    def __init__(self, write, window=WISH_WRITE_DEBOUNCE_SECONDS, max_delay=WISH_WRITE_MAX_DELAY_SECONDS):
+        """
+        Args:
+            write: Coroutine function called as ``await write(key, value)``
+            window (float): Quiet period before a key is written
+            max_delay (float): Upper bound on how long an update stays unwritten
+        """
+        self._write = write
+        self.window = window
+        self.max_delay = max_delay
+        # key -> [latest value, first update time, last update time]
+        self._pending = {}
+        self._tasks = {}
+        self._writing = set()
+        self._flushing = asyncio.Event()
+        self.writes = 0
+        self.requests = 0
+
+    def schedule(self, key, value):
+        """Queue the latest value for a key"""
+        now = asyncio.get_running_loop().time()
+        pending = self._pending.get(key)
+        if pending is None:
+            self._pending[key] = [value, now, now]
+        else:
+            pending[0] = value
+            pending[2] = now
+        self.requests += 1
+
+        task = self._tasks.get(key)
+        if task is None or task.done():
+            self._tasks[key] = asyncio.create_task(self._write_later(key))
+
+    def pending_count(self):
+        return len(self._pending)
+
+    async def _wait_until_due(self, key):
+        loop = asyncio.get_running_loop()
+        while key in self._pending and not self._flushing.is_set():
+            _, first, last = self._pending[key]
+            delay = min(last + self.window, first + self.max_delay) - loop.time()
+            if delay <= 0:
+                return
+            try:
+                await asyncio.wait_for(self._flushing.wait(), delay)
+            except asyncio.TimeoutError:
+                pass
+
+    async def _write_later(self, key):
+        try:
+            # Updates that arrive while a write is in flight are picked up by the next pass
+            while key in self._pending:
+                await self._wait_until_due(key)
+                if key not in self._pending:
+                    break
+                value = self._pending.pop(key)[0]
+                self._writing.add(key)
+                try:
+                    await self._write(key, value)
+                    self.writes += 1
+                except Exception as e:
+                    logger.warning(f"[DebouncedWriter] Write failed for {key}: {type(e).__name__}: {e}")
+                finally:
+                    self._writing.discard(key)
+        finally:
+            if self._tasks.get(key) is asyncio.current_task():
+                del self._tasks[key]
+
+    async def cancel(self, key):
+        """
+        Drop a key's pending value, e.g. before it is written or deleted directly.
+
+        Waits for a write already in flight so it can't land after the caller's.
+        """
+        self._pending.pop(key, None)
+        task = self._tasks.get(key)
+        if task is None:
+            return
+        if key in self._writing:
+            await asyncio.gather(task, return_exceptions=True)
+        else:
+            del self._tasks[key]
+            task.cancel()
+
+    async def flush(self):
+        """Write every pending value now and wait for the writes to finish"""
+        self._flushing.set()
+        try:
+            tasks = [task for task in self._tasks.values() if not task.done()]
+            if tasks:
+                await asyncio.gather(*tasks, return_exceptions=True)
+        finally:
+            self._flushing.clear()
@@ -0,0 +1,102 @@
+"""
+Startup warm-up: preload persistent state before the bot starts answering.
+
+DreambotClient.setup_hook awaits warm_up() before the gateway connects, so the
+first mention after a deploy is served from hot caches instead of paying for
+several cold table loads. Loads run concurrently on the database thread pool,
+bounded by WARMUP_CONCURRENCY. Progress is published in ``status`` for the
+keep-alive /health endpoint.
+"""
+
+import asyncio
+import logging
+import os
+import time
+from datetime import datetime, timezone
+
+logger = logging.getLogger(__name__)
+
+# Loads in flight at once (the database executor has DB_EXECUTOR_WORKERS threads)
+WARMUP_CONCURRENCY = int(os.getenv('WARMUP_CONCURRENCY', '4'))
+
+# Read by keep_alive's /health endpoint (from the Flask thread)
+status = {
+    'state': 'pending',  # pending -> running -> ready
+    'started_at': None,
+    'finished_at': None,
+    'duration_seconds': None,
+    'steps': {},
+    'failed': [],  # steps whose load raised; those stores load lazily later
+}
+
+
+def _warmup_steps(adb, pool_names):
+    """
+    (name, coroutine factory) pairs covering every persistent store.
+
+    The loaders run strict, so a failed read raises and is reported as a
+    failed step instead of an empty store counted as loaded.
+    """
+    steps = [
+        ('reaction_roles', lambda: adb.load_reaction_roles(strict=True)),
+        ('prebans', lambda: adb.load_prebans(strict=True)),
+        ('warnings', lambda: adb.load_warnings(strict=True)),
+        ('suggestions', lambda: adb.load_suggestions(strict=True)),
+    ]
+    if adb.database.batched_usage_load:
+        steps.append(('usage', lambda: adb.load_all_pool_usage(pool_names, strict=True)))
+    else:
+        for pool_name in pool_names:
+            steps.append((f'usage:{pool_name}', lambda pool_name=pool_name: adb.load_pool_usage(pool_name, strict=True)))
+    return steps
+
+
+async def warm_up(adb, pool_names, concurrency=WARMUP_CONCURRENCY):
+    """
+    Load all persistent state into the in-memory stores.
+
+    Args:
+        adb (AsyncBotDatabase): Database facade to load through
+        pool_names (list): Response usage pools to preload
+        concurrency (int): Maximum loads in flight
+
+    Returns:
+        dict: step name -> seconds taken (None if the step failed)
+    """
+    semaphore = asyncio.Semaphore(concurrency)
+    started = time.perf_counter()
+    status.update(state='running', started_at=datetime.now(timezone.utc).isoformat(), steps={}, failed=[])
+
+    async def run_step(name, load):
+        async with semaphore:
+            step_started = time.perf_counter()
+            try:
+                await load()
+            except Exception as e:
+                logger.error(f"[Warmup] {name}: Failed: {type(e).__name__}: {e}")
+                status['steps'][name] = None
+                return name, None
+            elapsed = time.perf_counter() - step_started
+            status['steps'][name] = round(elapsed, 3)
+            return name, elapsed
+
+    results = dict(await asyncio.gather(*(run_step(name, load) for name, load in _warmup_steps(adb, pool_names))))
+    total = time.perf_counter() - started
+    failed = [name for name, elapsed in results.items() if elapsed is None]
+
+    status.update(
+        state='ready',
+        finished_at=datetime.now(timezone.utc).isoformat(),
+        duration_seconds=round(total, 3),
+        failed=failed,
+    )
+
+    slowest = sorted(((elapsed, name) for name, elapsed in results.items() if elapsed is not None), reverse=True)[:5]
+    logger.info(
+        f"[Warmup] Loaded {len(results) - len(failed)}/{len(results)} stores in {total:.2f}s "
+        f"(concurrency {concurrency}); slowest: "
+        + (', '.join(f"{name} {elapsed:.2f}s" for elapsed, name in slowest) or 'none')
+    )
+    if failed:
+        logger.warning(f"[Warmup] Failed to preload: {', '.join(failed)} (will load lazily)")
+    return results
@@ -0,0 +1,594 @@
+"""
+Unit tests for BotDatabase storage behaviour: the write-behind usage cache,
+chunked bulk upserts, the SQLite backend and the AsyncBotDatabase facade.
+"""
+
+import asyncio
+import json
+import sys
+import threading
+import time
+import pytest
+from unittest.mock import MagicMock
+
+sys.path.insert(0, 'src')
+
+import database
+from database import AsyncBotDatabase, BotDatabase
+from json_journal import JsonJournal
+
+
+def read_store(tmp_path, name):
+    """Contents of a JSON store as a fresh process would see them (snapshot + journal)"""
+    return JsonJournal().load(str(tmp_path / name))
+
+
+@pytest.fixture
+def json_db(tmp_path, monkeypatch):
+    """BotDatabase in JSON mode writing into a temp directory"""
+    monkeypatch.chdir(tmp_path)
+    monkeypatch.delenv('SUPABASE_URL', raising=False)
+    monkeypatch.delenv('SUPABASE_KEY', raising=False)
+    monkeypatch.delenv('DATABASE_BACKEND', raising=False)
+    return BotDatabase()
+
+
+@pytest.fixture
+def sqlite_db(tmp_path, monkeypatch):
+    """BotDatabase on a SQLite file in a temp directory"""
+    monkeypatch.chdir(tmp_path)
+    monkeypatch.setenv('DATABASE_BACKEND', 'sqlite')
+    monkeypatch.setenv('SQLITE_PATH', str(tmp_path / 'dreambot.db'))
+    bot_db = BotDatabase()
+    yield bot_db
+    bot_db.sqlite.close()
+
+
+@pytest.fixture
+def supabase_db(json_db):
+    """BotDatabase with a mocked Supabase client"""
+    client = MagicMock()
+    client.table.return_value.select.return_value.execute.return_value.data = [
+        {'response_id': 'greet_001', 'response_text': 'Hello', 'usage_count': 4, 'last_used': None}
+    ]
+    json_db.supabase = client
+    return json_db
+
+
+class TestUsageCacheJson:
+    def test_increment_does_not_write_until_flush(self, json_db, tmp_path):
+        json_db.increment_pool_usage('greeting', 'greet_001', 'Hello')
+        assert not list(tmp_path.glob('greeting_usage.json*'))
+
+        json_db.flush_usage()
+        data = read_store(tmp_path, 'greeting_usage.json')
+        assert data['greet_001']['usage_count'] == 1
+
+    def test_load_served_from_cache(self, json_db, tmp_path):
+        json_db.increment_pool_usage('greeting', 'greet_001', 'Hello')
+        json_db.increment_pool_usage('greeting', 'greet_001', 'Hello')
+
+        # Out-of-band file edits are not re-read once the pool is cached
+        (tmp_path / 'greeting_usage.json').write_text('{}')
+        assert json_db.load_pool_usage('greeting')['greet_001']['usage_count'] == 2
+
+    def test_flush_clears_pending(self, json_db):
+        json_db.increment_8ball_usage('8ball_001', 'Yes')
+        json_db.increment_vague_usage('vague_001', 'Perhaps')
+        assert json_db.pending_usage_count() == 2
+
+        assert json_db.flush_usage() == 2
+        assert json_db.pending_usage_count() == 0
+        assert json_db.flush_usage() == 0
+
+    def test_legacy_pools_keep_their_files(self, json_db, tmp_path):
+        json_db.increment_whisper_usage('whisper_001', 'Psst')
+        json_db.flush_usage()
+        assert read_store(tmp_path, 'whisper_usage.json')['whisper_001']['usage_count'] == 1
+
+    def test_flush_adds_to_stored_counts(self, json_db, tmp_path):
+        # Another writer already recorded uses for this key
+        (tmp_path / 'greeting_usage.json').write_text(json.dumps({
+            'greet_001': {'text': 'Hello', 'usage_count': 3, 'last_used': None}
+        }))
+        json_db._usage_cache['greeting'] = {}
+
+        json_db.increment_pool_usage('greeting', 'greet_001', 'Hello')
+        json_db.flush_usage()
+
+        data = read_store(tmp_path, 'greeting_usage.json')
+        assert data['greet_001']['usage_count'] == 4
+
+    def test_new_instance_reads_flushed_counts(self, json_db):
+        json_db.increment_pool_usage('kebab', 'kebab_001', 'Kebab')
+        json_db.flush_usage()
+
+        fresh = BotDatabase()
+        assert fresh.load_pool_usage('kebab')['kebab_001']['usage_count'] == 1
+
+
+    def test_slow_read_does_not_block_other_pools(self, json_db, monkeypatch):
+        release = threading.Event()
+        read_usage = json_db._read_usage
+
+        def slow_read(pool_name):
+            if pool_name == 'greeting':
+                release.wait(timeout=2)
+            return read_usage(pool_name)
+
+        monkeypatch.setattr(json_db, '_read_usage', slow_read)
+        loader = threading.Thread(target=json_db.load_pool_usage, args=('greeting',))
+        loader.start()
+        try:
+            time.sleep(0.05)
+            started = time.monotonic()
+            json_db.increment_pool_usage('whisper', 'whisper_001', 'Psst')
+            assert time.monotonic() - started < 0.5
+        finally:
+            release.set()
+            loader.join()
+        assert json_db.load_pool_usage('whisper')['whisper_001']['usage_count'] == 1
+
+
+class TestUsageCacheSupabase:
+    def test_load_hits_supabase_once(self, supabase_db):
+        supabase_db.load_pool_usage('greeting')
+        supabase_db.load_pool_usage('greeting')
+        supabase_db.increment_pool_usage('greeting', 'greet_001', 'Hello')
+
+        assert supabase_db.supabase.table.return_value.select.call_count == 1
+
+    def test_flush_sends_one_delta_batch(self, supabase_db):
+        supabase_db.increment_pool_usage('greeting', 'greet_001', 'Hello')
+        supabase_db.increment_pool_usage('greeting', 'greet_002', 'Hi')
+        supabase_db.increment_pool_usage('greeting', 'greet_002', 'Hi')
+
+        supabase_db.flush_usage()
+
+        rpc = supabase_db.supabase.rpc
+        assert rpc.call_count == 1
+        name, params = rpc.call_args[0]
+        assert name == 'increment_response_usage'
+        assert params['p_table'] == 'response_greeting_usage'
+        deltas = {row['id']: row['delta'] for row in params['p_rows']}
+        assert deltas == {'greet_001': 1, 'greet_002': 2}
+        supabase_db.supabase.table.return_value.delete.assert_not_called()
+
+    def test_flush_adopts_server_counts(self, supabase_db):
+        supabase_db.increment_pool_usage('greeting', 'greet_001', 'Hello')
+        # Another instance bumped the row in the meantime
+        supabase_db.supabase.rpc.return_value.execute.return_value.data = [
+            {'id': 'greet_001', 'usage_count': 9}
+        ]
+
+        supabase_db.flush_usage()
+        assert supabase_db.load_pool_usage('greeting')['greet_001']['usage_count'] == 9
+
+    def test_failed_flush_is_requeued(self, supabase_db, tmp_path):
+        supabase_db.increment_pool_usage('greeting', 'greet_001', 'Hello')
+        supabase_db.supabase.rpc.side_effect = RuntimeError("down")
+
+        assert supabase_db.flush_usage() == 0
+        assert supabase_db.pending_usage_count() == 1
+        # Nothing is diverted to the JSON fallback
+        assert not list(tmp_path.glob('greeting_usage.json*'))
+
+    def test_failed_flush_keeps_cached_counts(self, supabase_db):
+        # greet_001 was loaded from Supabase with usage_count 4
+        supabase_db.increment_pool_usage('greeting', 'greet_001', 'Hello')
+        supabase_db.supabase.rpc.side_effect = RuntimeError("down")
+        supabase_db.flush_usage()
+
+        assert supabase_db.load_pool_usage('greeting')['greet_001']['usage_count'] == 5
+
+        # The retried delta reaches Supabase on the next flush
+        supabase_db.supabase.rpc.side_effect = None
+        supabase_db.flush_usage()
+        deltas = {row['id']: row['delta'] for row in supabase_db.supabase.rpc.call_args[0][1]['p_rows']}
+        assert deltas == {'greet_001': 1}
+        assert supabase_db.pending_usage_count() == 0
+
+
+class TestAsyncBotDatabase:
+    async def test_methods_are_awaitable(self, json_db):
+        adb = AsyncBotDatabase(json_db, max_workers=2)
+        try:
+            assert await adb.increment_pool_usage('greeting', 'greet_001', 'Hello') == 1
+            usage = await adb.load_pool_usage('greeting')
+            assert usage['greet_001']['usage_count'] == 1
+        finally:
+            adb.shutdown()
+
+    async def test_slow_call_does_not_block_event_loop(self, json_db, monkeypatch):
+        monkeypatch.setattr(json_db, 'load_warnings', lambda: time.sleep(0.3) or {})
+        adb = AsyncBotDatabase(json_db, max_workers=2)
+        ticks = 0
+
+        async def ticker():
+            nonlocal ticks
+            while True:
+                ticks += 1
+                await asyncio.sleep(0.01)
+
+        task = asyncio.create_task(ticker())
+        try:
+            assert await adb.load_warnings() == {}
+            assert ticks > 5
+        finally:
+            task.cancel()
+            adb.shutdown()
+
+    def test_private_and_non_callable_attributes_hidden(self, json_db):
+        adb = AsyncBotDatabase(json_db, max_workers=1)
+        with pytest.raises(AttributeError):
+            adb.supabase
+        with pytest.raises(AttributeError):
+            adb._read_usage
+        adb.shutdown()
+
+
+class TestBulkUpsert:
+    def test_save_sends_chunked_array_upserts(self, supabase_db, monkeypatch):
+        monkeypatch.setattr(database, 'UPSERT_CHUNK_SIZE', 2)
+        prebans = {'1': {str(user_id): {'reason': 'spam'} for user_id in range(5)}}
+
+        supabase_db.save_prebans(prebans)
+
+        upsert = supabase_db.supabase.table.return_value.upsert
+        assert upsert.call_count == 3
+        assert [len(call.args[0]) for call in upsert.call_args_list] == [2, 2, 1]
+        assert upsert.call_args.kwargs['on_conflict'] == 'guild_id,user_id'
+
+    def test_failed_chunk_is_retried(self, supabase_db, monkeypatch):
+        monkeypatch.setattr(database, 'UPSERT_RETRY_DELAY', 0)
+        execute = supabase_db.supabase.table.return_value.upsert.return_value.execute
+        execute.side_effect = [RuntimeError("timeout"), MagicMock(data=None)]
+
+        supabase_db.save_suggestions({'111': {'votes': 1}})
+
+        assert execute.call_count == 2
+
+    def test_exhausted_retries_fall_back_to_json(self, supabase_db, tmp_path, monkeypatch):
+        monkeypatch.setattr(database, 'UPSERT_RETRY_DELAY', 0)
+        execute = supabase_db.supabase.table.return_value.upsert.return_value.execute
+        execute.side_effect = RuntimeError("down")
+
+        supabase_db.save_reaction_roles({'222': {'type': 'verify'}})
+
+        assert execute.call_count == database.UPSERT_MAX_ATTEMPTS
+        assert read_store(tmp_path, 'reaction_roles.json') == {'222': {'type': 'verify'}}
+
+
+class TestUnifiedUsageStorage:
+    @pytest.fixture
+    def unified_db(self, supabase_db):
+        supabase_db.usage_storage = 'unified'
+        query = supabase_db.supabase.table.return_value.select.return_value
+        query.range.return_value.execute.return_value.data = [
+            {'pool': 'greeting', 'response_id': 'greet_001', 'response_text': 'Hello', 'usage_count': 2, 'last_used': None},
+            {'pool': 'kebab', 'response_id': 'kebab_001', 'response_text': 'Kebab', 'usage_count': 7, 'last_used': None},
+        ]
+        return supabase_db
+
+    def test_load_all_pools_in_one_query(self, unified_db):
+        usage = unified_db.load_all_pool_usage(['greeting', 'kebab', 'farewell'])
+
+        assert unified_db.supabase.table.call_args_list == [(('response_usage',),)]
+        assert usage['kebab']['kebab_001']['usage_count'] == 7
+        assert usage['farewell'] == {}
+        # Subsequent loads come from the cache
+        assert unified_db.load_pool_usage('greeting')['greet_001']['usage_count'] == 2
+        assert unified_db.supabase.table.call_count == 1
+
+    def test_flush_uses_unified_rpc(self, unified_db):
+        unified_db.load_all_pool_usage(['greeting'])
+        unified_db.increment_pool_usage('greeting', 'greet_001', 'Hello')
+        unified_db.flush_usage()
+
+        name, params = unified_db.supabase.rpc.call_args[0]
+        assert name == 'increment_unified_response_usage'
+        assert params['p_pool'] == 'greeting'
+
+    def test_migration_copies_per_pool_tables(self, supabase_db):
+        results = supabase_db.migrate_usage_to_unified(['greeting', '8ball'])
+
+        assert results == {'greeting': 1, '8ball': 1}
+        upsert = supabase_db.supabase.table.return_value.upsert
+        assert upsert.call_args.kwargs['on_conflict'] == 'pool,response_id'
+        assert upsert.call_args_list[1].args[0][0]['pool'] == '8ball'
+
+
+class TestSQLiteBackend:
+    def test_selected_by_env(self, sqlite_db, tmp_path):
+        assert sqlite_db.sqlite is not None
+        assert sqlite_db.supabase is None
+        journal_mode = sqlite_db.sqlite._query("PRAGMA journal_mode")[0][0]
+        assert journal_mode == 'wal'
+
+    def test_round_trip_without_json_files(self, sqlite_db, tmp_path):
+        sqlite_db.save_warnings({'1': {'10': [{'reason': 'spam'}]}})
+        sqlite_db.save_reaction_roles({'222': {'type': 'verify'}})
+
+        assert sqlite_db.load_warnings() == {'1': {'10': [{'reason': 'spam'}]}}
+        assert sqlite_db.load_reaction_roles() == {'222': {'type': 'verify'}}
+        assert not list(tmp_path.glob('*.json'))
+
+    def test_save_only_writes_changed_rows(self, sqlite_db):
+        sqlite_db.save_suggestions({'1': {'votes': 1}, '2': {'votes': 2}})
+
+        assert sqlite_db.sqlite.save_suggestions({'1': {'votes': 1}, '3': {'votes': 0}}) == (1, 1)
+        assert sqlite_db.load_suggestions() == {'1': {'votes': 1}, '3': {'votes': 0}}
+
+    def test_get_preban_point_lookup(self, sqlite_db):
+        sqlite_db.save_prebans({'1': {'10': {'reason': 'raider'}}})
+
+        assert sqlite_db.get_preban('1', '10') == {'reason': 'raider'}
+        assert sqlite_db.get_preban('1', '11') is None
+
+    def test_usage_flush_applies_deltas(self, sqlite_db):
+        sqlite_db.increment_pool_usage('greeting', 'greet_001', 'Hello')
+        sqlite_db.increment_pool_usage('greeting', 'greet_001', 'Hello')
+        sqlite_db.flush_usage()
+
+        # A second writer's increment is added to, not overwritten by, ours
+        sqlite_db.sqlite.apply_usage_deltas('greeting', [
+            {'id': 'greet_001', 'text': 'Hello', 'delta': 5, 'last_used': None}
+        ])
+        sqlite_db.increment_pool_usage('greeting', 'greet_001', 'Hello')
+        sqlite_db.flush_usage()
+
+        assert sqlite_db.sqlite.load_usage('greeting')['greet_001']['usage_count'] == 8
+        assert sqlite_db.load_pool_usage('greeting')['greet_001']['usage_count'] == 8
+
+    def test_load_all_pool_usage(self, sqlite_db):
+        sqlite_db.save_pool_usage('kebab', {'kebab_001': {'text': 'Kebab', 'usage_count': 7, 'last_used': None}})
+        sqlite_db._usage_cache.clear()
+
+        usage = sqlite_db.load_all_pool_usage(['kebab', 'farewell'])
+
+        assert usage['kebab']['kebab_001']['usage_count'] == 7
+        assert usage['farewell'] == {}
+
+
+class TestDirtyTrackingSaves:
+    @pytest.fixture
+    def warnings_db(self, supabase_db):
+        query = supabase_db.supabase.table.return_value.select.return_value
+        query.range.return_value.execute.return_value.data = [
+            {'guild_id': '1', 'user_id': '10', 'warnings': [{'reason': 'spam'}]},
+            {'guild_id': '1', 'user_id': '11', 'warnings': [{'reason': 'flood'}]},
+        ]
+        return supabase_db
+
+    def test_only_changed_rows_are_upserted(self, warnings_db):
+        warnings = warnings_db.load_warnings()
+        warnings['1']['10'].append({'reason': 'raid'})
+
+        warnings_db.save_warnings(warnings)
+
+        upsert = warnings_db.supabase.table.return_value.upsert
+        assert upsert.call_args.args[0] == [{'guild_id': '1', 'user_id': '10', 'warnings': [{'reason': 'spam'}, {'reason': 'raid'}]}]
+        assert not warnings_db.supabase.table.return_value.delete.called
+
+    def test_removed_keys_are_deleted_without_clearing_table(self, warnings_db):
+        warnings = warnings_db.load_warnings()
+        del warnings['1']['11']
+
+        warnings_db.save_warnings(warnings)
+
+        delete = warnings_db.supabase.table.return_value.delete.return_value
+        assert not warnings_db.supabase.table.return_value.upsert.called
+        assert not delete.neq.called
+        delete.eq.assert_called_once_with('guild_id', '1')
+        delete.eq.return_value.in_.assert_called_once_with('user_id', ['11'])
+
+    def test_unchanged_save_sends_nothing(self, warnings_db):
+        warnings_db.save_warnings(warnings_db.load_warnings())
+
+        assert not warnings_db.supabase.table.return_value.upsert.called
+        assert not warnings_db.supabase.table.return_value.delete.called
+
+    def test_failed_save_rereads_table_next_time(self, warnings_db, monkeypatch):
+        monkeypatch.setattr(database, 'UPSERT_RETRY_DELAY', 0)
+        warnings = warnings_db.load_warnings()
+        warnings['1']['12'] = [{'reason': 'spam'}]
+        upsert_execute = warnings_db.supabase.table.return_value.upsert.return_value.execute
+        upsert_execute.side_effect = RuntimeError("down")
+
+        warnings_db.save_warnings(warnings)
+
+        assert not warnings_db.repositories['warnings'].primed
+
+    def test_loads_after_first_are_served_from_memory(self, warnings_db):
+        first = warnings_db.load_warnings()
+        first['1']['10'].append({'reason': 'not saved'})
+
+        assert warnings_db.load_warnings()['1']['10'] == [{'reason': 'spam'}]
+        assert warnings_db.supabase.table.return_value.select.call_count == 1
+
+
+class TestNormalizedSuggestions:
+    ROW = {
+        'message_id': '500', 'guild_id': 1, 'channel_id': 2, 'type': 'video', 'status': 'active',
+        'votes': 4, 'author_id': 3, 'description': 'A wish', 'created_at': '2025-01-01T00:00:00',
+        'granted_at': None, 'granted_by': None, 'granted_notes': None, 'updated_at': '2025-01-01T00:00:00+00:00',
+    }
+
+    @pytest.fixture
+    def wishes_db(self, supabase_db):
+        supabase_db.suggestions_storage = 'normalized'
+        query = supabase_db.supabase.table.return_value.select.return_value
+        query.range.return_value.execute.return_value.data = [dict(self.ROW)]
+        return supabase_db
+
+    def test_load_decodes_columns(self, wishes_db):
+        wishes = wishes_db.load_suggestions()
+
+        wishes_db.supabase.table.assert_called_with('wishes')
+        assert wishes == {'500': {
+            'guild_id': 1, 'channel_id': 2, 'type': 'video', 'status': 'active', 'votes': 4,
+            'author_id': 3, 'description': 'A wish', 'created_at': '2025-01-01T00:00:00',
+        }}
+
+    def test_save_upserts_changed_wish_as_columns(self, wishes_db):
+        wishes = wishes_db.load_suggestions()
+        wishes['500']['votes'] = 5
+
+        wishes_db.save_suggestions(wishes)
+
+        upsert = wishes_db.supabase.table.return_value.upsert
+        row = upsert.call_args.args[0][0]
+        assert row['message_id'] == '500' and row['votes'] == 5 and 'data' not in row
+        assert upsert.call_args.kwargs['on_conflict'] == 'message_id'
+
+    def test_query_runs_server_side(self, wishes_db):
+        query = MagicMock()
+        for method in ('select', 'eq', 'order', 'limit'):
+            getattr(query, method).return_value = query
+        query.execute.return_value.data = [dict(self.ROW)]
+        wishes_db.supabase.table.return_value = query
+
+        result = wishes_db.query_suggestions(1, 'video', 'active', 5)
+
+        assert [call.args for call in query.eq.call_args_list] == [('guild_id', 1), ('status', 'active'), ('type', 'video')]
+        query.order.assert_called_once_with('votes', desc=True)
+        query.limit.assert_called_once_with(5)
+        assert result[0][0] == '500' and result[0][1]['votes'] == 4
+
+    def test_query_filters_loaded_suggestions_without_normalized_storage(self, json_db):
+        json_db.save_suggestions({
+            '1': {'guild_id': 1, 'type': 'video', 'votes': 2, 'status': 'active'},
+            '2': {'guild_id': 1, 'type': 'video', 'votes': 9, 'status': 'active'},
+            '3': {'guild_id': 1, 'type': 'other', 'votes': 5, 'status': 'active'},
+            '4': {'guild_id': 1, 'type': 'video', 'status': 'granted', 'granted_at': '2025-01-02T00:00:00'},
+        })
+
+        assert [message_id for message_id, _ in json_db.query_suggestions(1, 'video')] == ['2', '1']
+        assert [message_id for message_id, _ in json_db.query_suggestions(1, status='granted')] == ['4']
+
+    def test_migration_copies_jsonb_rows(self, supabase_db):
+        query = supabase_db.supabase.table.return_value.select.return_value
+        query.range.return_value.execute.return_value.data = [
+            {'message_id': '500', 'data': {'guild_id': 1, 'type': 'other', 'votes': 2, 'description': 'Old'}}
+        ]
+
+        assert supabase_db.migrate_suggestions_to_normalized() == 1
+
+        upsert = supabase_db.supabase.table.return_value.upsert
+        row = upsert.call_args.args[0][0]
+        assert row['message_id'] == '500' and row['status'] == 'active' and row['votes'] == 2
+        assert upsert.call_args.kwargs['on_conflict'] == 'message_id'
+
+
+class TestSingleWishWrites:
+    WISH = {'guild_id': 1, 'type': 'video', 'votes': 2, 'status': 'active'}
+
+    def test_json_writes_one_key(self, json_db, tmp_path):
+        json_db.save_suggestions({'1': dict(self.WISH), '2': dict(self.WISH)})
+
+        json_db.save_suggestion('1', dict(self.WISH, votes=3))
+        json_db.delete_suggestion('2')
+
+        assert read_store(tmp_path, 'suggestions.json') == {'1': dict(self.WISH, votes=3)}
+
+    def test_sqlite_round_trip(self, sqlite_db):
+        sqlite_db.save_suggestion('1', dict(self.WISH))
+        sqlite_db.save_suggestion('1', dict(self.WISH, votes=4))
+        sqlite_db.save_suggestion('2', dict(self.WISH))
+        sqlite_db.delete_suggestion('2')
+
+        assert sqlite_db.load_suggestions() == {'1': dict(self.WISH, votes=4)}
+
+    def test_supabase_upserts_and_deletes_one_row(self, supabase_db):
+        supabase_db.suggestions_storage = 'normalized'
+        query = supabase_db.supabase.table.return_value.select.return_value
+        query.range.return_value.execute.return_value.data = []
+        supabase_db.load_suggestions()
+
+        supabase_db.save_suggestion('500', dict(self.WISH))
+
+        upsert = supabase_db.supabase.table.return_value.upsert
+        rows = upsert.call_args.args[0]
+        assert len(rows) == 1 and rows[0]['message_id'] == '500' and rows[0]['votes'] == 2
+
+        # The repository knows the row is stored, so a full save has nothing to send
+        upsert.reset_mock()
+        supabase_db.save_suggestions({'500': dict(self.WISH)})
+        upsert.assert_not_called()
+
+        supabase_db.delete_suggestion('500')
+        supabase_db.supabase.table.return_value.delete.assert_called()
+
+    def test_single_write_waits_for_full_save(self, supabase_db, monkeypatch):
+        supabase_db.suggestions_storage = 'normalized'
+        query = supabase_db.supabase.table.return_value.select.return_value
+        query.range.return_value.execute.return_value.data = []
+        supabase_db.load_suggestions()
+
+        release = threading.Event()
+        bulk_upsert = supabase_db._bulk_upsert
+
+        def slow_upsert(table, rows, label, **kwargs):
+            if label == 'save_suggestions':
+                release.wait(timeout=2)
+            return bulk_upsert(table, rows, label, **kwargs)
+
+        monkeypatch.setattr(supabase_db, '_bulk_upsert', slow_upsert)
+        full_save = threading.Thread(target=supabase_db.save_suggestions, args=({'1': dict(self.WISH)},))
+        single_write = threading.Thread(target=supabase_db.save_suggestion, args=('2', dict(self.WISH)))
+        full_save.start()
+        time.sleep(0.05)
+        single_write.start()
+        time.sleep(0.05)
+        # The single-row write can't mark its row while the full save is mid-diff
+        assert single_write.is_alive()
+        release.set()
+        full_save.join()
+        single_write.join()
+
+        # Both rows are in the baseline, so a full save of both sends nothing
+        upsert = supabase_db.supabase.table.return_value.upsert
+        upsert.reset_mock()
+        supabase_db.save_suggestions({'1': dict(self.WISH), '2': dict(self.WISH)})
+        upsert.assert_not_called()
+
+
+class TestTaskState:
+    STATE = {'next_run_at': '2026-10-19T00:00:00', 'last_posts': {'1': {'message_id': 5}}}
+
+    def test_json_round_trip(self, json_db):
+        assert json_db.load_task_state('weekly_summary') is None
+
+        json_db.save_task_state('weekly_summary', self.STATE)
+
+        assert BotDatabase().load_task_state('weekly_summary') == self.STATE
+
+    def test_sqlite_round_trip(self, sqlite_db):
+        sqlite_db.save_task_state('weekly_summary', {'next_run_at': None})
+        sqlite_db.save_task_state('weekly_summary', self.STATE)
+
+        assert sqlite_db.load_task_state('weekly_summary') == self.STATE
+        assert sqlite_db.load_task_state('other') is None
+
+
+class TestStrictLoads:
+    def test_failed_reaction_roles_load_raises_only_when_strict(self, supabase_db):
+        supabase_db.supabase.table.side_effect = RuntimeError("down")
+
+        assert supabase_db.load_reaction_roles() == {}
+        with pytest.raises(RuntimeError):
+            supabase_db.load_reaction_roles(strict=True)
+
+    def test_failed_suggestions_load_raises_only_when_strict(self, supabase_db):
+        supabase_db.supabase.table.side_effect = RuntimeError("down")
+
+        assert supabase_db.load_suggestions() == {}
+        with pytest.raises(RuntimeError):
+            supabase_db.load_suggestions(strict=True)
+
+    def test_failed_task_state_load_raises_only_when_strict(self, supabase_db):
+        supabase_db.supabase.table.side_effect = RuntimeError("down")
+
+        assert supabase_db.load_task_state('weekly_summary') is None
+        with pytest.raises(RuntimeError):
+            supabase_db.load_task_state('weekly_summary', strict=True)
@@ -0,0 +1,61 @@
+"""
+Unit tests for run_per_guild: bounded-concurrency fan-out over guilds with
+per-guild timeouts, error isolation and duration reporting.
+"""
+
+import asyncio
+import sys
+from unittest.mock import Mock
+
+sys.path.insert(0, 'src')
+
+from utils.guild_jobs import run_per_guild
+
+
+def make_guilds(count):
+    return [Mock(id=guild_id, name=f"Guild {guild_id}") for guild_id in range(1, count + 1)]
+
+
+async def test_concurrency_is_bounded():
+    in_flight = 0
+    peak = 0
+
+    async def job(guild):
+        nonlocal in_flight, peak
+        in_flight += 1
+        peak = max(peak, in_flight)
+        await asyncio.sleep(0.01)
+        in_flight -= 1
+        return guild.id * 10
+
+    results = await run_per_guild('test', make_guilds(7), job, concurrency=3)
+
+    assert peak == 3
+    assert {guild_id: outcome['result'] for guild_id, outcome in results.items()} == {i: i * 10 for i in range(1, 8)}
+
+
+async def test_failing_and_slow_guilds_are_isolated():
+    async def job(guild):
+        if guild.id == 1:
+            raise RuntimeError("boom")
+        if guild.id == 2:
+            await asyncio.sleep(10)
+        return 'done'
+
+    results = await run_per_guild('test', make_guilds(3), job, timeout=0.05)
+
+    assert results[1]['error'] == "RuntimeError: boom"
+    assert results[2]['error'].startswith("timed out")
+    assert results[3] == {'seconds': results[3]['seconds'], 'result': 'done', 'error': None}
+
+
+async def test_slow_guild_does_not_delay_others():
+    finished = []
+
+    async def job(guild):
+        await asyncio.sleep(0.2 if guild.id == 1 else 0)
+        finished.append(guild.id)
+
+    await run_per_guild('test', make_guilds(4), job, concurrency=2)
+
+    assert finished == [2, 3, 4, 1]
@@ -0,0 +1,111 @@
+"""
+Unit tests for the append-only JSON journal used by BotDatabase's JSON storage.
+"""
+
+import json
+import sys
+import pytest
+
+sys.path.insert(0, 'src')
+
+from json_journal import JsonJournal
+
+
+@pytest.fixture
+def store(tmp_path):
+    return str(tmp_path / 'warnings.json')
+
+
+def log_lines(store):
+    with open(f"{store}.log") as f:
+        return [json.loads(line) for line in f]
+
+
+def test_save_appends_only_changed_keys(store):
+    journal = JsonJournal()
+    journal.save(store, {'1': {'10': ['spam'], '11': ['flood']}}, depth=2)
+
+    assert journal.save(store, {'1': {'10': ['spam', 'raid'], '11': ['flood']}}, depth=2) == 1
+    assert log_lines(store)[-1] == {'op': 'set', 'key': ['1', '10'], 'value': ['spam', 'raid']}
+    assert journal.save(store, {'1': {'10': ['spam', 'raid'], '11': ['flood']}}, depth=2) == 0
+
+
+def test_replay_matches_saved_state(store):
+    journal = JsonJournal()
+    journal.save(store, {'1': {'10': ['spam']}, '2': {'20': ['flood']}}, depth=2)
+    journal.save(store, {'1': {}, '3': {'30': ['raid']}}, depth=2)
+
+    assert JsonJournal().load(store) == {'1': {}, '3': {'30': ['raid']}}
+
+
+def test_load_returns_copy(store):
+    journal = JsonJournal()
+    journal.save(store, {'1': {'10': ['spam']}}, depth=2)
+
+    data = journal.load(store)
+    data['1']['10'].append('raid')
+
+    # Mutating the loaded dict is seen as a change on the next save
+    assert journal.save(store, data, depth=2) == 1
+
+
+def test_torn_final_line_is_ignored(store):
+    journal = JsonJournal()
+    journal.save(store, {'a': 1})
+    with open(f"{store}.log", 'a') as f:
+        f.write('{"op": "set", "key": ["b"], "val')
+
+    assert JsonJournal().load(store) == {'a': 1}
+
+
+def test_append_after_torn_line_survives_replay(store):
+    journal = JsonJournal()
+    journal.save(store, {'a': 1})
+    with open(f"{store}.log", 'a') as f:
+        f.write('{"op": "set", "key": ["b"], "va')
+
+    recovered = JsonJournal()
+    data = recovered.load(store)
+    data['c'] = 3
+    recovered.save(store, data)
+
+    assert JsonJournal().load(store) == {'a': 1, 'c': 3}
+
+
+def test_compaction_writes_snapshot_and_clears_log(store, tmp_path):
+    journal = JsonJournal()
+    journal.save(store, {'a': 1})
+    journal.save(store, {'a': 2, 'b': 3})
+
+    assert journal.compact_all() == 1
+    assert not (tmp_path / 'warnings.json.log').exists()
+    assert json.loads((tmp_path / 'warnings.json').read_text()) == {'a': 2, 'b': 3}
+    assert journal.compact_all() == 0
+
+
+def test_compacts_automatically_at_threshold(store, tmp_path):
+    journal = JsonJournal(compact_entries=3)
+    for value in range(3):
+        journal.save(store, {'a': value})
+
+    assert not (tmp_path / 'warnings.json.log').exists()
+    assert JsonJournal().load(store) == {'a': 2}
+
+
+def test_set_items_updates_single_keys(store):
+    journal = JsonJournal()
+    journal.save(store, {'a': {'usage_count': 1}, 'b': {'usage_count': 5}})
+
+    journal.set_items(store, {'a': {'usage_count': 2}})
+
+    assert journal.get_items(store, ['a', 'missing']) == {'a': {'usage_count': 2}}
+    assert JsonJournal().load(store) == {'a': {'usage_count': 2}, 'b': {'usage_count': 5}}
+
+
+def test_delete_items_removes_single_keys(store):
+    journal = JsonJournal()
+    journal.save(store, {'a': 1, 'b': 2})
+
+    assert journal.delete_items(store, ['a', 'missing']) == 1
+    assert log_lines(store)[-1] == {'op': 'del', 'key': ['a']}
+    assert JsonJournal().load(store) == {'b': 2}
@@ -0,0 +1,57 @@
+"""
+Unit tests for the per-guild human member counter used by channel-wish
+threshold checks.
+"""
+
+import sys
+from unittest.mock import MagicMock
+
+sys.path.insert(0, 'src')
+
+from utils.member_counts import HumanMemberCounter
+
+
+def make_guild(humans, bots, guild_id=1):
+    members = [MagicMock(bot=False) for _ in range(humans)] + [MagicMock(bot=True) for _ in range(bots)]
+    return MagicMock(id=guild_id, members=members)
+
+
+def make_member(guild, bot=False):
+    return MagicMock(guild=guild, bot=bot)
+
+
+def test_counts_once_then_tracks_events():
+    guild = make_guild(humans=3, bots=2)
+    counter = HumanMemberCounter()
+    assert counter.count(guild) == 3
+
+    # Later counts come from events, not the member list
+    guild.members = []
+    counter.member_joined(make_member(guild))
+    counter.member_joined(make_member(guild, bot=True))
+    assert counter.count(guild) == 4
+
+    counter.member_removed(make_member(guild))
+    assert counter.count(guild) == 3
+
+
+def test_bot_flag_change_on_update():
+    guild = make_guild(humans=2, bots=0)
+    counter = HumanMemberCounter()
+    counter.build([guild])
+
+    counter.member_updated(make_member(guild), make_member(guild, bot=True))
+    assert counter.count(guild) == 1
+
+
+def test_events_before_first_count_are_not_double_counted():
+    guild = make_guild(humans=2, bots=0)
+    counter = HumanMemberCounter()
+
+    # The joining member is already in guild.members when first counted
+    counter.member_joined(make_member(guild))
+    assert counter.count(guild) == 2
+
+    counter.invalidate(guild.id)
+    guild.members.append(MagicMock(bot=False))
+    assert counter.count(guild) == 3
@@ -0,0 +1,73 @@
+"""
+Unit tests for moderation commands' stored state: concurrent warn/preban
+commands serialise their load-modify-save so no update is lost.
+"""
+
+import asyncio
+import sys
+import time
+import pytest
+from unittest.mock import AsyncMock, MagicMock, patch
+
+sys.path.insert(0, 'src')
+
+from cogs.moderation import Moderation
+from database import AsyncBotDatabase, BotDatabase
+
+GUILD_ID = 987654321
+
+
+@pytest.fixture
+def adb(tmp_path, monkeypatch):
+    """AsyncBotDatabase over a JSON-mode BotDatabase whose loads are slow enough to interleave"""
+    monkeypatch.chdir(tmp_path)
+    monkeypatch.delenv('SUPABASE_URL', raising=False)
+    monkeypatch.delenv('SUPABASE_KEY', raising=False)
+    monkeypatch.delenv('DATABASE_BACKEND', raising=False)
+    bot_db = BotDatabase()
+    for name in ('load_warnings', 'load_prebans'):
+        load = getattr(bot_db, name)
+        monkeypatch.setattr(bot_db, name, lambda load=load: time.sleep(0.05) or load())
+    facade = AsyncBotDatabase(bot_db, max_workers=4)
+    with patch('cogs.moderation.adb', facade), patch('cogs.moderation.log_moderation', new=AsyncMock()):
+        yield facade
+    facade.shutdown()
+
+
+@pytest.fixture
+def cog():
+    return Moderation(MagicMock())
+
+
+def make_ctx(author_id):
+    ctx = MagicMock()
+    ctx.guild.id = GUILD_ID
+    ctx.author.id = author_id
+    ctx.author.top_role = 10
+    ctx.send = AsyncMock()
+    return ctx
+
+
+def make_member(member_id):
+    member = MagicMock()
+    member.id = member_id
+    member.top_role = 1
+    return member
+
+
+async def test_concurrent_warnings_are_all_kept(adb, cog):
+    await asyncio.gather(
+        cog.warn.callback(cog, make_ctx(1), make_member(100), reason="spam"),
+        cog.warn.callback(cog, make_ctx(2), make_member(100), reason="flood"),
+        cog.warn.callback(cog, make_ctx(3), make_member(200), reason="raid"),
+    )
+
+    warnings = await adb.load_warnings()
+    assert sorted(w['reason'] for w in warnings[str(GUILD_ID)]['100']) == ['flood', 'spam']
+    assert len(warnings[str(GUILD_ID)]['200']) == 1
+
+
+async def test_concurrent_prebans_are_all_kept(adb, cog):
+    await asyncio.gather(*(cog.preban.callback(cog, make_ctx(1), user_id) for user_id in (11, 12, 13)))
+
+    assert set((await adb.load_prebans())[str(GUILD_ID)]) == {'11', '12', '13'}
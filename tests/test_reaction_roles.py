@@ -0,0 +1,187 @@
+"""
+Unit tests for the in-memory reaction-role index, the per-guild role cache,
+the coalescing role mutation queue, and the reaction handlers' early
+rejection of reactions on ordinary messages.
+"""
+
+import asyncio
+import sys
+import pytest
+from unittest.mock import AsyncMock, MagicMock
+
+sys.path.insert(0, 'src')
+
+from config import COLOR_ROLES, DREAMER_ROLE
+from utils.reaction_roles import ReactionRoleIndex, reaction_role_index
+from utils.role_cache import GuildRoleCache, guild_role_cache
+from utils.role_queue import RoleMutationQueue
+from events import reaction_events
+from events.reaction_events import ReactionEvents
+
+REACTION_DATA = {
+    '100': {'type': 'verify', 'channel_id': 1, 'guild_id': 9},
+    '200': {'type': 'color', 'channel_id': 1, 'guild_id': 9},
+}
+
+
+def test_lookup_maps_emoji_to_role():
+    index = ReactionRoleIndex()
+    index.rebuild(REACTION_DATA)
+    emoji, role_name = next(iter(COLOR_ROLES.items()))
+
+    assert index.lookup(100, '✅') == ('verify', DREAMER_ROLE)
+    assert index.lookup(200, emoji) == ('color', role_name)
+
+
+def test_lookup_rejects_unknown_messages_and_emoji():
+    index = ReactionRoleIndex()
+    index.rebuild(REACTION_DATA)
+
+    assert index.lookup(300, '✅') is None
+    assert index.lookup(100, '🍕') is None
+
+
+def test_rebuild_replaces_previous_entries():
+    index = ReactionRoleIndex()
+    index.rebuild(REACTION_DATA)
+    index.rebuild({'300': {'type': 'special', 'channel_id': 1, 'guild_id': 9}})
+
+    assert 100 not in index
+    assert 300 in index
+
+
+async def test_irrelevant_reaction_does_no_io(monkeypatch):
+    reaction_role_index.rebuild(REACTION_DATA)
+    adb = MagicMock()
+    monkeypatch.setattr(reaction_events, 'adb', adb)
+    bot = MagicMock()
+    bot.user.id = 1
+    cog = ReactionEvents(bot)
+    payload = MagicMock(user_id=2, message_id=999, guild_id=9, emoji='👍')
+
+    await cog.on_raw_reaction_add(payload)
+    await cog.on_raw_reaction_remove(payload)
+
+    assert not adb.method_calls
+    assert not bot.get_guild.called
+
+
+async def test_verify_reaction_queues_dreamer_role(monkeypatch):
+    reaction_role_index.rebuild(REACTION_DATA)
+    queue = MagicMock()
+    monkeypatch.setattr(reaction_events, 'role_mutation_queue', queue)
+    bot = MagicMock()
+    bot.user.id = 1
+    role = make_role(7, DREAMER_ROLE)
+    guild = bot.get_guild.return_value
+    guild.id = 9
+    guild.roles = [role]
+    guild_role_cache.invalidate(9)
+    member = guild.get_member.return_value
+    payload = MagicMock(user_id=2, message_id=100, guild_id=9, emoji='✅')
+
+    await ReactionEvents(bot).on_raw_reaction_add(payload)
+
+    queue.request.assert_called_once_with(member, add=[role])
+
+
+def make_role(role_id, name):
+    role = MagicMock(id=role_id)
+    role.name = name
+    return role
+
+
+def test_role_cache_finds_color_roles():
+    color_names = list(COLOR_ROLES.values())
+    red, blue, helper = make_role(1, color_names[0]), make_role(2, color_names[1]), make_role(3, 'Helper')
+    guild = MagicMock(id=5, roles=[red, blue, helper])
+    cache = GuildRoleCache()
+
+    assert cache.get_by_name(guild, 'Helper') is helper
+    assert sorted(cache.color_roles(guild), key=lambda role: role.id) == [red, blue]
+
+
+def test_role_cache_rebuilds_after_invalidation():
+    guild = MagicMock(id=5, roles=[make_role(1, 'Old')])
+    cache = GuildRoleCache()
+    cache.get_by_name(guild, 'Old')
+
+    guild.roles = [make_role(2, 'New')]
+    assert cache.get_by_name(guild, 'New') is None
+    cache.invalidate(5)
+    assert cache.get_by_name(guild, 'New').id == 2
+
+
+def make_member(roles):
+    guild = MagicMock(id=5)
+    member = MagicMock(id=42, guild=guild, roles=list(roles))
+    member.edit = AsyncMock()
+    return member
+
+
+async def test_queue_coalesces_colour_clicks_into_one_edit():
+    red, blue, green, helper = make_role(1, 'Red'), make_role(2, 'Blue'), make_role(3, 'Green'), make_role(4, 'Helper')
+    member = make_member([red, helper])
+    queue = RoleMutationQueue(window=0.01)
+
+    queue.request(member, add=[blue], remove=[red, green])
+    task = queue.request(member, add=[green], remove=[red, blue])
+    await task
+
+    member.edit.assert_awaited_once()
+    assert {role.id for role in member.edit.call_args.kwargs['roles']} == {3, 4}
+
+
+async def test_queue_skips_edit_when_nothing_changes():
+    helper = make_role(4, 'Helper')
+    member = make_member([helper])
+    queue = RoleMutationQueue(window=0.01)
+
+    queue.request(member, add=[make_role(1, 'Red')])
+    await queue.request(member, remove=[make_role(1, 'Red')])
+
+    assert not member.edit.called
+    assert queue.edits == 0
+
+
+async def test_queue_drops_member_lock_after_last_edit():
+    red, blue = make_role(1, 'Red'), make_role(2, 'Blue')
+    member = make_member([red])
+
+    async def slow_edit(**kwargs):
+        await asyncio.sleep(0.05)
+    member.edit.side_effect = slow_edit
+    queue = RoleMutationQueue(window=0.01)
+
+    first = queue.request(member, add=[blue])
+    await asyncio.sleep(0.03)
+    # Queued while the first edit is in flight, so the lock must survive it
+    second = queue.request(member, remove=[red])
+    await first
+    assert (5, 42) in queue._locks
+
+    await second
+    assert queue._locks == {}
+    assert member.edit.await_count == 2
+
+
+async def test_failed_index_load_is_retried(monkeypatch):
+    monkeypatch.setattr(reaction_events, 'reaction_role_index', ReactionRoleIndex())
+    adb = MagicMock()
+    adb.load_reaction_roles = AsyncMock(side_effect=[RuntimeError("down"), REACTION_DATA])
+    monkeypatch.setattr(reaction_events, 'adb', adb)
+    bot = MagicMock()
+    bot.user.id = 1
+    cog = ReactionEvents(bot)
+
+    await cog.cog_load()
+    assert not reaction_events.reaction_role_index.loaded
+
+    # The next reaction after the retry interval builds the index
+    cog._index_retry_at = 0
+    payload = MagicMock(user_id=2, message_id=999, guild_id=9, emoji='👍')
+    await cog.on_raw_reaction_add(payload)
+
+    assert reaction_events.reaction_role_index.loaded
+    assert 100 in reaction_events.reaction_role_index
+    adb.load_reaction_roles.assert_called_with(strict=True)
@@ -0,0 +1,103 @@
+"""
+Unit tests for the rate-limit-aware request scheduler used for bulk role
+creation, reaction seeding and reaction-role edits.
+"""
+
+import sys
+import threading
+import time
+from unittest.mock import MagicMock
+
+sys.path.insert(0, 'src')
+
+from utils.request_scheduler import RequestScheduler
+
+
+def headers(remaining, reset_after, limit=5):
+    return {
+        'X-RateLimit-Bucket': 'abc',
+        'X-RateLimit-Limit': str(limit),
+        'X-RateLimit-Remaining': str(remaining),
+        'X-RateLimit-Reset-After': str(reset_after),
+    }
+
+
+async def test_runs_immediately_while_bucket_has_capacity():
+    scheduler = RequestScheduler()
+    scheduler.record(('roles', 1), 200, headers(remaining=3, reset_after=5))
+
+    started = time.monotonic()
+    async def request():
+        return 'ok'
+    assert await scheduler.run(('roles', 1), request) == 'ok'
+
+    assert time.monotonic() - started < 0.5
+    assert scheduler.waits == 0
+
+
+async def test_waits_for_reset_when_bucket_exhausted():
+    scheduler = RequestScheduler()
+    scheduler.record(('roles', 1), 200, headers(remaining=0, reset_after=0.05))
+
+    async def request():
+        return None
+    started = time.monotonic()
+    await scheduler.run(('roles', 1), request)
+
+    assert time.monotonic() - started >= 0.04
+    assert scheduler.waits == 1
+    # Other routes are unaffected
+    await scheduler.run(('reactions', 2), request)
+    assert scheduler.waits == 1
+
+
+async def test_trace_hook_records_headers_for_calling_route():
+    scheduler = RequestScheduler()
+    params = MagicMock()
+    params.response.status = 200
+    params.response.headers = headers(remaining=2, reset_after=1)
+
+    async def request():
+        await scheduler._on_request_end(None, None, params)
+    await scheduler.run(('reactions', 7), request)
+    # Responses outside run() aren't attributed to any route
+    await scheduler._on_request_end(None, None, params)
+
+    stats = scheduler.stats()
+    assert stats['buckets']["('reactions', 7)"]['remaining'] == 2
+    assert stats['buckets']["('reactions', 7)"]['bucket'] == 'abc'
+    assert len(stats['buckets']) == 1
+    assert stats['queued'] == 0
+    assert stats['requests'] == 1
+
+
+def test_counts_429_responses():
+    scheduler = RequestScheduler()
+    scheduler.record(('roles', 1), 429, headers(remaining=0, reset_after=1))
+
+    assert scheduler.stats()['rate_limited'] == 1
+
+
+def test_stats_from_another_thread_while_buckets_are_added():
+    scheduler = RequestScheduler()
+    errors = []
+    done = threading.Event()
+
+    def poll():
+        while not done.is_set():
+            try:
+                scheduler.stats()
+            except RuntimeError as e:
+                errors.append(e)
+
+    poller = threading.Thread(target=poll)
+    poller.start()
+    try:
+        for channel_id in range(20000):
+            scheduler.record(('reactions', channel_id), 200, headers(remaining=4, reset_after=1))
+    finally:
+        done.set()
+        poller.join()
+
+    assert errors == []
+    assert len(scheduler.stats()['buckets']) == 20000
@@ -0,0 +1,107 @@
+"""
+Unit tests for the persistent select-menu role picker: option limits,
+fixed custom ids, and one member.edit per interaction.
+"""
+
+import sys
+import discord
+from unittest.mock import AsyncMock, MagicMock
+
+sys.path.insert(0, 'src')
+
+from config import COLOR_ROLES, EXOTIC_COLORS, PRONOUN_ROLES
+from utils.role_cache import guild_role_cache
+from utils.role_picker import (
+    MAX_SELECT_OPTIONS, PICKER_GROUPS, RolePickerView, RoleSelect, resolve_selection
+)
+
+
+def make_role(role_id, name):
+    role = MagicMock(id=role_id)
+    role.name = name
+    return role
+
+
+def make_guild(names, guild_id=77):
+    roles = [make_role(i + 1, name) for i, name in enumerate(names)]
+    guild = MagicMock(id=guild_id, roles=roles)
+    guild_role_cache.invalidate(guild_id)
+    return guild, {role.name: role for role in roles}
+
+
+async def test_view_is_persistent_with_fixed_custom_ids():
+    view = RolePickerView()
+
+    assert view.timeout is None
+    assert view.is_persistent()
+    assert [item.custom_id for item in view.children] == [
+        f'dreambot:role_picker:{group}' for group in PICKER_GROUPS
+    ]
+    for item in view.children:
+        assert len(item.options) <= MAX_SELECT_OPTIONS
+
+
+def test_colour_pick_replaces_colours_from_both_selects():
+    crimson, storm = list(COLOR_ROLES.values())[0], list(EXOTIC_COLORS.values())[0]
+    guild, roles = make_guild([crimson, storm, 'Helper'])
+    member = MagicMock(guild=guild, roles=[roles[storm], roles['Helper']])
+
+    wanted, changed, missing = resolve_selection(member, 'color', [crimson])
+
+    assert changed and not missing
+    assert {role.name for role in wanted} == {crimson, 'Helper'}
+
+
+def test_clearing_exotic_select_keeps_primary_colour():
+    crimson, storm = list(COLOR_ROLES.values())[0], list(EXOTIC_COLORS.values())[0]
+    guild, roles = make_guild([crimson, storm, 'Helper'])
+    member = MagicMock(guild=guild, roles=[roles[crimson], roles['Helper']])
+
+    wanted, changed, _ = resolve_selection(member, 'exotic', [])
+
+    assert not changed
+    assert {role.name for role in wanted} == {crimson, 'Helper'}
+
+    # Clearing the exotic select still removes an exotic colour
+    member.roles = [roles[storm], roles['Helper']]
+    wanted, changed, _ = resolve_selection(member, 'exotic', [])
+    assert changed and {role.name for role in wanted} == {'Helper'}
+
+
+def test_multi_select_replaces_only_its_group():
+    he, she, they = list(PRONOUN_ROLES.values())[:3]
+    guild, roles = make_guild([he, she, they, 'Helper'])
+    member = MagicMock(guild=guild, roles=[roles[he], roles['Helper']])
+
+    wanted, changed, _ = resolve_selection(member, 'pronouns', [she, they])
+
+    assert changed
+    assert {role.name for role in wanted} == {she, they, 'Helper'}
+
+
+def test_unchanged_selection_and_missing_roles():
+    he = list(PRONOUN_ROLES.values())[0]
+    guild, roles = make_guild([he])
+    member = MagicMock(guild=guild, roles=[roles[he]])
+
+    wanted, changed, missing = resolve_selection(member, 'pronouns', [he, 'xe/xem'])
+
+    assert not changed
+    assert missing == ['xe/xem']
+
+
+async def test_callback_makes_one_member_edit(monkeypatch):
+    crimson = list(COLOR_ROLES.values())[0]
+    guild, roles = make_guild([crimson, 'Helper'])
+    member = MagicMock(spec=discord.Member, id=42, guild=guild, roles=[roles['Helper']])
+    member.edit = AsyncMock()
+    interaction = MagicMock(user=member, guild=guild)
+    interaction.response.defer = AsyncMock()
+    interaction.followup.send = AsyncMock()
+    monkeypatch.setattr(RoleSelect, 'values', [crimson])
+
+    await RoleSelect('color').callback(interaction)
+
+    member.edit.assert_awaited_once()
+    assert {role.name for role in member.edit.call_args.kwargs['roles']} == {crimson, 'Helper'}
+    interaction.followup.send.assert_awaited_once()
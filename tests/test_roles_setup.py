@@ -0,0 +1,107 @@
+"""
+Unit tests for the reconcile mode of !setup_roles: existing reaction-role
+menus are reused and only missing pieces are sent.
+"""
+
+import sys
+from unittest.mock import AsyncMock, MagicMock, patch
+
+sys.path.insert(0, 'src')
+
+from cogs.roles import Roles
+from utils.reaction_roles import REACTION_ROLE_MAPS
+
+
+class FakeReaction:
+    def __init__(self, emoji):
+        self.emoji = emoji
+        self.me = True
+
+
+def make_channel():
+    channel = MagicMock(id=50)
+    sent = []
+
+    async def send(content=None, embed=None):
+        message = MagicMock(id=1000 + len(sent), embeds=[embed] if embed else [], reactions=[])
+        message.add_reaction = AsyncMock()
+        message.remove_reaction = AsyncMock()
+        message.edit = AsyncMock()
+        sent.append(message)
+        return message
+
+    channel.send = AsyncMock(side_effect=send)
+    channel.sent = sent
+    return channel
+
+
+async def configured_channel(cog):
+    """A channel whose menus were all set up on a previous run"""
+    channel = make_channel()
+    menus, _ = await cog._setup_reaction_messages(channel, 9)
+    menu_messages = {message.id: message for message in channel.sent if message.embeds}
+    for message in menu_messages.values():
+        message.reactions = [FakeReaction(call.args[0]) for call in message.add_reaction.call_args_list]
+        message.add_reaction.reset_mock()
+
+    async def fetch_message(message_id):
+        return menu_messages[message_id]
+    channel.fetch_message = AsyncMock(side_effect=fetch_message)
+    channel.send.reset_mock()
+    return channel, menus, menu_messages
+
+
+async def test_fresh_setup_sends_every_menu():
+    cog = Roles(MagicMock())
+    channel = make_channel()
+
+    menus, changes = await cog._setup_reaction_messages(channel, 9)
+
+    assert changes['messages_sent'] == len(REACTION_ROLE_MAPS)
+    assert changes['reactions_added'] == sum(len(role_map) for role_map in REACTION_ROLE_MAPS.values())
+    assert sorted(menu['type'] for menu in menus.values()) == sorted(REACTION_ROLE_MAPS)
+
+
+async def test_rerun_on_configured_channel_changes_nothing():
+    cog = Roles(MagicMock())
+    channel, menus, menu_messages = await configured_channel(cog)
+
+    new_menus, changes = await cog._setup_reaction_messages(channel, 9, menus)
+
+    assert new_menus == menus
+    assert changes == {'messages_sent': 0, 'messages_edited': 0, 'reactions_added': 0, 'reactions_removed': 0}
+    assert not channel.send.called
+
+
+async def test_rerun_adds_only_missing_reaction():
+    cog = Roles(MagicMock())
+    channel, menus, menu_messages = await configured_channel(cog)
+    verify_message = next(message for message in menu_messages.values() if message.reactions[0].emoji == '✅')
+    verify_message.reactions = []
+
+    _, changes = await cog._setup_reaction_messages(channel, 9, menus)
+
+    assert changes['reactions_added'] == 1
+    verify_message.add_reaction.assert_awaited_once_with('✅')
+
+
+async def test_failed_menu_load_aborts_without_saving():
+    cog = Roles(MagicMock())
+    cog._setup_reaction_messages = AsyncMock()
+    ctx = MagicMock()
+    ctx.send = AsyncMock()
+    ctx.guild.roles = []
+    ctx.guild.text_channels = []
+    ctx.guild.create_role = AsyncMock()
+    category = MagicMock()
+    category.create_text_channel = AsyncMock(return_value=make_channel())
+    ctx.guild.categories = [category]
+
+    with patch('cogs.roles.adb') as adb:
+        adb.load_reaction_roles = AsyncMock(side_effect=RuntimeError("down"))
+        adb.save_reaction_roles = AsyncMock()
+        await Roles.setup_roles.callback(cog, ctx)
+
+    adb.load_reaction_roles.assert_awaited_once_with(strict=True)
+    adb.save_reaction_roles.assert_not_called()
+    cog._setup_reaction_messages.assert_not_called()
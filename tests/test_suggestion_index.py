@@ -0,0 +1,68 @@
+"""
+Unit tests for the in-memory suggestion leaderboard index: per-guild/type
+ordering by votes, incremental updates on vote/grant/remove, and granted
+wishes ordered newest first.
+"""
+
+import sys
+
+sys.path.insert(0, 'src')
+
+from utils.suggestion_index import SuggestionIndex
+
+
+def wish(guild_id=1, wish_type='video', votes=0, status='active', granted_at=None):
+    data = {'guild_id': guild_id, 'type': wish_type, 'votes': votes, 'status': status}
+    if granted_at:
+        data['granted_at'] = granted_at
+    return data
+
+
+def test_top_orders_by_votes_within_guild_and_type():
+    index = SuggestionIndex()
+    index.rebuild({
+        '1': wish(votes=2),
+        '2': wish(votes=9),
+        '3': wish(votes=5),
+        '4': wish(wish_type='other', votes=50),
+        '5': wish(guild_id=2, votes=50),
+        '6': wish(votes=99, status='granted', granted_at='2025-01-01T00:00:00'),
+    })
+
+    assert index.top(1, 'video', 10) == ['2', '3', '1']
+    assert index.top(1, 'video', 2) == ['2', '3']
+    assert index.top(1, 'other', 10) == ['4']
+    assert index.top(3, 'video', 10) == []
+
+
+def test_incremental_vote_grant_and_remove():
+    suggestions = {'1': wish(votes=2), '2': wish(votes=5)}
+    index = SuggestionIndex()
+    index.rebuild(suggestions)
+
+    suggestions['1']['votes'] = 7
+    index.update('1', suggestions['1'])
+    assert index.top(1, 'video', 10) == ['1', '2']
+
+    suggestions['1'].update(status='granted', granted_at='2025-02-01T00:00:00')
+    index.update('1', suggestions['1'])
+    assert index.top(1, 'video', 10) == ['2']
+    assert index.granted(1) == ['1']
+
+    index.remove('2')
+    index.remove('missing')
+    assert index.top(1, 'video', 10) == []
+    assert len(index) == 1
+
+
+def test_granted_newest_first_across_types():
+    index = SuggestionIndex()
+    index.rebuild({
+        '1': wish(status='granted', granted_at='2025-01-01T00:00:00'),
+        '2': wish(wish_type='channel', status='granted', granted_at='2025-03-01T00:00:00'),
+        '3': wish(wish_type='other', status='granted', granted_at='2025-02-01T00:00:00'),
+    })
+
+    assert index.granted(1) == ['2', '3', '1']
+    assert index.granted(1, limit=2) == ['2', '3']
+    assert index.granted(1, 'other') == ['3']
@@ -0,0 +1,154 @@
+"""
+Unit tests for event-driven suggestion vote tracking: raw reaction events
+update the in-memory counts (including on uncached messages), and leaderboard
+commands answer from memory without resyncing against Discord.
+"""
+
+import asyncio
+import sys
+import pytest
+from unittest.mock import AsyncMock, MagicMock, Mock, patch
+
+sys.path.insert(0, 'src')
+
+from cogs.suggestions import Suggestions
+from utils.suggestion_index import suggestion_index
+from utils.write_debouncer import DebouncedWriter
+
+BOT_ID = 123456789
+GUILD_ID = 987654321
+
+
+def make_wish(votes=0, wish_type='video', status='active'):
+    return {
+        'type': wish_type,
+        'guild_id': GUILD_ID,
+        'channel_id': 111222333,
+        'votes': votes,
+        'status': status,
+        'description': 'Test wish'
+    }
+
+
+@pytest.fixture
+def cog():
+    bot = MagicMock()
+    bot.user.id = BOT_ID
+    with patch.object(Suggestions, '__init__', lambda self, bot: None):
+        cog = Suggestions(bot)
+    cog.bot = bot
+    cog.vote_threshold = 0.67
+    cog.suggestions_channel_name = "suggestions"
+    cog.community_category_name = "💬 Community"
+    cog._suggestions = {'111111': make_wish(votes=3)}
+    cog._reindex(cog._suggestions)
+    cog._save_suggestion_to_db = Mock()
+    cog._delete_suggestion_from_db = Mock()
+    cog._save_lock = asyncio.Lock()
+    cog._vote_writes = DebouncedWriter(cog._write_wish, window=0.01, max_delay=0.05)
+    return cog
+
+
+def make_payload(message_id=111111, user_id=42, emoji='🌟', bot=False):
+    payload = MagicMock(message_id=message_id, user_id=user_id, guild_id=GUILD_ID, channel_id=111222333)
+    payload.emoji = emoji
+    payload.member = MagicMock(bot=bot)
+    return payload
+
+
+async def test_votes_tracked_from_raw_events(cog):
+    await cog.on_raw_reaction_add(make_payload())
+    await cog.on_raw_reaction_add(make_payload(user_id=43))
+    assert cog._suggestions['111111']['votes'] == 5
+
+    await cog.on_raw_reaction_remove(make_payload())
+    assert cog._suggestions['111111']['votes'] == 4
+
+    # The burst is written once, with the latest count
+    await cog._vote_writes.flush()
+    cog._save_suggestion_to_db.assert_called_once_with('111111', cog._suggestions['111111'])
+
+
+async def test_own_bot_and_unrelated_reactions_ignored(cog):
+    await cog.on_raw_reaction_add(make_payload(user_id=BOT_ID))
+    await cog.on_raw_reaction_add(make_payload(bot=True))
+    await cog.on_raw_reaction_add(make_payload(emoji='👍'))
+    await cog.on_raw_reaction_add(make_payload(message_id=999))
+
+    assert cog._suggestions['111111']['votes'] == 3
+    assert cog._vote_writes.pending_count() == 0
+
+
+async def test_clearing_stars_resets_votes(cog):
+    await cog.on_raw_reaction_clear_emoji(make_payload())
+    assert cog._suggestions['111111']['votes'] == 0
+
+    await cog._vote_writes.flush()
+    cog._save_suggestion_to_db.assert_called_once_with('111111', cog._suggestions['111111'])
+
+
+async def test_only_tracked_messages_are_handled(cog):
+    cog._get_suggestions = AsyncMock()
+
+    await cog.on_raw_reaction_add(make_payload(message_id=999))
+    await cog.on_raw_reaction_clear(make_payload(message_id=999))
+
+    cog._get_suggestions.assert_not_called()
+
+
+async def test_removed_wish_stops_being_tracked(cog):
+    await cog.on_raw_reaction_add(make_payload())
+    await cog._forget_wish('111111')
+    await cog._vote_writes.flush()
+
+    assert 111111 not in cog._tracked_wishes
+    assert '111111' not in cog._suggestions
+    cog._delete_suggestion_from_db.assert_called_once_with('111111')
+    # The pending vote write was dropped rather than resurrecting the row
+    cog._save_suggestion_to_db.assert_not_called()
+    assert suggestion_index.top(GUILD_ID, 'video', 10) == []
+
+
+async def test_write_skips_untracked_wish(cog):
+    wish = cog._suggestions['111111']
+    cog._drop_wish(cog._suggestions, '111111')
+
+    await cog._write_wish('111111', wish)
+
+    cog._save_suggestion_to_db.assert_not_called()
+
+
+async def test_new_wish_write_waits_for_full_save(cog):
+    async with cog._save_lock:
+        # A full save is in flight with a snapshot taken before this wish
+        store = asyncio.create_task(cog._store_wish('333333', make_wish()))
+        await asyncio.sleep(0.02)
+        cog._save_suggestion_to_db.assert_not_called()
+    await store
+
+    cog._save_suggestion_to_db.assert_called_once_with('333333', make_wish())
+
+
+async def test_leaderboard_answers_without_resync(cog):
+    cog.sync_reaction_counts = AsyncMock()
+    cog.get_suggestions_channel = Mock(return_value=None)
+    ctx = MagicMock()
+    ctx.guild.id = GUILD_ID
+    ctx.send = AsyncMock()
+
+    await cog.top_videos.callback(cog, ctx)
+
+    cog.sync_reaction_counts.assert_not_called()
+    embed = ctx.send.call_args.kwargs['embed']
+    assert '**3 🌟**' in embed.fields[0].value
+
+
+async def test_failed_load_is_not_cached(cog):
+    cog._suggestions = None
+    cog._load_suggestions = Mock(side_effect=[RuntimeError("down"), {'222222': make_wish(votes=1)}])
+
+    await cog.cog_load()
+    assert cog._suggestions is None
+
+    assert await cog._get_suggestions() == {'222222': make_wish(votes=1)}
+    assert 222222 in cog._tracked_wishes
@@ -2,9 +2,11 @@
 Unit tests for suggestion reaction count synchronization
 
 Tests the sync_reaction_counts method which reconciles database counts
-with actual Discord message reactions after bot restarts.
+with actual Discord message reactions after bot restarts, reading the
+channel's history in pages instead of fetching each wish.
 """
 
+import asyncio
 import pytest
 from unittest.mock import AsyncMock, MagicMock, Mock, patch
 import discord
@@ -59,6 +61,7 @@ def suggestions_cog(mock_bot, mock_suggestions_channel):
     """Create a Suggestions cog instance with mocked dependencies"""
     with patch('sys.path', ['/home/emzi/Projects/dreambot/src'] + __import__('sys').path):
         from cogs.suggestions import Suggestions
+        from utils.write_debouncer import DebouncedWriter
 
         # Mock the task loop start to prevent event loop issues
         with patch.object(Suggestions, '__init__', lambda self, bot: None):
@@ -68,6 +71,11 @@ def suggestions_cog(mock_bot, mock_suggestions_channel):
             cog.vote_threshold = 0.67
             cog.suggestions_channel_name = "suggestions"
             cog.community_category_name = "💬 Community"
+            cog._suggestions = None
+            cog._reconciled = False
+            cog._history_marks = {}
+            cog._save_lock = asyncio.Lock()
+            cog._vote_writes = DebouncedWriter(cog._write_wish, window=0.01, max_delay=0.05)
             cog.get_suggestions_channel = Mock(return_value=mock_suggestions_channel)
             cog.get_community_category = Mock()
 
@@ -88,6 +96,21 @@ def create_mock_message(message_id, reaction_count):
     return message
 
 
+def set_history(channel, messages, error=None):
+    """Serve messages from channel.history pages, newest first, like Discord"""
+    messages = sorted(messages, key=lambda m: m.id, reverse=True)
+
+    def history(limit=100, before=None):
+        async def page():
+            if error:
+                raise error
+            for message in [m for m in messages if before is None or m.id < before.id][:limit]:
+                yield message
+        return page()
+
+    channel.history = Mock(side_effect=history)
+
+
 def create_discord_not_found():
     """Helper to create a proper discord.NotFound exception"""
     response = Mock()
@@ -122,7 +145,7 @@ async def test_sync_updates_stale_counts(suggestions_cog, mock_guild, mock_sugge
 
     # Mock message with 9 reactions (8 real + 1 bot)
     mock_message = create_mock_message(111111, 9)
-    mock_suggestions_channel.fetch_message = AsyncMock(return_value=mock_message)
+    set_history(mock_suggestions_channel, [mock_message])
 
     # Mock database methods
     suggestions_cog._load_suggestions = Mock(return_value=mock_suggestions.copy())
@@ -142,6 +165,8 @@ async def test_sync_updates_stale_counts(suggestions_cog, mock_guild, mock_sugge
     # Verify: Updated count is correct (9 reactions - 1 bot = 8 votes)
     saved_data = suggestions_cog._save_suggestions_to_db.call_args[0][0]
     assert saved_data['111111']['votes'] == 8
+    # Saved from a snapshot, not the live dict the event loop keeps changing
+    assert saved_data is not suggestions_cog._suggestions
 
 
 @pytest.mark.asyncio
@@ -160,8 +185,8 @@ async def test_sync_removes_deleted_messages(suggestions_cog, mock_guild, mock_s
         }
     }
 
-    # Mock fetch_message raising NotFound
-    mock_suggestions_channel.fetch_message = AsyncMock(side_effect=create_discord_not_found())
+    # Message is no longer in the channel history
+    set_history(mock_suggestions_channel, [])
 
     # Mock database methods
     suggestions_cog._load_suggestions = Mock(return_value=mock_suggestions.copy())
@@ -183,6 +208,25 @@ async def test_sync_removes_deleted_messages(suggestions_cog, mock_guild, mock_s
     assert '222222' not in saved_data
 
 
+@pytest.mark.asyncio
+async def test_sync_drops_pending_vote_write_for_deleted_wish(suggestions_cog, mock_guild, mock_suggestions_channel):
+    """A vote write queued before the sync can't bring a deleted wish back"""
+    wish = {'type': 'other', 'guild_id': 987654321, 'channel_id': 111222333,
+            'votes': 10, 'status': 'active', 'description': 'Deleted wish'}
+    set_history(mock_suggestions_channel, [])
+    suggestions_cog._load_suggestions = Mock(return_value={'222222': dict(wish)})
+    suggestions_cog._save_suggestions_to_db = Mock()
+    suggestions_cog._save_suggestion_to_db = Mock()
+    await suggestions_cog._get_suggestions()
+
+    suggestions_cog._vote_writes.schedule('222222', dict(wish, votes=11))
+    await suggestions_cog.sync_reaction_counts(mock_guild)
+    await suggestions_cog._vote_writes.flush()
+    await asyncio.sleep(0.06)
+
+    suggestions_cog._save_suggestion_to_db.assert_not_called()
+
+
 @pytest.mark.asyncio
 async def test_sync_handles_missing_channels(suggestions_cog, mock_guild, mock_suggestions_channel):
     """Test that sync gracefully handles missing channels"""
@@ -234,8 +278,8 @@ async def test_sync_handles_permission_errors(suggestions_cog, mock_guild, mock_
         }
     }
 
-    # Mock fetch_message raising Forbidden
-    mock_suggestions_channel.fetch_message = AsyncMock(side_effect=create_discord_forbidden())
+    # Reading the channel history raises Forbidden
+    set_history(mock_suggestions_channel, [], error=create_discord_forbidden())
 
     # Mock database methods
     suggestions_cog._load_suggestions = Mock(return_value=mock_suggestions.copy())
@@ -269,7 +313,7 @@ async def test_sync_auto_manifests_channel_at_threshold(suggestions_cog, mock_gu
 
     # Mock message with 8 reactions (7 real + 1 bot) = meets threshold
     mock_message = create_mock_message(555555, 8)
-    mock_suggestions_channel.fetch_message = AsyncMock(return_value=mock_message)
+    set_history(mock_suggestions_channel, [mock_message])
 
     # Mock database methods
     suggestions_cog._load_suggestions = Mock(return_value=mock_suggestions.copy())
@@ -307,7 +351,7 @@ async def test_sync_does_not_manifest_below_threshold(suggestions_cog, mock_guil
 
     # Mock message with 6 reactions (5 real + 1 bot) = below threshold
     mock_message = create_mock_message(666666, 6)
-    mock_suggestions_channel.fetch_message = AsyncMock(return_value=mock_message)
+    set_history(mock_suggestions_channel, [mock_message])
 
     # Mock database methods
     suggestions_cog._load_suggestions = Mock(return_value=mock_suggestions.copy())
@@ -353,7 +397,7 @@ async def test_sync_ignores_granted_wishes(suggestions_cog, mock_guild, mock_sug
 
     # Mock message for active wish
     mock_message = create_mock_message(777777, 8)
-    mock_suggestions_channel.fetch_message = AsyncMock(return_value=mock_message)
+    set_history(mock_suggestions_channel, [mock_message])
 
     # Mock database methods
     suggestions_cog._load_suggestions = Mock(return_value=mock_suggestions.copy())
@@ -365,9 +409,9 @@ async def test_sync_ignores_granted_wishes(suggestions_cog, mock_guild, mock_sug
     # Verify: Only active wish was processed
     assert stats['synced'] == 1
 
-    # Verify: fetch_message called only once (for active wish)
-    assert mock_suggestions_channel.fetch_message.call_count == 1
-    mock_suggestions_channel.fetch_message.assert_called_with(777777)
+    # Verify: One history page was read for the active wish
+    assert stats['requests'] == 1
+    assert mock_suggestions_channel.history.call_count == 1
 
 
 @pytest.mark.asyncio
@@ -410,18 +454,12 @@ async def test_sync_multiple_wishes_mixed_scenarios(suggestions_cog, mock_guild,
         }
     }
 
-    # Mock fetch_message with different responses
-    async def mock_fetch(message_id):
-        if message_id == 111111:
-            return create_mock_message(111111, 9)  # Count changed
-        elif message_id == 222222:
-            raise create_discord_not_found()  # Deleted
-        elif message_id == 333333:
-            return create_mock_message(333333, 9)  # Same count (8 votes + 1 bot)
-        elif message_id == 444444:
-            return create_mock_message(444444, 8)  # Meets threshold (7 votes + 1 bot)
-
-    mock_suggestions_channel.fetch_message = AsyncMock(side_effect=mock_fetch)
+    # Channel history with different scenarios (222222 was deleted)
+    set_history(mock_suggestions_channel, [
+        create_mock_message(111111, 9),  # Count changed
+        create_mock_message(333333, 9),  # Same count (8 votes + 1 bot)
+        create_mock_message(444444, 8),  # Meets threshold (7 votes + 1 bot)
+    ])
 
     # Mock database methods
     suggestions_cog._load_suggestions = Mock(return_value=mock_suggestions.copy())
@@ -457,7 +495,7 @@ async def test_sync_returns_empty_stats_for_no_suggestions_channel(suggestions_c
     stats = await suggestions_cog.sync_reaction_counts(mock_guild)
 
     # Verify: Empty stats returned
-    assert stats == {'synced': 0, 'deleted': 0, 'errors': 0, 'manifested': 0}
+    assert stats == {'synced': 0, 'deleted': 0, 'errors': 0, 'manifested': 0, 'requests': 0}
 
 
 @pytest.mark.asyncio
@@ -486,7 +524,7 @@ async def test_sync_filters_by_guild(suggestions_cog, mock_guild, mock_suggestio
 
     # Mock message for our guild's wish
     mock_message = create_mock_message(111111, 8)
-    mock_suggestions_channel.fetch_message = AsyncMock(return_value=mock_message)
+    set_history(mock_suggestions_channel, [mock_message])
 
     # Mock database methods
     suggestions_cog._load_suggestions = Mock(return_value=mock_suggestions.copy())
@@ -498,6 +536,121 @@ async def test_sync_filters_by_guild(suggestions_cog, mock_guild, mock_suggestio
     # Verify: Only our guild's wish was processed
     assert stats['synced'] == 1
 
-    # Verify: Only one fetch_message call (for our guild)
-    assert mock_suggestions_channel.fetch_message.call_count == 1
-    mock_suggestions_channel.fetch_message.assert_called_with(111111)
+    # Verify: Only our guild's channel history was read
+    assert stats['requests'] == 1
+    assert mock_suggestions_channel.history.call_count == 1
+
+
+@pytest.mark.asyncio
+async def test_sync_reads_one_page_for_many_wishes(suggestions_cog, mock_guild, mock_suggestions_channel):
+    """Test that one history request covers every wish on the page"""
+
+    mock_suggestions = {
+        str(message_id): {
+            'type': 'video',
+            'guild_id': 987654321,
+            'channel_id': 111222333,
+            'votes': 0,
+            'status': 'active',
+            'description': f'Wish {message_id}'
+        }
+        for message_id in range(1000, 1050)
+    }
+    set_history(mock_suggestions_channel, [create_mock_message(message_id, 3) for message_id in range(1000, 1050)])
+
+    suggestions_cog._load_suggestions = Mock(return_value=mock_suggestions.copy())
+    suggestions_cog._save_suggestions_to_db = Mock()
+
+    stats = await suggestions_cog.sync_reaction_counts(mock_guild)
+
+    assert stats['synced'] == 50
+    assert stats['requests'] == 1
+
+
+@pytest.mark.asyncio
+async def test_sync_stops_paging_past_oldest_wish(suggestions_cog, mock_guild, mock_suggestions_channel):
+    """Test that paging stops once the scan passes the oldest active wish"""
+
+    # 500 messages; the oldest wish is the 150th newest and 352 was deleted,
+    # so the scan must stop after two pages without finding it
+    messages = [create_mock_message(message_id, 1) for message_id in range(1, 501) if message_id != 352]
+    mock_suggestions = {
+        message_id: {
+            'type': 'other',
+            'guild_id': 987654321,
+            'channel_id': 111222333,
+            'votes': 4,
+            'status': 'active',
+            'description': 'Older wish'
+        }
+        for message_id in ('351', '352')
+    }
+    set_history(mock_suggestions_channel, messages)
+
+    suggestions_cog._load_suggestions = Mock(return_value=mock_suggestions.copy())
+    suggestions_cog._save_suggestions_to_db = Mock()
+
+    stats = await suggestions_cog.sync_reaction_counts(mock_guild)
+
+    assert stats['synced'] == 1
+    assert stats['deleted'] == 1
+    assert stats['requests'] == 2
+
+
+def make_wishes(*message_ids):
+    return {
+        str(message_id): {
+            'type': 'video',
+            'guild_id': 987654321,
+            'channel_id': 111222333,
+            'votes': 0,
+            'status': 'active',
+            'description': 'Wish'
+        }
+        for message_id in message_ids
+    }
+
+
+@pytest.mark.asyncio
+async def test_incremental_sync_only_reads_newer_wishes(suggestions_cog, mock_guild, mock_suggestions_channel):
+    """Test that a catch-up sync skips wishes already reconciled"""
+
+    suggestions_cog._load_suggestions = Mock(return_value=make_wishes(100, 200))
+    suggestions_cog._save_suggestions_to_db = Mock()
+    set_history(mock_suggestions_channel, [create_mock_message(100, 3), create_mock_message(200, 3)])
+
+    await suggestions_cog.sync_reaction_counts(mock_guild)
+    assert suggestions_cog._history_marks == {111222333: 200}
+
+    # Nothing newer than the mark: the channel isn't read at all
+    mock_suggestions_channel.history.reset_mock()
+    stats = await suggestions_cog.sync_reaction_counts(mock_guild, incremental=True)
+    assert stats['requests'] == 0
+    mock_suggestions_channel.history.assert_not_called()
+
+    # A wish posted since is reconciled; older ones keep their in-memory counts
+    suggestions = await suggestions_cog._get_suggestions()
+    suggestions.update(make_wishes(300))
+    suggestions['100']['votes'] = 7
+    set_history(mock_suggestions_channel, [create_mock_message(100, 3), create_mock_message(200, 3), create_mock_message(300, 5)])
+
+    stats = await suggestions_cog.sync_reaction_counts(mock_guild, incremental=True)
+    assert stats['synced'] == 1
+    assert suggestions['300']['votes'] == 4
+    assert suggestions['100']['votes'] == 7
+    assert suggestions_cog._history_marks == {111222333: 300}
+
+
+@pytest.mark.asyncio
+async def test_on_ready_reconciles_fully_once(suggestions_cog, mock_bot, mock_guild):
+    """Test that only the first on_ready runs a full reconciliation"""
+
+    mock_bot.guilds = [mock_guild]
+    suggestions_cog.sync_reaction_counts = AsyncMock(return_value={
+        'synced': 0, 'deleted': 0, 'errors': 0, 'manifested': 0, 'requests': 0
+    })
+
+    await suggestions_cog.on_ready()
+    await suggestions_cog.on_ready()
+
+    assert [call.kwargs['incremental'] for call in suggestions_cog.sync_reaction_counts.call_args_list] == [False, True]
@@ -0,0 +1,65 @@
+"""
+Unit tests for the startup warm-up that preloads persistent state.
+"""
+
+import sys
+import pytest
+from unittest.mock import MagicMock
+
+sys.path.insert(0, 'src')
+
+import warmup
+from database import AsyncBotDatabase, BotDatabase
+
+
+@pytest.fixture
+def adb(tmp_path, monkeypatch):
+    monkeypatch.chdir(tmp_path)
+    monkeypatch.delenv('SUPABASE_URL', raising=False)
+    monkeypatch.delenv('SUPABASE_KEY', raising=False)
+    monkeypatch.delenv('DATABASE_BACKEND', raising=False)
+    facade = AsyncBotDatabase(BotDatabase(), max_workers=2)
+    yield facade
+    facade.shutdown()
+
+
+async def test_preloads_every_store(adb):
+    results = await warmup.warm_up(adb, ['greeting', 'kebab'], concurrency=2)
+
+    assert set(results) == {
+        'reaction_roles', 'prebans', 'warnings', 'suggestions', 'usage:greeting', 'usage:kebab'
+    }
+    assert set(adb.database._usage_cache) == {'greeting', 'kebab'}
+
+
+async def test_reports_status_for_health_endpoint(adb):
+    await warmup.warm_up(adb, ['greeting'])
+
+    assert warmup.status['state'] == 'ready'
+    assert warmup.status['finished_at'] is not None
+    assert warmup.status['steps']['usage:greeting'] is not None
+
+
+async def test_failed_step_does_not_abort_warmup(adb, monkeypatch):
+    def broken(strict=False):
+        raise RuntimeError("down")
+    monkeypatch.setattr(adb.database, 'load_prebans', broken)
+
+    results = await warmup.warm_up(adb, [])
+
+    assert results['prebans'] is None
+    assert results['warnings'] is not None
+    assert warmup.status['state'] == 'ready'
+
+
+async def test_failed_read_is_reported_as_failed(adb, monkeypatch):
+    # The loaders swallow read errors unless strict; warm-up must still see them
+    monkeypatch.setattr(adb.database, 'supabase', MagicMock())
+    adb.database.supabase.table.side_effect = RuntimeError("down")
+
+    results = await warmup.warm_up(adb, ['greeting'])
+
+    assert results['warnings'] is None
+    assert results['usage:greeting'] is None
+    assert warmup.status['steps']['prebans'] is None
+    assert 'suggestions' in warmup.status['failed']
@@ -0,0 +1,163 @@
+"""
+Unit tests for the weekly wish summary's persisted state: duplicate
+detection from the per-guild last-summary pointer (no history scans), tied
+to the scheduled slot it served, and the persisted next-run time.
+"""
+
+import asyncio
+import sys
+import pytest
+from datetime import datetime, timedelta
+from unittest.mock import AsyncMock, MagicMock, Mock, patch
+
+sys.path.insert(0, 'src')
+
+from cogs.suggestions import Suggestions
+
+GUILD_ID = 987654321
+
+
+@pytest.fixture
+def channel():
+    channel = MagicMock()
+    channel.id = 111222333
+    channel.history = Mock(side_effect=AssertionError("history should not be read"))
+    channel.send = AsyncMock(return_value=MagicMock(id=555, channel=channel))
+    return channel
+
+
+@pytest.fixture
+def guild():
+    guild = MagicMock()
+    guild.id = GUILD_ID
+    return guild
+
+
+@pytest.fixture
+def task_state():
+    """Stands in for the task_state store"""
+    store = {}
+
+    async def load(name, strict=False):
+        if store.get('fail_loads'):
+            store['fail_loads'] -= 1
+            raise RuntimeError("down")
+        return store.get(name)
+
+    async def save(name, data):
+        store[name] = data
+
+    with patch('cogs.suggestions.adb') as adb:
+        adb.load_task_state = AsyncMock(side_effect=load)
+        adb.save_task_state = AsyncMock(side_effect=save)
+        yield store
+
+
+@pytest.fixture
+def cog(channel, guild, task_state):
+    bot = MagicMock()
+    bot.guilds = [guild]
+    with patch.object(Suggestions, '__init__', lambda self, bot: None):
+        cog = Suggestions(bot)
+    cog.bot = bot
+    cog._suggestions = {'100': {
+        'type': 'video', 'guild_id': GUILD_ID, 'channel_id': channel.id,
+        'votes': 3, 'status': 'active', 'description': 'A wish'
+    }}
+    cog._reindex(cog._suggestions)
+    cog._save_lock = asyncio.Lock()
+    cog._summary_state = None
+    cog.get_suggestions_channel = Mock(return_value=channel)
+    return cog
+
+
+SLOT = '2026-10-19T00:00:00'
+
+
+async def test_summary_is_recorded_and_not_reposted(cog, guild, channel, task_state):
+    task_state['weekly_summary'] = {'next_run_at': SLOT, 'last_posts': {}}
+
+    await cog._send_weekly_summary(guild)
+    await cog._send_weekly_summary(guild)
+
+    channel.send.assert_called_once()
+    pointer = task_state['weekly_summary']['last_posts'][str(GUILD_ID)]
+    assert pointer['message_id'] == 555 and pointer['channel_id'] == channel.id
+    assert pointer['slot'] == SLOT
+
+
+async def test_previous_slot_is_not_a_duplicate(cog, guild, channel, task_state):
+    posted_at = (datetime.utcnow() - timedelta(days=7)).isoformat()
+    task_state['weekly_summary'] = {'next_run_at': SLOT, 'last_posts': {str(GUILD_ID): {
+        'message_id': 1, 'channel_id': channel.id, 'posted_at': posted_at, 'slot': '2026-10-12T00:00:00'}}}
+
+    await cog._send_weekly_summary(guild)
+
+    channel.send.assert_called_once()
+
+
+async def test_manual_summary_does_not_suppress_scheduled_one(cog, guild, channel, task_state):
+    task_state['weekly_summary'] = {'next_run_at': SLOT, 'last_posts': {}}
+    ctx = MagicMock(guild=guild, send=AsyncMock())
+
+    await Suggestions.weekly_summary_manual.callback(cog, ctx)
+    await cog._send_weekly_summary(guild)
+
+    assert channel.send.call_count == 2
+    assert task_state['weekly_summary']['last_posts'][str(GUILD_ID)]['slot'] == SLOT
+
+
+async def test_manual_summary_warns_after_recent_post(cog, guild, channel, task_state):
+    task_state['weekly_summary'] = {'next_run_at': SLOT, 'last_posts': {}}
+    await cog._send_weekly_summary(guild)
+    ctx = MagicMock(guild=guild, send=AsyncMock())
+
+    await Suggestions.weekly_summary_manual.callback(cog, ctx)
+
+    titles = [call.kwargs['embed'].title for call in ctx.send.call_args_list]
+    assert "⚠️ Duplicate Detected" in titles
+
+
+async def test_missed_run_is_caught_up_without_waiting(cog, channel, task_state):
+    task_state['weekly_summary'] = {'next_run_at': (datetime.utcnow() - timedelta(hours=10)).isoformat(), 'last_posts': {}}
+
+    with patch('cogs.suggestions.asyncio.sleep', new=AsyncMock()) as sleep:
+        await cog.weekly_summary.coro(cog)
+
+    sleep.assert_not_called()
+    channel.send.assert_called_once()
+    next_run = datetime.fromisoformat(task_state['weekly_summary']['next_run_at'])
+    assert next_run > datetime.utcnow() and next_run.weekday() == 0
+
+
+async def test_first_run_persists_schedule_before_waiting(cog, channel, task_state):
+    with patch('cogs.suggestions.asyncio.sleep', new=AsyncMock(side_effect=asyncio.CancelledError)):
+        with pytest.raises(asyncio.CancelledError):
+            await cog.weekly_summary.coro(cog)
+
+    next_run = datetime.fromisoformat(task_state['weekly_summary']['next_run_at'])
+    assert next_run.weekday() == 0 and next_run.hour == 0
+    channel.send.assert_not_called()
+
+
+async def test_failed_state_load_is_retried_without_saving(cog, channel, task_state):
+    stored = {'next_run_at': (datetime.utcnow() - timedelta(hours=10)).isoformat(), 'last_posts': {}}
+    task_state['weekly_summary'] = stored
+    task_state['fail_loads'] = 1
+
+    with patch('cogs.suggestions.asyncio.sleep', new=AsyncMock()):
+        await cog.weekly_summary.coro(cog)
+        # The failed read neither overwrote the stored state nor posted
+        assert task_state['weekly_summary'] is stored
+        channel.send.assert_not_called()
+
+        # The next tick loads the real state and catches up the missed run
+        await cog.weekly_summary.coro(cog)
+
+    channel.send.assert_called_once()
+
+
+def test_next_summary_time_is_the_following_monday():
+    monday_noon = datetime(2026, 10, 12, 12, 0)
+    assert Suggestions._next_summary_time(monday_noon) == datetime(2026, 10, 19)
+    assert Suggestions._next_summary_time(datetime(2026, 10, 18, 23, 59)) == datetime(2026, 10, 19)
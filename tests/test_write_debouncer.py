@@ -0,0 +1,70 @@
+"""
+Unit tests for DebouncedWriter: per-key coalescing of persistence writes
+with a staleness bound and a forced flush.
+"""
+
+import asyncio
+import sys
+import pytest
+
+sys.path.insert(0, 'src')
+
+from utils.write_debouncer import DebouncedWriter
+
+
+@pytest.fixture
+def written():
+    return []
+
+
+@pytest.fixture
+def writer(written):
+    async def write(key, value):
+        written.append((key, value))
+    return DebouncedWriter(write, window=0.05, max_delay=1.0)
+
+
+async def test_updates_within_window_coalesce(writer, written):
+    for votes in range(5):
+        writer.schedule('wish', votes)
+    writer.schedule('other', 1)
+
+    await asyncio.sleep(0.1)
+
+    assert sorted(written) == [('other', 1), ('wish', 4)]
+    assert writer.writes == 2 and writer.requests == 6
+
+
+async def test_steady_burst_is_written_by_max_delay(written):
+    async def write(key, value):
+        written.append((key, value))
+    writer = DebouncedWriter(write, window=0.05, max_delay=0.12)
+
+    # Each update lands inside the quiet window, so only max_delay forces the write
+    for votes in range(8):
+        writer.schedule('wish', votes)
+        await asyncio.sleep(0.03)
+
+    assert written and written[0][0] == 'wish'
+    await writer.flush()
+    assert written[-1] == ('wish', 7)
+
+
+async def test_flush_writes_pending_immediately(writer, written):
+    writer.window = 60
+    writer.schedule('wish', 3)
+
+    await writer.flush()
+
+    assert written == [('wish', 3)]
+    assert writer.pending_count() == 0
+
+
+async def test_cancel_drops_pending_value(writer, written):
+    writer.schedule('wish', 3)
+    await writer.cancel('wish')
+    writer.schedule('other', 1)
+
+    await writer.flush()
+
+    assert written == [('other', 1)]